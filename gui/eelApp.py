@@ -3,6 +3,7 @@ import sys
 import io
 import argparse
 import logging
+import multiprocessing
 
 
 def get_static_path():
@@ -39,4 +40,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necesario para que el pool de procesos funcione en el ejecutable empaquetado
+    multiprocessing.freeze_support()
     main()
@@ -2,12 +2,18 @@ from .utils import latex as latex
 from .utils import input as input
 from .utils import latparser as parser
 from .utils.auxiliar import sympy_expr
+from .utils import traza
+from .utils import contexto
 import sympy
 
 from .models import matriz, vector
+from .models.matriz_dispersa import elegir_representacion
 
 from .operations import funciones as fn
 from .operations import operaciones as op
+from .operations import numerico as num
+from .operations import factorizacion as fac
+from .operations import paralelo
 
 import json
 import re
@@ -15,6 +21,33 @@ import math
 from typing import Any, Dict, Union
 
 
+# Cada operacion corre en su propio contexto (contexto.por_pedido), con su
+# propio buffer de traza. Opciones de traza comunes a todas las operaciones:
+# verbosidad = "resultado", "pasos" o "completo" (ver operaciones.niveles_verbosidad)
+# presupuesto_pasos / presupuesto_bytes = tope de la traza; lo que pasa el
+# tope se resume al final ("k operaciones de fila mas") y el resultado se
+# muestra siempre
+# Ademas, solo por nombre: limite_traza (corte duro del buffer en bytes) y
+# resaltar_cambios (filas que cambiaron en color); los toma por_pedido
+
+
+def _iniciar_traza(verbosidad: str, presupuesto_pasos: int | None, presupuesto_bytes: int | None) -> None:
+    # Lo que se haya escrito antes (al leer las entradas) no es parte de la traza
+    contexto.salida().clear()
+    op.configurar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+
+
+def _escribir_resultado(resultado: str) -> None:
+    # El resultado va despues del resumen de lo omitido, si lo hay
+    op.cerrar_resumen()
+    contexto.salida().writelatex(resultado)
+
+
+def _terminar_traza() -> str:
+    op.cerrar_resumen()
+    return contexto.salida().stdout
+
+
 def _to_float_scalar(raw: str) -> float:
     """
     Convierte texto o LaTeX a float tolerando expresiones.
@@ -28,11 +61,16 @@ def _to_float_scalar(raw: str) -> float:
         return float(sympy.N(sympy_expr(raw)))
 
 
-def resolver_sistema_por_gauss_jordan(mat: list[list[str]], ecuaciones: int, incognitas: int) -> str:
-    accmat = input.matrix_make(mat)
-    latex.LATEX_STDOUT.clear()
-    fn.resolver_sistema(accmat, ecuaciones, incognitas)
-    return latex.LATEX_STDOUT.stdout
+@contexto.por_pedido
+def resolver_sistema_por_gauss_jordan(mat: list[list[str]], ecuaciones: int, incognitas: int, metodo: str = "clasico", pivoteo: str = "primero", verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    # Si la entrada es mayormente ceros se elimina con la version dispersa.
+    # metodo = "sin_fracciones" usa la eliminacion entera (Bareiss) y
+    # metodo = "dominio" reduce dentro de un DomainMatrix de sympy.
+    # pivoteo: "primero", "magnitud", "altura" o "complejidad"
+    accmat = elegir_representacion(input.matrix_make(mat))
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    fn.resolver_sistema(accmat, ecuaciones, incognitas, metodo, pivoteo)
+    return _terminar_traza()
 
 
 def json_a_operando(_json: str) -> Union[parser.Operand, Dict[str, parser.Operand | None]]:
@@ -127,13 +165,17 @@ def json_a_operando(_json: str) -> Union[parser.Operand, Dict[str, parser.Operan
     raise ValueError(f"Unknown operand type: {type_}")
 
 
-def evaluar_latex(m: str, varjson: str | None = None) -> str:
+@contexto.por_pedido
+def evaluar_latex(m: str, varjson: str | None = None, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    # Devuelve solo el valor; la traza del calculo queda en el pedido y se
+    # puede leer con exportar_traza
     env = parser.reserved_env.copy()
     if varjson is not None:
         parsed = json_a_operando(varjson)
         if isinstance(parsed, dict):
             env.update(parsed)
 
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
     result: parser.Operand = parser.eval_latex(m, env)
 
     if isinstance(result, matriz.Matriz):
@@ -144,7 +186,8 @@ def evaluar_latex(m: str, varjson: str | None = None) -> str:
         return latex.number_parse(result)
 
 
-def comparar_expresiones(expr1: str, expr2: str, varjson: str | None = None) -> str:
+@contexto.por_pedido
+def comparar_expresiones(expr1: str, expr2: str, varjson: str | None = None, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
     """
     Devuelve LaTeX indicando si expr1 == expr2 bajo el mismo ambiente.
     """
@@ -154,8 +197,11 @@ def comparar_expresiones(expr1: str, expr2: str, varjson: str | None = None) ->
         if isinstance(parsed, dict):
             env.update(parsed)
 
-    a = parser.eval_latex(expr1, env)
-    b = parser.eval_latex(expr2, env)
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    # Solo se muestran los valores, no como se calcularon
+    with op.en_silencio():
+        a = parser.eval_latex(expr1, env)
+        b = parser.eval_latex(expr2, env)
 
     def mat_eq(m1: matriz.Matriz, m2: matriz.Matriz) -> bool:
         if m1.filas != m2.filas or m1.columnas != m2.columnas:
@@ -191,12 +237,11 @@ def comparar_expresiones(expr1: str, expr2: str, varjson: str | None = None) ->
         iguales = vec_eq(a, b)
     else:
         iguales = False
-    latex.LATEX_STDOUT.clear()
-    latex.LATEX_STDOUT.writelatex(latex.text("Expr 1:") + latex.newline() + latex_repr(a) + latex.newline())
-    latex.LATEX_STDOUT.writelatex(latex.text("Expr 2:") + latex.newline() + latex_repr(b) + latex.newline())
-    latex.LATEX_STDOUT.writelatex(latex.text(f"Comparando: {expr1} =? {expr2}") + latex.newline())
-    latex.LATEX_STDOUT.writelatex(latex.text(f"Resultado: {'iguales' if iguales else 'diferentes'}") + latex.newline())
-    return latex.LATEX_STDOUT.stdout
+    _escribir_resultado(latex.text("Expr 1:") + latex.newline() + latex_repr(a) + latex.newline())
+    _escribir_resultado(latex.text("Expr 2:") + latex.newline() + latex_repr(b) + latex.newline())
+    _escribir_resultado(latex.text(f"Comparando: {expr1} =? {expr2}") + latex.newline())
+    _escribir_resultado(latex.text(f"Resultado: {'iguales' if iguales else 'diferentes'}") + latex.newline())
+    return _terminar_traza()
 
 
 def graficar_funcion(expr: str, x_min: str, x_max: str, puntos: int = 200) -> list[list[float]]:
@@ -255,104 +300,210 @@ def _vector_make(vals: list[str]) -> vector.Vector:
     return vector.Vector(comps)
 
 
-def sumar_matrices(m1: list[list[str]], m2: list[list[str]]) -> str:
-    latex.LATEX_STDOUT.clear()
+# `modo="numerico"` usa arreglos float64 de NumPy en vez de sympy exacto,
+# `precision` es la cantidad de decimales que se muestran en ese modo
+
+
+@contexto.por_pedido
+def sumar_matrices(m1: list[list[str]], m2: list[list[str]], modo: str = num.MODO_EXACTO, precision: int = 8, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    if num.es_numerico(modo):
+        res = num.sumar(num.arreglo(m1), num.arreglo(m2))
+        _escribir_resultado(
+            num.encabezado("Suma de matrices") + latex.matrix_decimal(res, precision))
+        return _terminar_traza()
     a = input.matrix_make(m1)
     b = input.matrix_make(m2)
     res = op.suma_matrices(a, b)
-    latex.LATEX_STDOUT.writelatex(latex.matrix(res))
-    return latex.LATEX_STDOUT.stdout
-
-
-def restar_matrices(m1: list[list[str]], m2: list[list[str]]) -> str:
-    latex.LATEX_STDOUT.clear()
+    _escribir_resultado(latex.matrix(res))
+    return _terminar_traza()
+
+
+@contexto.por_pedido
+def restar_matrices(m1: list[list[str]], m2: list[list[str]], modo: str = num.MODO_EXACTO, precision: int = 8, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    if num.es_numerico(modo):
+        res = num.restar(num.arreglo(m1), num.arreglo(m2))
+        _escribir_resultado(
+            num.encabezado("Resta de matrices") + latex.matrix_decimal(res, precision))
+        return _terminar_traza()
     a = input.matrix_make(m1)
     b = input.matrix_make(m2)
     res = op.resta_matrices(a, b)
-    latex.LATEX_STDOUT.writelatex(latex.matrix(res))
-    return latex.LATEX_STDOUT.stdout
+    _escribir_resultado(latex.matrix(res))
+    return _terminar_traza()
+
+
+@contexto.por_pedido
+def multiplicar_matrices(m1: list[list[str]], m2: list[list[str]], modo: str = num.MODO_EXACTO, precision: int = 8, procesos: int = 1, detallado: bool = False, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    if num.es_numerico(modo):
+        res = num.multiplicar(num.arreglo(m1), num.arreglo(m2))
+        _escribir_resultado(
+            num.encabezado("Multiplicación de matrices") + latex.matrix_decimal(res, precision))
+        return _terminar_traza()
+    a = input.matrix_make(m1)
+    b = input.matrix_make(m2)
+    # Las grandes solo muestran un resumen, salvo que se pida `detallado`
+    res = op.multiplicar(a, b, paralelo.normalizar_procesos(procesos), detallado)
+    _escribir_resultado(latex.matrix(res))
+    return _terminar_traza()
+
+
+@contexto.por_pedido
+def determinante_cofactores(m1: list[list[str]], modo: str = num.MODO_EXACTO, precision: int = 8, procesos: int = 1, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    if num.es_numerico(modo):
+        det = num.determinante(num.arreglo(m1))
+        _escribir_resultado(
+            num.encabezado("Determinante por factorización LU") + latex.decimal(det, precision))
+        return _terminar_traza()
+    a = input.matrix_make(m1)
+    # procesos = 0 reparte los cofactores entre todos los nucleos
+    det = op.determinante_por_cofactores(
+        a, procesos=paralelo.normalizar_procesos(procesos))
+    _escribir_resultado(latex.number_parse(det))
+    return _terminar_traza()
 
 
-def multiplicar_matrices(m1: list[list[str]], m2: list[list[str]]) -> str:
-    latex.LATEX_STDOUT.clear()
+@contexto.por_pedido
+def determinante_bareiss(m1: list[list[str]], verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
     a = input.matrix_make(m1)
-    b = input.matrix_make(m2)
-    res = op.multiplicar_matrices(a, b)
-    latex.LATEX_STDOUT.writelatex(latex.matrix(res))
-    return latex.LATEX_STDOUT.stdout
+    det = op.determinante_por_bareiss(a)
+    _escribir_resultado(latex.number_parse(det))
+    return _terminar_traza()
+
+
+@contexto.por_pedido
+def determinante_por_metodo(m1: list[list[str]], metodo: str = "bareiss", procesos: int = 1, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    # metodo es cualquiera de op.metodos_determinante. procesos = 0 usa
+    # todos los nucleos (solo lo aprovechan cofactores y modular)
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    a = input.matrix_make(m1)
+    det = op.determinante(a, metodo, paralelo.normalizar_procesos(procesos))
+    _escribir_resultado(latex.number_parse(det))
+    return _terminar_traza()
+
+
+@contexto.por_pedido
+def rango_por_metodo(m1: list[list[str]], metodo: str = "plu", procesos: int = 1, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    # metodo es cualquiera de op.metodos_rango (modular solo con entradas racionales)
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    a = input.matrix_make(m1)
+    r = op.rango(a, metodo, paralelo.normalizar_procesos(procesos))
+    _escribir_resultado(latex.text("Rango: ") + latex.number_parse(r))
+    return _terminar_traza()
 
 
-def determinante_cofactores(m1: list[list[str]]) -> str:
-    latex.LATEX_STDOUT.clear()
+@contexto.por_pedido
+def determinante_dominio(m1: list[list[str]], verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    # Determinante dentro de un DomainMatrix de sympy (ZZ, QQ, QQ[x], ...)
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
     a = input.matrix_make(m1)
-    det = op.determinante_por_cofactores(a)
-    latex.LATEX_STDOUT.writelatex(latex.number_parse(det))
-    return latex.LATEX_STDOUT.stdout
+    det = op.determinante_por_dominio(a)
+    _escribir_resultado(latex.number_parse(det))
+    return _terminar_traza()
 
 
-def determinante_sarrus(m1: list[list[str]]) -> str:
-    latex.LATEX_STDOUT.clear()
+@contexto.por_pedido
+def inversa_por_dominio(m1: list[list[str]], verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    a = input.matrix_make(m1)
+    inv = op.inversa_por_dominio(a)
+    _escribir_resultado(latex.matrix(inv))
+    return _terminar_traza()
+
+
+@contexto.por_pedido
+def resolver_ecuacion_matricial(m1: list[list[str]], m2: list[list[str]], verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    """
+    Resuelve AX = B. La factorizacion de A queda en cache, asi que pedir
+    otro lado derecho con la misma A no vuelve a eliminar.
+    """
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    a = input.matrix_make(m1)
+    b = input.matrix_make(m2)
+    fn.resolver_ecuacion_matricial(a, b)
+    return _terminar_traza()
+
+
+@contexto.por_pedido
+def determinante_sarrus(m1: list[list[str]], verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
     a = input.matrix_make(m1)
     det = op.determinante_por_sarrus(a)
-    latex.LATEX_STDOUT.writelatex(latex.number_parse(det))
-    return latex.LATEX_STDOUT.stdout
+    _escribir_resultado(latex.number_parse(det))
+    return _terminar_traza()
 
 
-def sumar_vectores(v1: list[str], v2: list[str]) -> str:
-    latex.LATEX_STDOUT.clear()
+@contexto.por_pedido
+def sumar_vectores(v1: list[str], v2: list[str], verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
     a = _vector_make(v1)
     b = _vector_make(v2)
     res = op.suma_vectores(a, b)
-    latex.LATEX_STDOUT.writelatex(latex.vector(res))
-    return latex.LATEX_STDOUT.stdout
+    _escribir_resultado(latex.vector(res))
+    return _terminar_traza()
 
 
-def restar_vectores(v1: list[str], v2: list[str]) -> str:
-    latex.LATEX_STDOUT.clear()
+@contexto.por_pedido
+def restar_vectores(v1: list[str], v2: list[str], verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
     a = _vector_make(v1)
     b = _vector_make(v2)
     res = op.resta_vectores(a, b)
-    latex.LATEX_STDOUT.writelatex(latex.vector(res))
-    return latex.LATEX_STDOUT.stdout
+    _escribir_resultado(latex.vector(res))
+    return _terminar_traza()
 
 
-def escalar_vector(v: list[str], escalar: str) -> str:
-    latex.LATEX_STDOUT.clear()
+@contexto.por_pedido
+def escalar_vector(v: list[str], escalar: str, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
     vec = _vector_make(v)
     res = op.vector_por_escalar(vec, parser.eval_latex(escalar, None))
-    latex.LATEX_STDOUT.writelatex(latex.vector(res))
-    return latex.LATEX_STDOUT.stdout
-
-
-def matriz_por_vector(m1: list[list[str]], v: list[str]) -> str:
-    latex.LATEX_STDOUT.clear()
+    _escribir_resultado(latex.vector(res))
+    return _terminar_traza()
+
+
+@contexto.por_pedido
+def matriz_por_vector(m1: list[list[str]], v: list[str], modo: str = num.MODO_EXACTO, precision: int = 8, procesos: int = 1, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    if num.es_numerico(modo):
+        res = num.multiplicar(num.arreglo(m1), num.vector(v))
+        _escribir_resultado(
+            num.encabezado("Matriz por vector") + latex.vector_decimal(res, precision))
+        return _terminar_traza()
     mat = input.matrix_make(m1)
     vec = _vector_make(v)
-    res = op.matriz_por_vector(mat, vec)
-    latex.LATEX_STDOUT.writelatex(latex.vector(res))
-    return latex.LATEX_STDOUT.stdout
+    res = op.matriz_por_vector(mat, vec, paralelo.normalizar_procesos(procesos))
+    _escribir_resultado(latex.vector(res))
+    return _terminar_traza()
 
 
-def combinacion_lineal_vectores(vectors: list[list[str]], target: list[str]) -> str:
-    latex.LATEX_STDOUT.clear()
+@contexto.por_pedido
+def combinacion_lineal_vectores(vectors: list[list[str]], target: list[str], detallado: bool = False, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
     vecs = [_vector_make(v) for v in vectors]
     tgt = _vector_make(target)
-    fn.combinacion_lineal(tgt.dimension, vecs, tgt)
-    return latex.LATEX_STDOUT.stdout
+    fn.combinacion_lineal(tgt.dimension, vecs, tgt, detallado)
+    return _terminar_traza()
 
 
-def dependencia_lineal_vectores(vectors: list[list[str]]) -> str:
-    latex.LATEX_STDOUT.clear()
+@contexto.por_pedido
+def dependencia_lineal_vectores(vectors: list[list[str]], detallado: bool = False, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
     vecs = [_vector_make(v) for v in vectors]
-    fn.dependencia_lineal(vecs[0].dimension, vecs)
-    return latex.LATEX_STDOUT.stdout
+    fn.dependencia_lineal(vecs[0].dimension, vecs, detallado)
+    return _terminar_traza()
 
 
-def resolver_cramer(coeffs: list[list[str]], results: list[str]) -> str:
+@contexto.por_pedido
+def resolver_cramer(coeffs: list[list[str]], results: list[str], verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
     """
     Resuelve un sistema Ax = b usando regla de Cramer.
     """
-    latex.LATEX_STDOUT.clear()
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
     A = input.matrix_make(coeffs)
     b_vec = _vector_make(results)
 
@@ -361,49 +512,62 @@ def resolver_cramer(coeffs: list[list[str]], results: list[str]) -> str:
     if b_vec.dimension != A.filas:
         raise ValueError("El vector de resultados debe tener la misma cantidad de filas que A.")
 
-    n = A.filas
-    detA = op.determinante_por_cofactores(A)
-    latex.LATEX_STDOUT.writelatex(latex.text("Determinante de A: ") + latex.number_parse(detA) + latex.newline())
-
-    if detA == 0:
-        latex.LATEX_STDOUT.writelatex(latex.text("El sistema no tiene solución única (det(A)=0).") + latex.newline())
-        return latex.LATEX_STDOUT.stdout
-
-    soluciones = []
-    for col in range(1, n + 1):
-        Ai = matriz.Matriz(A.filas, A.columnas)
-        for i in range(1, n + 1):
-            for j in range(1, n + 1):
-                Ai.set(i, j, b_vec.at(i) if j == col else A.at(i, j))
-        detAi = op.determinante_por_cofactores(Ai)
-        xi = detAi / detA
-        soluciones.append(xi)
-        latex.LATEX_STDOUT.writelatex(
-            latex.text(f"det(A{col}) = ") + latex.number_parse(detAi) + latex.text(f", x_{col} = det(A{col})/det(A)") + latex.newline()
-        )
-
-    latex.LATEX_STDOUT.writelatex(latex.text("Solución por Cramer:") + latex.newline())
-    for idx, val in enumerate(soluciones, start=1):
-        latex.LATEX_STDOUT.writelatex(latex.text(f"x_{idx} = ") + latex.number_parse(val) + latex.newline())
-    return latex.LATEX_STDOUT.stdout
-
-def inversa_por_adjunta(m1: list[list[str]]) -> str:
+    fn.regla_de_cramer(A, b_vec)
+    return _terminar_traza()
+
+@contexto.por_pedido
+def inversa_por_adjunta(m1: list[list[str]], procesos: int = 1, verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
     """
     Calcula la inversa usando el metodo de la adjunta.
+    Con procesos > 1 (o 0 = todos los nucleos) los cofactores se reparten.
     """
-    latex.LATEX_STDOUT.clear()
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
     mat = input.matrix_make(m1)
-    inv = op.inversion_por_adjunta(mat)
-    latex.LATEX_STDOUT.writelatex(latex.matrix(inv))
-    return latex.LATEX_STDOUT.stdout
+    inv = op.inversion_por_adjunta(mat, paralelo.normalizar_procesos(procesos))
+    _escribir_resultado(latex.matrix(inv))
+    return _terminar_traza()
 
 
-def inversa_por_gauss_jordan(m1: list[list[str]]) -> str:
+@contexto.por_pedido
+def inversa_por_gauss_jordan(m1: list[list[str]], modo: str = num.MODO_EXACTO, precision: int = 8, metodo: str = "clasico", verificar: bool = False, pivoteo: str = "primero", verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> str:
     """
     Calcula la inversa por Gauss-Jordan con identidad aumentada.
     """
-    latex.LATEX_STDOUT.clear()
-    mat = input.matrix_make(m1)
-    fn.calcular_inversa(mat, mat.filas)
-    return latex.LATEX_STDOUT.stdout
+    _iniciar_traza(verbosidad, presupuesto_pasos, presupuesto_bytes)
+    if num.es_numerico(modo):
+        inv = num.inversa(num.arreglo(m1))
+        _escribir_resultado(
+            num.encabezado("Inversa por factorización LU") + latex.matrix_decimal(inv, precision))
+        return _terminar_traza()
+    mat = elegir_representacion(input.matrix_make(m1))
+    fn.calcular_inversa(mat, mat.filas, metodo, verificar, pivoteo)
+    return _terminar_traza()
+
+
+
+def exportar_traza(formato: str = "latex", pedido: int | None = None) -> str:
+    """
+    Devuelve la traza de una operacion reciente (por defecto la ultima) en
+    otro formato: "latex" (lo mismo que devuelve la operacion), "texto" o
+    "json". Los pasos se guardan como eventos, asi que no hace falta
+    recalcular nada.
+    """
+    buffer = contexto.traza_reciente(pedido)
+    if formato == "latex":
+        return buffer.stdout
+    if formato == "texto":
+        return traza.texto(buffer)
+    if formato == "json":
+        return json.dumps(traza.json(buffer), ensure_ascii=False)
+    raise Exception(f"Formato de traza desconocido: {formato}")
+
 
+def leer_traza(cursor: int = 0, pedido: int | None = None) -> dict[str, Any]:
+    """
+    Lee la traza de una operacion (por defecto la ultima que empezo, aunque
+    siga corriendo) a partir de `cursor`, para mostrar una traza larga por
+    partes. Devuelve el LaTeX nuevo y el cursor para la proxima lectura.
+    """
+    buffer = contexto.traza_reciente(pedido)
+    salida, siguiente = buffer.leer_desde(cursor)
+    return {"latex": salida, "cursor": siguiente, "truncada": buffer.truncada}
@@ -1,16 +1,26 @@
 from fractions import Fraction
-from ..utils.auxiliar import sympy_expr
+from ..utils.auxiliar import sympy_expr, valor_exacto
+from ..models.number import Escalar
 from typing import Any
 
 import sympy
 
 
 class Matriz:
-    # Representa a la matriz,
-    matriz: list[list[sympy.Expr]] = []
-    filas = 0
-    columnas = 0
-    linea = -1
+    # Las celdas viven en una sola lista plana, fila por fila (row-major):
+    # la celda (i, j) 0-indexada esta en _datos[i * columnas + j].
+    # Con __slots__ cada instancia pesa menos y el acceso a atributos es mas rapido.
+    #
+    # Mientras todas las celdas sean racionales se guardan como Fraction
+    # (aritmetica de enteros de Python). Al aparecer una entrada simbolica
+    # la matriz entera se promueve a sympy.Expr y ya no vuelve atras.
+    __slots__ = ("filas", "columnas", "linea", "racional", "_datos")
+
+    filas: int
+    columnas: int
+    linea: int
+    racional: bool
+    _datos: list[Escalar]
 
     # Constructor de la clase
     def __init__(self, filas: int, columnas: int, linea: int = -1):
@@ -22,14 +32,10 @@ class Matriz:
         # Rellenamos las filas y columnas
         self.filas = filas
         self.columnas = columnas
-        self.matriz = []
-
-        for i in range(0, filas):
-            # Inicializamos cada una de las filas
-            self.matriz.append([]   )
-            for _ in range(0, columnas):
-                # Inicializamos todo a 0
-                self.matriz[i].append(sympy_expr(0))
+        self.linea = linea
+        self.racional = True
+        # Inicializamos todo a 0 (Fraction es inmutable, se puede compartir)
+        self._datos = [Fraction(0)] * (filas * columnas)
 
     # Check de limites
     # Lo puse entre dos barras bajas porque es un metodo 'privado' (no lo va a usar el usuario de la clase)
@@ -38,28 +44,89 @@ class Matriz:
             raise Exception(
                 f"Sobrepaso de indice, se pidió la posición ({fila},{columna}) en una matriz de {self.filas}x{self.columnas}")
 
+    # Pasa todas las celdas a sympy, se llama cuando entra un valor simbolico
+    def _promover_(self) -> None:
+        self._datos = [sympy_expr(v) for v in self._datos]
+        self.racional = False
+
+    # ---- Acceso interno sin chequeos (indices desde 0) ----
+    # Lo usan los kernels de `operaciones`/`funciones`. No validan limites
+    # ni convierten: los valores que se escriban ya deben estar normalizados
+    # con `_normalizar` (Fraction en modo racional, sympy.Expr si no).
+
+    def _normalizar(self, valor: Any) -> Escalar:
+        if self.racional:
+            valor = valor_exacto(valor)
+            if not isinstance(valor, Fraction):
+                self._promover_()
+            return valor
+        return sympy_expr(valor)
+
+    def _get(self, fila: int, columna: int) -> Escalar:
+        return self._datos[fila * self.columnas + columna]
+
+    def _put(self, fila: int, columna: int, valor: Escalar) -> None:
+        self._datos[fila * self.columnas + columna] = valor
+
+    def _fila(self, fila: int) -> list[Escalar]:
+        inicio = fila * self.columnas
+        return self._datos[inicio:inicio + self.columnas]
+
+    def _poner_fila(self, fila: int, valores: list[Escalar]) -> None:
+        inicio = fila * self.columnas
+        self._datos[inicio:inicio + self.columnas] = valores
+
+    def _columna(self, columna: int) -> list[Escalar]:
+        return self._datos[columna::self.columnas]
+
+    @classmethod
+    def _desde_filas(cls, filas: list[list[Escalar]], racional: bool) -> "Matriz":
+        # Arma una matriz a partir de filas ya normalizadas, sin pasar por set()
+        nueva = cls(len(filas), len(filas[0]) if filas else 0)
+        nueva._datos = [v for fila in filas for v in fila]
+        nueva.racional = racional
+        return nueva
+
+    @classmethod
+    def _desde_valores(cls, filas: int, columnas: int, valores: list[Any]) -> "Matriz":
+        # Igual que llenar con set() celda por celda, pero decidiendo el modo
+        # (racional o sympy) una sola vez para toda la lista
+        nueva = cls(filas, columnas)
+        exactos = [valor_exacto(v) for v in valores]
+        if all(isinstance(v, Fraction) for v in exactos):
+            nueva._datos = exactos
+        else:
+            nueva._datos = [sympy_expr(v) for v in exactos]
+            nueva.racional = False
+        return nueva
+
+    # ---- API publica (indices desde 1, con chequeo) ----
+
     # Indice
-    def at(self, fila: int, columna: int) -> sympy.Expr:
+    def at(self, fila: int, columna: int) -> Escalar:
         self._boundcheck_(fila, columna)
         # como los arreglos en python empiezan a contar de 0, restemos 1
         # asi la posicion #1 se convierte a 0, la verdadera posicion inicial
-        return self.matriz[fila-1][columna-1]
+        return self._get(fila - 1, columna - 1)
 
-    def row(self, fila: int) -> list[sympy.Expr]:
-        return self.matriz[fila - 1]
+    def row(self, fila: int) -> list[Escalar]:
+        self._boundcheck_(fila, 1)
+        return self._fila(fila - 1)
 
-    def column(self, columna: int) -> list[sympy.Expr]:
-        column: list[sympy.Expr] = []
-        for row in self.matriz:
-            column.append(row[columna - 1])
+    def column(self, columna: int) -> list[Escalar]:
+        self._boundcheck_(1, columna)
+        return self._columna(columna - 1)
 
-        return column
+    # Vista en lista de listas, solo lectura (se arma en cada llamada)
+    @property
+    def matriz(self) -> list[list[Escalar]]:
+        return [self._fila(i) for i in range(self.filas)]
 
     # Set
     def set(self, fila: int, columna: int, valor: Any) -> None:
         self._boundcheck_(fila, columna)
         # Explicacion en la funcion d arriba
-        self.matriz[fila - 1][columna - 1] = sympy_expr(valor)
+        self._put(fila - 1, columna - 1, self._normalizar(valor))
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Matriz):
@@ -68,10 +135,9 @@ class Matriz:
         if other.filas != self.filas or other.columnas != self.columnas:
             return False
 
-        for i in range(1, self.filas + 1):
-            for j in range(1, self.columnas + 1):
-                if self.at(i, j) != other.at(i, j):
-                    return False
+        for i in range(self.filas):
+            if self._fila(i) != other._fila(i):
+                return False
 
         return True
 
@@ -79,8 +145,84 @@ class Matriz:
     def copy(self) -> "Matriz":
         copia: Matriz = Matriz(self.filas, self.columnas)
 
-        for i in range(1, self.filas + 1):
-            for j in range(1, self.columnas + 1):
-                copia.set(i, j, self.at(i, j))
+        # Las celdas ya estan normalizadas, asi que se copian tal cual
+        copia._datos = self._datos.copy()
+        copia.racional = self.racional
 
         return copia
+
+
+class MatrizView(Matriz):
+    """
+    Vista de solo lectura sobre otra matriz: guarda que filas y columnas del
+    padre se ven (indices desde 0) en vez de copiar las celdas. Sirve para
+    menores, cofactores y bloques de una matriz aumentada.
+
+    La vista refleja los cambios que se le hagan al padre despues de crearla.
+    Para modificarla hay que pedir una copia con `materializar()`.
+    """
+    __slots__ = ("_padre", "_idx_filas", "_idx_columnas")
+
+    _padre: Matriz
+    _idx_filas: list[int]
+    _idx_columnas: list[int]
+
+    def __init__(self, padre: Matriz, filas: list[int], columnas: list[int]):
+        if not filas or not columnas:
+            raise Exception(
+                "El numero de filas y columnas tienen que ser mayores a 0")
+
+        # Una vista de una vista apunta directo a la matriz real,
+        # asi el costo de acceso no crece con cada nivel de recursion
+        if isinstance(padre, MatrizView):
+            filas = [padre._idx_filas[f] for f in filas]
+            columnas = [padre._idx_columnas[c] for c in columnas]
+            padre = padre._padre
+
+        self._padre = padre
+        self._idx_filas = filas
+        self._idx_columnas = columnas
+        self.filas = len(filas)
+        self.columnas = len(columnas)
+        self.linea = -1
+
+    @property
+    def racional(self) -> bool:  # type: ignore[override]
+        return self._padre.racional
+
+    def _solo_lectura_(self) -> Exception:
+        return Exception(
+            "La vista de una matriz es de solo lectura, usa materializar() para obtener una copia modificable")
+
+    def _promover_(self) -> None:
+        raise self._solo_lectura_()
+
+    def _normalizar(self, valor: Any) -> Escalar:
+        raise self._solo_lectura_()
+
+    def _get(self, fila: int, columna: int) -> Escalar:
+        return self._padre._get(self._idx_filas[fila], self._idx_columnas[columna])
+
+    def _put(self, fila: int, columna: int, valor: Escalar) -> None:
+        raise self._solo_lectura_()
+
+    def _fila(self, fila: int) -> list[Escalar]:
+        fila_padre = self._padre._fila(self._idx_filas[fila])
+        return [fila_padre[c] for c in self._idx_columnas]
+
+    def _poner_fila(self, fila: int, valores: list[Escalar]) -> None:
+        raise self._solo_lectura_()
+
+    def _columna(self, columna: int) -> list[Escalar]:
+        c = self._idx_columnas[columna]
+        return [self._padre._get(f, c) for f in self._idx_filas]
+
+    def set(self, fila: int, columna: int, valor: Any) -> None:
+        raise self._solo_lectura_()
+
+    # Copia las celdas visibles a una Matriz normal e independiente del padre
+    def materializar(self) -> Matriz:
+        return Matriz._desde_filas([self._fila(i) for i in range(self.filas)], self.racional)
+
+    def copy(self) -> Matriz:
+        return self.materializar()
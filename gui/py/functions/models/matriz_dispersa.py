@@ -0,0 +1,117 @@
+from fractions import Fraction
+from typing import Any
+from ..utils.auxiliar import sympy_expr
+from ..models.number import Escalar
+from .matriz import Matriz
+
+# Por debajo de esta densidad (no nulos / total) conviene la version dispersa
+DENSIDAD_DISPERSA = 0.3
+# En matrices chicas el ahorro no compensa, se quedan densas
+MIN_CELDAS_DISPERSA = 36
+
+
+class MatrizDispersa(Matriz):
+    """
+    Matriz que solo guarda las celdas distintas de 0: cada fila es un
+    diccionario {columna: valor} (indices desde 0). Los ceros estructurales
+    no ocupan memoria y los kernels de fila de `operaciones` los saltan.
+
+    `relleno` cuenta cuantas celdas que eran 0 pasaron a ser no nulas
+    durante la eliminacion (fill-in).
+    """
+    __slots__ = ("_filas_d", "relleno")
+
+    _filas_d: list[dict[int, Escalar]]
+    relleno: int
+
+    def __init__(self, filas: int, columnas: int, linea: int = -1):
+        if filas <= 0 or columnas <= 0:
+            raise Exception(
+                "El numero de filas y columnas tienen que ser mayores a 0")
+
+        self.filas = filas
+        self.columnas = columnas
+        self.linea = linea
+        self.racional = True
+        self.relleno = 0
+        self._filas_d = [{} for _ in range(filas)]
+
+    @classmethod
+    def desde(cls, mat: Matriz) -> "MatrizDispersa":
+        dispersa = cls(mat.filas, mat.columnas, mat.linea)
+        dispersa.racional = mat.racional
+        for i in range(mat.filas):
+            dispersa._filas_d[i] = {
+                c: v for c, v in enumerate(mat._fila(i)) if v != 0}
+        return dispersa
+
+    # Los constructores de Matriz llenan `_datos`, que aca no existe: se
+    # redefinen para que armen las filas dispersas
+
+    @classmethod
+    def _desde_filas(cls, filas: list[list[Escalar]], racional: bool) -> "MatrizDispersa":
+        nueva = cls(len(filas), len(filas[0]) if filas else 0)
+        nueva._filas_d = [{c: v for c, v in enumerate(f) if v != 0} for f in filas]
+        nueva.racional = racional
+        return nueva
+
+    @classmethod
+    def _desde_valores(cls, filas: int, columnas: int, valores: list[Any]) -> "MatrizDispersa":
+        return cls.desde(Matriz._desde_valores(filas, columnas, valores))
+
+    def no_nulos(self) -> int:
+        return sum(len(f) for f in self._filas_d)
+
+    def _promover_(self) -> None:
+        self._filas_d = [{c: sympy_expr(v) for c, v in f.items()}
+                         for f in self._filas_d]
+        self.racional = False
+
+    def _cero(self) -> Escalar:
+        return Fraction(0) if self.racional else sympy_expr(0)
+
+    def _get(self, fila: int, columna: int) -> Escalar:
+        valor = self._filas_d[fila].get(columna)
+        return self._cero() if valor is None else valor
+
+    def _put(self, fila: int, columna: int, valor: Escalar) -> None:
+        if valor == 0:
+            self._filas_d[fila].pop(columna, None)
+        else:
+            self._filas_d[fila][columna] = valor
+
+    def _fila(self, fila: int) -> list[Escalar]:
+        valores = [self._cero()] * self.columnas
+        for c, v in self._filas_d[fila].items():
+            valores[c] = v
+        return valores
+
+    def _poner_fila(self, fila: int, valores: list[Escalar]) -> None:
+        self._filas_d[fila] = {c: v for c, v in enumerate(valores) if v != 0}
+
+    def _columna(self, columna: int) -> list[Escalar]:
+        return [self._get(f, columna) for f in range(self.filas)]
+
+    def copy(self) -> "MatrizDispersa":
+        copia = MatrizDispersa(self.filas, self.columnas, self.linea)
+        copia._filas_d = [f.copy() for f in self._filas_d]
+        copia.racional = self.racional
+        copia.relleno = self.relleno
+        return copia
+
+
+def elegir_representacion(mat: Matriz) -> Matriz:
+    """
+    Devuelve la misma matriz o su version dispersa segun la densidad de la entrada.
+    """
+    total = mat.filas * mat.columnas
+    if isinstance(mat, MatrizDispersa) or total < MIN_CELDAS_DISPERSA:
+        return mat
+
+    no_nulos = 0
+    for i in range(mat.filas):
+        no_nulos += sum(1 for v in mat._fila(i) if v != 0)
+
+    if no_nulos / total <= DENSIDAD_DISPERSA:
+        return MatrizDispersa.desde(mat)
+    return mat
@@ -2,3 +2,7 @@ from fractions import Fraction
 import sympy
 
 type Number = float | Fraction | sympy.Expr | int
+
+# Valor guardado en una celda de Matriz: Fraction mientras todo sea racional,
+# sympy.Expr cuando aparece algo simbolico (\pi, raices, variables...)
+type Escalar = Fraction | sympy.Expr
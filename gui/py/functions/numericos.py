@@ -4,17 +4,18 @@ import sympy
 from typing import Callable
 
 from .utils import latex
+from .utils import contexto
 from .utils import latparser as parser
 from .utils.auxiliar import sympy_expr
 
 
 def _line(*parts: str) -> None:
     """Append a single LaTeX line to the shared buffer."""
-    latex.LATEX_STDOUT.writelatex("".join(parts) + latex.newline())
+    contexto.salida().writelatex("".join(parts) + latex.newline())
 
 
 def _header(title: str, expr: sympy.Expr | None = None) -> None:
-    latex.LATEX_STDOUT.clear()
+    contexto.salida().clear()
     _line(latex.text(title))
     if expr is not None:
         _line(latex.text("f(x) = "), latex.sympy_expression(expr))
@@ -75,9 +76,10 @@ def _table(headers: list[str], rows: list[list[str]]) -> None:
         lines.append(" & ".join(row) + " \\\\")
     lines.append("\\hline ")
     lines.append("\\end{array}")
-    latex.LATEX_STDOUT.writelatex("".join(lines) + latex.newline())
+    contexto.salida().writelatex("".join(lines) + latex.newline())
 
 
+@contexto.por_pedido
 def biseccion(funcion: str, a: str, b: str, tolerancia: str, max_iter: int = 50) -> str:
     expr, f = _parse_function(funcion)
     _header("Metodo de biseccion", expr)
@@ -168,7 +170,7 @@ def biseccion(funcion: str, a: str, b: str, tolerancia: str, max_iter: int = 50)
         f"{iter_used}/{max_iter}",
     )
     return {
-        "latex": latex.LATEX_STDOUT.stdout,
+        "latex": contexto.salida().stdout,
         "raiz": float(c_val),
         "f_raiz": float(f(c_val)),
         "converge": converged,
@@ -176,6 +178,7 @@ def biseccion(funcion: str, a: str, b: str, tolerancia: str, max_iter: int = 50)
     }
 
 
+@contexto.por_pedido
 def regla_falsa(funcion: str, a: str, b: str, tolerancia: str, max_iter: int = 50) -> str:
     expr, f = _parse_function(funcion)
     _header("Metodo de regula falsi (falsa posicion)", expr)
@@ -266,7 +269,7 @@ def regla_falsa(funcion: str, a: str, b: str, tolerancia: str, max_iter: int = 5
         f"{iter_used}/{max_iter}",
     )
     return {
-        "latex": latex.LATEX_STDOUT.stdout,
+        "latex": contexto.salida().stdout,
         "raiz": float(c_val),
         "f_raiz": float(f(c_val)),
         "converge": converged,
@@ -294,6 +297,7 @@ def _ensure_domain(f: Callable[[float], float], df: Callable[[float], float], xi
     )
 
 
+@contexto.por_pedido
 def newton_raphson(funcion: str, x0: str, tolerancia: str, max_iter: int = 50) -> str:
     expr, f = _parse_function(funcion)
     x = sympy.symbols("x")
@@ -382,7 +386,7 @@ def newton_raphson(funcion: str, x0: str, tolerancia: str, max_iter: int = 50) -
         f"{iter_used}/{max_iter}",
     )
     return {
-        "latex": latex.LATEX_STDOUT.stdout,
+        "latex": contexto.salida().stdout,
         "raiz": float(xi),
         "f_raiz": float(f(xi)),
         "converge": converged,
@@ -390,6 +394,7 @@ def newton_raphson(funcion: str, x0: str, tolerancia: str, max_iter: int = 50) -
     }
 
 
+@contexto.por_pedido
 def secante(funcion: str, x0: str, x1: str, tolerancia: str, max_iter: int = 50) -> str:
     expr, f = _parse_function(funcion)
     _header("Metodo de la secante", expr)
@@ -473,7 +478,7 @@ def secante(funcion: str, x0: str, x1: str, tolerancia: str, max_iter: int = 50)
         f"{iter_used}/{max_iter}",
     )
     return {
-        "latex": latex.LATEX_STDOUT.stdout,
+        "latex": contexto.salida().stdout,
         "raiz": float(x_curr),
         "f_raiz": float(f(x_curr)),
         "converge": converged,
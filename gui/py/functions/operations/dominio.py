@@ -0,0 +1,69 @@
+"""
+Backend opcional con DomainMatrix de sympy.
+
+La matriz se convierte a un DomainMatrix sobre el dominio mas chico que
+contiene todas sus entradas: ZZ, QQ, polinomios (ZZ[x], QQ[x, pi]),
+funciones racionales (ZZ(x)) o una extension algebraica (QQ<sqrt(2)>).
+Ahi cada entrada es un objeto canonico del dominio, no un arbol de sympy,
+asi que las operaciones son mas rapidas y los ceros se reconocen siempre.
+Solo el resultado final se vuelve a convertir a expresiones.
+
+Si las entradas mezclan numeros algebraicos con simbolos o constantes
+trascendentes, sympy cae en el dominio EX (expresiones genericas). El
+resultado sigue siendo correcto pero no mas rapido que el camino normal.
+"""
+from sympy.polys.matrices import DomainMatrix
+from sympy.polys.matrices.exceptions import DMNonInvertibleMatrixError
+
+from ..models.matriz import Matriz
+from ..models.number import Escalar
+from ..utils.auxiliar import sympy_expr, valor_exacto
+
+
+def a_dominio(mat: Matriz) -> DomainMatrix:
+    filas = [[sympy_expr(v) for v in mat._fila(i)] for i in range(mat.filas)]
+    # extension=True hace que sqrt(2) sea un numero de QQ<sqrt(2)> y no un
+    # simbolo mas: sin eso sqrt(2)^2 - 2 no se reconoceria como cero
+    return DomainMatrix.from_list_sympy(mat.filas, mat.columnas, filas, extension=True)
+
+
+def a_matriz(dm: DomainMatrix) -> Matriz:
+    filas, columnas = dm.shape
+    valores = [valor_exacto(v) for v in dm.to_Matrix()]
+    return Matriz._desde_valores(filas, columnas, valores)
+
+
+def nombre_dominio(dm: DomainMatrix) -> str:
+    return str(dm.domain)
+
+
+def escalonada_reducida(mat: Matriz) -> tuple[Matriz, tuple[int, ...], str]:
+    """
+    Forma escalonada reducida, columnas pivote (0-indexadas) y el dominio
+    en el que se calculo.
+    """
+    dm = a_dominio(mat).to_field()
+    reducida, pivotes = dm.rref()
+    return a_matriz(reducida), tuple(pivotes), nombre_dominio(dm)
+
+
+def determinante(mat: Matriz) -> tuple[Escalar, str]:
+    if mat.filas != mat.columnas:
+        raise Exception(
+            f"No se puede obtener el determinante de una matriz no cuadrada")
+    dm = a_dominio(mat)
+    return valor_exacto(dm.domain.to_sympy(dm.det())), nombre_dominio(dm)
+
+
+def inversa(mat: Matriz) -> tuple[Matriz, str]:
+    if mat.filas != mat.columnas:
+        raise Exception("La matriz debe ser cuadrada")
+    dm = a_dominio(mat).to_field()
+    try:
+        return a_matriz(dm.inv()), nombre_dominio(dm)
+    except DMNonInvertibleMatrixError:
+        raise Exception("La matriz no es invertible.")
+
+
+def rango(mat: Matriz) -> int:
+    return a_dominio(mat).rank()
@@ -0,0 +1,126 @@
+"""
+Rango, nucleo y pertenencia al espacio generado por un conjunto de vectores.
+
+Para preguntar si unos vectores son independientes, o si un vector esta en
+su espacio generado, no hace falta la forma escalonada reducida: basta la
+eliminacion hacia adelante, y muchas veces ni siquiera completa.
+
+- Independencia: se corta en la primera columna sin pivote.
+- Rango: se corta cuando ya no quedan filas para mas pivotes.
+- Pertenencia: se elimina [V | b] y se miran las filas sin pivote; la
+  sustitucion hacia atras solo se hace si se piden los coeficientes.
+- Nucleo: la base sale directo de la sustitucion hacia atras sobre la
+  forma escalonada, una vez por cada variable libre.
+
+Nada de esto imprime pasos. La version con traza sigue siendo
+`funciones.resolver_sistema`.
+"""
+from fractions import Fraction
+
+from ..models.number import Escalar
+from ..models.vector import Vector
+from ..utils.auxiliar import normalizar, valor_exacto
+from ..utils.ceros import es_cero
+
+type Filas = list[list[Escalar]]
+
+
+def matriz_de_columnas(vectores: list[Vector], objetivo: Vector | None = None) -> Filas:
+    # Los vectores como columnas (y el objetivo, si hay, como ultima columna)
+    columnas = vectores if objetivo is None else [*vectores, objetivo]
+    dimension = columnas[0].dimension
+    for v in columnas:
+        if v.dimension != dimension:
+            raise Exception("Todos los vectores deben tener la misma dimensión.")
+    return [[valor_exacto(v.componentes[i]) for v in columnas] for i in range(dimension)]
+
+
+def escalonar(filas: Filas, columnas: int, parar_sin_pivote: bool = False) -> tuple[Filas, list[tuple[int, int]]]:
+    """
+    Eliminacion hacia adelante sobre las primeras `columnas` columnas (las
+    demas solo acompanan). Devuelve las filas escalonadas y los pivotes
+    (fila, columna). Con `parar_sin_pivote` se detiene en la primera
+    columna que no tiene pivote.
+    """
+    filas = [[normalizar(v) for v in f] for f in filas]
+    m = len(filas)
+    pivotes: list[tuple[int, int]] = []
+    fila = 0
+    for col in range(columnas):
+        if fila == m:
+            # Sin filas libres, las columnas que quedan no tienen pivote
+            break
+        p = next((i for i in range(fila, m) if not es_cero(filas[i][col])), None)
+        if p is None:
+            if parar_sin_pivote:
+                break
+            continue
+        filas[fila], filas[p] = filas[p], filas[fila]
+
+        pivote = filas[fila][col]
+        resto_pivote = filas[fila][col:]
+        for i in range(fila + 1, m):
+            valor = filas[i][col]
+            if not es_cero(valor):
+                factor = valor / pivote
+                filas[i][col:] = [normalizar(a - factor * b)
+                                      for a, b in zip(filas[i][col:], resto_pivote)]
+        pivotes.append((fila, col))
+        fila += 1
+    return filas, pivotes
+
+
+def _sustituir(filas: Filas, pivotes: list[tuple[int, int]], incognitas: int,
+               libres: dict[int, Escalar], lado_derecho: int | None) -> list[Escalar]:
+    # Sustitucion hacia atras: fija las variables libres y despeja las de pivote
+    x: list[Escalar] = [libres.get(j, Fraction(0)) for j in range(incognitas)]
+    for fila, col in reversed(pivotes):
+        acumulado: Escalar = filas[fila][lado_derecho] if lado_derecho is not None else Fraction(0)
+        for j in range(col + 1, incognitas):
+            if filas[fila][j] != 0 and x[j] != 0:
+                acumulado = acumulado - filas[fila][j] * x[j]
+        x[col] = normalizar(acumulado / filas[fila][col])
+    return x
+
+
+def rango(vectores: list[Vector]) -> int:
+    filas = matriz_de_columnas(vectores)
+    return len(escalonar(filas, len(vectores))[1])
+
+
+def son_independientes(vectores: list[Vector]) -> bool:
+    # Mas vectores que la dimension: dependientes sin hacer cuentas
+    if len(vectores) > vectores[0].dimension:
+        return False
+    filas = matriz_de_columnas(vectores)
+    return len(escalonar(filas, len(vectores), parar_sin_pivote=True)[1]) == len(vectores)
+
+
+def base_nucleo(vectores: list[Vector]) -> list[list[Escalar]]:
+    """
+    Base del nucleo de la matriz con los vectores como columnas: cada
+    elemento son los coeficientes de una relacion de dependencia. Vacia si
+    los vectores son independientes.
+    """
+    k = len(vectores)
+    filas, pivotes = escalonar(matriz_de_columnas(vectores), k)
+    columnas_pivote = {col for _, col in pivotes}
+    return [_sustituir(filas, pivotes, k, {libre: Fraction(1)}, None)
+            for libre in range(k) if libre not in columnas_pivote]
+
+
+def en_generado(vectores: list[Vector], objetivo: Vector,
+                coeficientes: bool = False) -> tuple[bool, list[Escalar] | None]:
+    """
+    Dice si `objetivo` es combinacion lineal de `vectores`. Con
+    `coeficientes` tambien devuelve una combinacion (variables libres en 0).
+    """
+    k = len(vectores)
+    filas, pivotes = escalonar(matriz_de_columnas(vectores, objetivo), k)
+    # Las filas sin pivote quedaron en cero a la izquierda: si alguna tiene
+    # algo en la columna del objetivo, el sistema es inconsistente
+    if any(not es_cero(filas[i][k]) for i in range(len(pivotes), len(filas))):
+        return False, None
+    if not coeficientes:
+        return True, None
+    return True, _sustituir(filas, pivotes, k, {}, k)
@@ -0,0 +1,213 @@
+"""
+Factorizacion PLU exacta reutilizable.
+
+Cuando la misma matriz se usa para un determinante, una inversa y uno o
+varios sistemas, la eliminacion se hace una sola vez: `factorizar` guarda
+la factorizacion en un cache indexado por el contenido de la matriz, asi
+que otra Matriz con las mismas celdas (por ejemplo, la que llega en la
+siguiente llamada desde la interfaz) reutiliza los factores.
+"""
+from collections import OrderedDict
+from fractions import Fraction
+from threading import Lock
+from typing import Any
+
+from ..models.matriz import Matriz
+from ..models.number import Escalar
+from ..utils.auxiliar import normalizar, sympy_expr
+from ..utils.ceros import es_cero
+
+# Cuantas factorizaciones distintas se recuerdan
+TAMANO_CACHE = 32
+
+
+class FactorizacionPLU:
+    """
+    P A = L U, con P una permutacion de filas, L triangular inferior con
+    unos en la diagonal y U escalonada. Funciona con matrices rectangulares
+    o singulares: `rango` y `pivotes` salen de la misma eliminacion, y
+    `resolver`/`inversa` solo se permiten cuando A es cuadrada e invertible.
+    """
+
+    def __init__(self, mat: Matriz):
+        self.filas = mat.filas
+        self.columnas = mat.columnas
+        self.racional = mat.racional
+
+        m, n = self.filas, self.columnas
+        cero: Escalar = Fraction(0) if self.racional else sympy_expr(0)
+
+        # Las celdas se normalizan antes de empezar: un cero simbolico sin
+        # cancelar no puede terminar elegido como pivote
+        u: list[list[Escalar]] = [[normalizar(v) for v in mat._fila(i)] for i in range(m)]
+        l: list[list[Escalar]] = [[cero] * m for _ in range(m)]
+        permutacion = list(range(m))
+        signo = 1
+        pivotes: list[tuple[int, int]] = []
+
+        fila = 0
+        for col in range(n):
+            if fila == m:
+                break
+
+            p = None
+            for i in range(fila, m):
+                if not es_cero(u[i][col]):
+                    p = i
+                    break
+                u[i][col] = cero
+            if p is None:
+                continue
+
+            if p != fila:
+                u[fila], u[p] = u[p], u[fila]
+                l[fila], l[p] = l[p], l[fila]
+                permutacion[fila], permutacion[p] = permutacion[p], permutacion[fila]
+                signo = -signo
+
+            pivote = u[fila][col]
+            fila_pivote = u[fila]
+            for i in range(fila + 1, m):
+                if es_cero(u[i][col]):
+                    u[i][col] = cero
+                    continue
+                factor = normalizar(u[i][col] / pivote)
+                l[i][fila] = factor
+                actual = u[i]
+                for j in range(col + 1, n):
+                    actual[j] = normalizar(actual[j] - factor * fila_pivote[j])
+                actual[col] = cero
+
+            pivotes.append((fila, col))
+            fila += 1
+
+        for i in range(m):
+            l[i][i] = Fraction(1) if self.racional else sympy_expr(1)
+
+        self._l = l
+        self._u = u
+        self.permutacion = permutacion
+        self.signo = signo
+        self.pivotes = pivotes
+        self.rango = len(pivotes)
+
+    @property
+    def cuadrada(self) -> bool:
+        return self.filas == self.columnas
+
+    @property
+    def invertible(self) -> bool:
+        return self.cuadrada and self.rango == self.filas
+
+    def L(self) -> Matriz:
+        return Matriz._desde_filas([f.copy() for f in self._l], self.racional)
+
+    def U(self) -> Matriz:
+        return Matriz._desde_filas([f.copy() for f in self._u], self.racional)
+
+    def P(self) -> Matriz:
+        p = Matriz(self.filas, self.filas)
+        for i, original in enumerate(self.permutacion):
+            p._put(i, original, Fraction(1))
+        return p
+
+    def determinante(self) -> Escalar:
+        if not self.cuadrada:
+            raise Exception(
+                f"No se puede obtener el determinante de una matriz no cuadrada")
+        if self.rango < self.filas:
+            return Fraction(0) if self.racional else sympy_expr(0)
+
+        det: Escalar = Fraction(self.signo) if self.racional else sympy_expr(self.signo)
+        for i in range(self.filas):
+            det *= self._u[i][i]
+        return normalizar(det)
+
+    def _verificar_invertible(self) -> None:
+        if not self.cuadrada:
+            raise Exception("La matriz de coeficientes debe ser cuadrada")
+        if not self.invertible:
+            raise Exception("La matriz no es invertible.")
+
+    def resolver(self, b: list[Any]) -> list[Escalar]:
+        """
+        Resuelve A x = b con sustitucion hacia adelante (L) y hacia atras (U).
+        """
+        self._verificar_invertible()
+        n = self.filas
+        if len(b) != n:
+            raise Exception(
+                f"El lado derecho debe tener {n} componentes, se dieron {len(b)}")
+
+        # L y = P b
+        y: list[Escalar] = []
+        for i in range(n):
+            acumulado: Escalar = b[self.permutacion[i]]
+            fila_l = self._l[i]
+            for k in range(i):
+                if fila_l[k] != 0:
+                    acumulado = acumulado - fila_l[k] * y[k]
+            y.append(normalizar(acumulado))
+
+        # U x = y
+        x: list[Escalar] = [Fraction(0)] * n
+        for i in range(n - 1, -1, -1):
+            acumulado = y[i]
+            fila_u = self._u[i]
+            for k in range(i + 1, n):
+                if fila_u[k] != 0:
+                    acumulado = acumulado - fila_u[k] * x[k]
+            x[i] = normalizar(acumulado / fila_u[i])
+        return x
+
+    def resolver_matriz(self, B: Matriz) -> Matriz:
+        """
+        Resuelve A X = B columna por columna reutilizando los mismos factores.
+        """
+        if B.filas != self.filas:
+            raise Exception(
+                "El número de filas de B debe coincidir con las de A")
+
+        columnas = [self.resolver(B._columna(j)) for j in range(B.columnas)]
+        valores = [columnas[j][i]
+                   for i in range(self.filas) for j in range(B.columnas)]
+        return Matriz._desde_valores(self.filas, B.columnas, valores)
+
+    def inversa(self) -> Matriz:
+        self._verificar_invertible()
+        identidad = Matriz(self.filas, self.filas)
+        for i in range(self.filas):
+            identidad._put(i, i, Fraction(1))
+        return self.resolver_matriz(identidad)
+
+
+_cache: OrderedDict[tuple[Any, ...], FactorizacionPLU] = OrderedDict()
+_cache_lock = Lock()
+
+
+def _clave(mat: Matriz) -> tuple[Any, ...]:
+    # Fraction(1) y sympy.Integer(1) son iguales y tienen el mismo hash: sin
+    # `racional` una matriz y su version promovida compartirian la entrada
+    celdas = tuple(v for i in range(mat.filas) for v in mat._fila(i))
+    return (mat.filas, mat.columnas, mat.racional, celdas)
+
+
+def factorizar(mat: Matriz) -> FactorizacionPLU:
+    """
+    Devuelve la factorizacion PLU de `mat`, calculandola solo si no hay una
+    guardada para una matriz con el mismo contenido.
+    """
+    clave = _clave(mat)
+    with _cache_lock:
+        guardada = _cache.get(clave)
+        if guardada is not None:
+            _cache.move_to_end(clave)
+            return guardada
+
+    nueva = FactorizacionPLU(mat)
+
+    with _cache_lock:
+        _cache[clave] = nueva
+        if len(_cache) > TAMANO_CACHE:
+            _cache.popitem(last=False)
+    return nueva
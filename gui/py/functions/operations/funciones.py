@@ -1,11 +1,22 @@
 from ..models.matriz import Matriz
+from ..models.matriz_dispersa import MatrizDispersa
 from ..models.vector import Vector
 from fractions import Fraction
+from math import lcm
+from collections.abc import Callable
+from typing import Any
 
 from ..operations import operaciones as op
-from ..operations.operaciones import funnel
+from ..operations.operaciones import funnel, funnel_resultado
+from ..operations.factorizacion import factorizar
+from ..operations import espacios
+from ..operations import dominio
 from ..utils import latex as latex
-from ..utils.auxiliar import sympy_expr
+from ..utils import traza
+from ..utils import contexto
+from ..utils.auxiliar import sympy_expr, valor_exacto
+from ..utils.ceros import es_cero
+from ..models.number import Escalar
 
 import sympy
 
@@ -21,90 +32,275 @@ class Posicion:
         return f"({self.fila}, {self.columna})"
 
 
-# Pasos
-__pasos__ = 0
+# Pasos: el contador vive en el contexto del pedido en curso
 
 
 def resetear_pasos() -> None:
-    global __pasos__
-    __pasos__ = 0
+    contexto.actual().pasos = 0
 
 
 def imprimir_paso(texto_paso: str, mat: Matriz | None = None) -> None:
-    global __pasos__
-    __pasos__ += 1
-    funnel(latex.text(f"Paso #{__pasos__}: {texto_paso}"))
+    ctx = contexto.actual()
+    ctx.pasos += 1
+    op.nuevo_paso()
+    if op.traza_activa():
+        funnel(latex.text(f"Paso #{ctx.pasos}: {texto_paso}"))
 
 
 def paso() -> None:
-    global __pasos__
-    __pasos__ += 1
-    funnel(latex.text(f"Paso #{__pasos__}"), latex.newline())
+    ctx = contexto.actual()
+    ctx.pasos += 1
+    op.nuevo_paso()
+    if op.traza_activa():
+        funnel(latex.text(f"Paso #{ctx.pasos}"), latex.newline())
 
 
-def matriz_escalonada_reducida(mat: Matriz, filas: int, columnas: int) -> None:
+def mostrar_matriz(mat: Matriz) -> None:
+    # La instantanea copia todas las filas: en silencio, con poca verbosidad
+    # o con el presupuesto agotado ni se arma
+    if op.traza_activa():
+        funnel(latex.newline(), traza.matriz(mat), latex.newline())
+
+
+# Estrategias de pivoteo. Cada una da un costo por candidato y se elige el
+# de menor costo (en empate, el de mas arriba). "primero" no compara nada:
+# toma el primer elemento no nulo de la columna, como siempre
+
+
+def _bits(valor: Escalar) -> int:
+    # Altura de un racional: tamano en bits de numerador y denominador
+    if isinstance(valor, Fraction):
+        return max(abs(valor.numerator).bit_length(), valor.denominator.bit_length())
+    if isinstance(valor, sympy.Rational):
+        return max(abs(int(valor.p)).bit_length(), int(valor.q).bit_length())
+    return 0
+
+
+def _costo_magnitud(valor: Escalar) -> tuple[int, float]:
+    # Mayor valor absoluto primero; los que no se pueden evaluar van al final
+    try:
+        return 0, -abs(complex(valor))
+    except (TypeError, ValueError):
+        return 1, 0.0
+
+
+def _costo_altura(valor: Escalar) -> tuple[int, int]:
+    # Racionales mas chicos primero; una expresion simbolica va despues
+    if isinstance(valor, (Fraction, sympy.Rational)):
+        return 0, _bits(valor)
+    return 1, sympy.count_ops(valor)
+
+
+def _costo_complejidad(valor: Escalar) -> tuple[int, int]:
+    # Menos operaciones en la expresion primero, y entre iguales el mas bajo
+    operaciones = sympy.count_ops(valor) if isinstance(valor, sympy.Expr) else 0
+    return operaciones, _bits(valor)
+
+
+estrategias_pivoteo: dict[str, Callable[[Escalar], Any] | None] = {
+    "primero": None,
+    "magnitud": _costo_magnitud,
+    "altura": _costo_altura,
+    "complejidad": _costo_complejidad,
+}
+
+
+def _estrategia_pivoteo(pivoteo: str) -> Callable[[Escalar], Any] | None:
+    if pivoteo not in estrategias_pivoteo:
+        raise Exception(
+            f"Estrategia de pivoteo desconocida: {pivoteo}. Opciones: {', '.join(estrategias_pivoteo)}")
+    return estrategias_pivoteo[pivoteo]
+
+
+def _cero_en(mat: Matriz, fila: int, columna: int) -> bool:
+    # Ademas de decidir, cambia un cero sin simplificar por un cero exacto
+    # para que no siga arrastrandose en las operaciones siguientes
+    valor = mat.at(fila, columna)
+    if not es_cero(valor):
+        return False
+    if valor != 0:
+        mat.set(fila, columna, Fraction(0))
+    return True
+
+
+def _elegir_pivote(mat: Matriz, desde: int, hasta: int, columna: int,
+                   costo: Callable[[Escalar], Any] | None) -> int | None:
+    # Fila (desde..hasta) del pivote para la columna, o None si son todos ceros
+    mejor: int | None = None
+    mejor_costo: Any = None
+    for i in range(desde, hasta + 1):
+        if _cero_en(mat, i, columna):
+            continue
+        if costo is None:
+            return i
+        actual = costo(mat.at(i, columna))
+        if mejor is None or actual < mejor_costo:
+            mejor, mejor_costo = i, actual
+    return mejor
+
+
+def _anunciar_pivoteo(pivoteo: str) -> None:
+    if pivoteo != "primero":
+        funnel(latex.text(f"Estrategia de pivoteo: {pivoteo}"), latex.newline())
+
+
+def _traer_pivote(mat: Matriz, fila_pivote: int, elegida: int, pivoteo: str) -> None:
+    if elegida == fila_pivote:
+        return
+    if pivoteo == "primero":
+        imprimir_paso(f"Intercambio de filas")
+    else:
+        imprimir_paso(f"Intercambio de filas (pivote por {pivoteo}): ")
+    op.intercambiar_fila(mat, fila_pivote, elegida)
+    mostrar_matriz(mat)
+
+
+def matriz_escalonada_reducida(mat: Matriz, filas: int, columnas: int, pivoteo: str = "primero") -> None:
+    costo = _estrategia_pivoteo(pivoteo)
     fila_pivote = 0
     columna_pivote = 0
 
     funnel(latex.text(
         "Reduciendo matriz a forma escalonada reducida..."), latex.newline())
+    _anunciar_pivoteo(pivoteo)
 
     while fila_pivote < filas and columna_pivote < columnas:
         fila_pivote += 1
         columna_pivote += 1
 
-        pivote: sympy.Expr = sympy_expr(0)
-
-        while pivote == 0 and columna_pivote <= columnas:
-            pivote = mat.at(fila_pivote, columna_pivote)
-
-            if pivote != 0:
-                break
+        # Las columnas sin candidatos (todo cero desde aqui abajo) se saltan
+        elegida = _elegir_pivote(mat, fila_pivote, filas, columna_pivote, costo)
+        while elegida is None:
+            columna_pivote += 1
+            if columna_pivote > columnas:
+                return
+            elegida = _elegir_pivote(
+                mat, fila_pivote, filas, columna_pivote, costo)
 
-            encontrado: bool = False
-            for i in range(fila_pivote + 1, filas + 1):
-                if mat.at(i, columna_pivote) != 0:
-                    encontrado = True
-                    imprimir_paso(
-                        f"Intercambio de filas")
-                    op.intercambiar_fila(mat, fila_pivote, i)
-                    funnel(latex.newline(), latex.matrix(mat), latex.newline())
-                    pivote = mat.at(fila_pivote, columna_pivote)
-                    break
-
-            if not encontrado:
-                columna_pivote += 1
-                if columna_pivote > columnas:
-                    return
-                pivote = mat.at(fila_pivote, columna_pivote)
-
-        if columna_pivote > columnas:
-            return
+        _traer_pivote(mat, fila_pivote, elegida, pivoteo)
+        pivote: Escalar = mat.at(fila_pivote, columna_pivote)
 
         if pivote != 1:
             imprimir_paso(
                 f"Normalizar fila: ")
-            op.escalar_fila(mat, fila_pivote, sympy_expr(1) / pivote)
-            funnel(latex.newline(), latex.matrix(mat), latex.newline())
+            op.escalar_fila(mat, fila_pivote, Fraction(1) / pivote)
+            mostrar_matriz(mat)
 
         for i in range(fila_pivote + 1, filas + 1):
-            factor: sympy.Expr = mat.at(i, columna_pivote)
-            if factor == 0:
+            if _cero_en(mat, i, columna_pivote):
                 continue
+            factor: Escalar = mat.at(i, columna_pivote)
 
             imprimir_paso(
                 f"Resta compuesta: ")
-            op.restar_escalar_fila(mat, sympy_expr(1), i, factor, fila_pivote)
-            funnel(latex.newline(), latex.matrix(mat), latex.newline())
+            op.restar_escalar_fila(mat, Fraction(1), i, factor, fila_pivote)
+            mostrar_matriz(mat)
 
         for i in range(1, fila_pivote):
-            factor = mat.at(i, columna_pivote)
-            if factor == 0:
+            if _cero_en(mat, i, columna_pivote):
                 continue
+            factor = mat.at(i, columna_pivote)
             imprimir_paso(
                 f"Resta compuesta: ")
             op.restar_escalar_fila(mat, Fraction(1), i, factor, fila_pivote)
-            funnel(latex.newline(), latex.matrix(mat), latex.newline())
+            mostrar_matriz(mat)
+
+
+def matriz_escalonada_reducida_sin_fracciones(mat: Matriz, filas: int, columnas: int, pivoteo: str = "primero") -> None:
+    """
+    Gauss-Jordan sin fracciones: cada paso es fi -> (p*fi - a*fp) / p_anterior,
+    con p el pivote actual y p_anterior el del paso previo. Esa division es
+    exacta, asi que una matriz entera se mantiene entera (los numeros crecen
+    como menores de la matriz, no como fracciones cada vez mas grandes).
+    Solo al final cada fila pivote se divide por su pivote, y el resultado
+    es la misma forma escalonada reducida que la version clasica.
+    """
+    costo = _estrategia_pivoteo(pivoteo)
+    funnel(latex.text(
+        "Reduciendo matriz a forma escalonada reducida (sin fracciones)..."), latex.newline())
+    _anunciar_pivoteo(pivoteo)
+
+    # Si hay entradas racionales, primero se quitan los denominadores
+    if mat.racional:
+        for i in range(1, filas + 1):
+            factor = lcm(*(v.denominator for v in mat._fila(i - 1)))  # type: ignore[union-attr]
+            if factor != 1:
+                imprimir_paso(f"Quitar denominadores: ")
+                op.escalar_fila(mat, i, factor)
+                mostrar_matriz(mat)
+
+    anterior: Escalar = Fraction(1)
+    fila_pivote = 0
+    pivotes: list[Posicion] = []
+
+    for columna in range(1, columnas + 1):
+        if fila_pivote == filas:
+            break
+
+        encontrada = _elegir_pivote(mat, fila_pivote + 1, filas, columna, costo)
+        if encontrada is None:
+            continue
+
+        fila_pivote += 1
+        _traer_pivote(mat, fila_pivote, encontrada, pivoteo)
+
+        pivote = mat.at(fila_pivote, columna)
+        for i in range(1, filas + 1):
+            if i == fila_pivote:
+                continue
+            nulo = _cero_en(mat, i, columna)
+            factor: Escalar = mat.at(i, columna)
+            # Con factor 0 y pivote igual al anterior la fila no cambia
+            if nulo and pivote == anterior:
+                continue
+            imprimir_paso(f"Combinación sin fracciones: ")
+            op.combinar_fila_sin_fracciones(
+                mat, pivote, i, factor, fila_pivote, anterior)
+            mostrar_matriz(mat)
+
+        pivotes.append(Posicion(fila_pivote, columna))
+        anterior = pivote
+
+    # Unica division del metodo: cada fila pivote entre su pivote
+    for posicion in pivotes:
+        pivote = mat.at(posicion.fila, posicion.columna)
+        if pivote != 1:
+            imprimir_paso(
+                f"Normalizar fila: ")
+            op.escalar_fila(mat, posicion.fila, Fraction(1) / pivote)
+            mostrar_matriz(mat)
+
+
+def matriz_escalonada_reducida_dominio(mat: Matriz, filas: int, columnas: int, pivoteo: str = "primero") -> None:
+    """
+    Gauss-Jordan dentro de un DomainMatrix de sympy (ver `dominio`). No hay
+    pasos intermedios: se muestra el dominio elegido y la matriz reducida.
+    El pivoteo lo decide DomainMatrix, asi que `pivoteo` no se usa.
+    """
+    reducida, _, nombre = dominio.escalonada_reducida(mat)
+    funnel(latex.text(
+        f"Reduciendo matriz a forma escalonada reducida (DomainMatrix sobre {nombre})..."), latex.newline())
+    for i in range(1, mat.filas + 1):
+        for j in range(1, mat.columnas + 1):
+            mat.set(i, j, reducida.at(i, j))
+    imprimir_paso(f"Forma escalonada reducida: ")
+    mostrar_matriz(mat)
+
+
+# Variantes de eliminacion que se pueden elegir en resolver_sistema y calcular_inversa
+metodos_eliminacion: dict[str, Callable[..., None]] = {
+    "clasico": matriz_escalonada_reducida,
+    "sin_fracciones": matriz_escalonada_reducida_sin_fracciones,
+    "dominio": matriz_escalonada_reducida_dominio,
+}
+
+
+def _metodo_eliminacion(metodo: str) -> Callable[..., None]:
+    eliminar = metodos_eliminacion.get(metodo)
+    if eliminar is None:
+        raise Exception(
+            f"Método de eliminación desconocido: {metodo}. Opciones: {', '.join(metodos_eliminacion)}")
+    return eliminar
 
 
 def obtener_pivotes(mat: Matriz, filas: int, columnas: int) -> list[Posicion]:
@@ -112,8 +308,8 @@ def obtener_pivotes(mat: Matriz, filas: int, columnas: int) -> list[Posicion]:
     fila_actual = 1
 
     for c in range(1, columnas + 1):
-        pivote: Fraction = mat.at(fila_actual, c)
-        if pivote == 0:
+        pivote: Escalar = mat.at(fila_actual, c)
+        if es_cero(pivote):
             continue
         if pivote != 1:
             raise Exception(
@@ -133,31 +329,33 @@ def matriz_identidad(mat: Matriz, filas: int, columnas: int) -> None:
     funnel(latex.text("Reduciendo matriz a identidad..."), latex.newline())
 
     for c in range(1, columnas + 1):
-        pivote: Fraction = mat.at(fila_actual, c)
-        if pivote == 0:
+        pivote: Escalar = mat.at(fila_actual, c)
+        if es_cero(pivote):
             continue
         if pivote != 1:
             raise Exception(
                 f"La matriz dada no es escalonada reducida, se encontró elemento: {pivote} en posición de pivote")
 
         for f in range(1, fila_actual):
-            factor: Fraction = mat.at(f, c)
-            if factor == 0:
+            factor: Escalar = mat.at(f, c)
+            if es_cero(factor):
                 continue
             imprimir_paso(
                 f"Resta compuesta: ")
             op.restar_escalar_fila(mat, Fraction(1), f, factor, fila_actual)
-            funnel(latex.newline(), latex.matrix(mat), latex.newline())
+            mostrar_matriz(mat)
 
         fila_actual += 1
         if fila_actual > filas:
             return
 
 
-def resolver_sistema(mat: Matriz, ecuaciones: int, incognitas: int) -> None:
+def resolver_sistema(mat: Matriz, ecuaciones: int, incognitas: int, metodo: str = "clasico", pivoteo: str = "primero") -> None:
     """
     Resuelve un sistema de ecuaciones lineales (AX=B o AX=0)
     """
+    eliminar = _metodo_eliminacion(metodo)
+    _estrategia_pivoteo(pivoteo)
     resetear_pasos()
 
     if mat.filas != ecuaciones:
@@ -171,7 +369,7 @@ def resolver_sistema(mat: Matriz, ecuaciones: int, incognitas: int) -> None:
 
     es_homogeneo = True
     for i in range(1, ecuaciones+1):
-        if mat.at(i, columna_resultados) != 0:
+        if not es_cero(mat.at(i, columna_resultados)):
             es_homogeneo = False
             break
     tipo_sistema = "homogéneo" if es_homogeneo else "no homogéneo"
@@ -180,53 +378,62 @@ def resolver_sistema(mat: Matriz, ecuaciones: int, incognitas: int) -> None:
 
     funnel(latex.text(f"Iniciando resolución del sistema {tipo_sistema}."))
 
-    funnel(latex.newline(), latex.matrix(mat), latex.newline())
+    mostrar_matriz(mat)
+
+    no_nulos_iniciales = mat.no_nulos() if isinstance(mat, MatrizDispersa) else 0
 
-    matriz_escalonada_reducida(mat, ecuaciones, incognitas)
+    eliminar(mat, ecuaciones, incognitas, pivoteo)
+
+    if isinstance(mat, MatrizDispersa):
+        funnel(latex.text(
+            f"Representación dispersa: {no_nulos_iniciales} elementos no nulos al inicio, "
+            f"{mat.relleno} creados durante la eliminación (relleno)."), latex.newline())
 
     pivotes: list[Posicion] = obtener_pivotes(mat, ecuaciones, incognitas)
     num_pivotes = len(pivotes)
     funnel(latex.text(
         f"El sistema contiene {num_pivotes} pivotes."), latex.newline())
 
-    funnel(latex.text("Matriz en forma Escalonada Reducida:"),
-           latex.newline(), latex.matrix(mat), latex.newline(), latex.newline())
+    if op.traza_activa():
+        funnel(latex.text("Matriz en forma Escalonada Reducida:"),
+               latex.newline(), traza.matriz(mat), latex.newline(), latex.newline())
     funnel(latex.text(f"El sistema es {tipo_sistema}."), latex.newline())
 
     inconsistente = False
     for fila in range(1, ecuaciones + 1):
         fila_nula: bool = True
         for columna in range(1, incognitas + 1):
-            if mat.at(fila, columna) != 0:
+            if not es_cero(mat.at(fila, columna)):
                 fila_nula = False
                 break
-        if fila_nula and mat.at(fila, columna_resultados) != 0:
+        if fila_nula and not es_cero(mat.at(fila, columna_resultados)):
             inconsistente = True
-            funnel(latex.text(
+            funnel_resultado(latex.text(
                 "El sistema es inconsistente. No tiene solución"), latex.newline())
             return
 
     matriz_identidad(mat, ecuaciones, incognitas)
-    funnel(latex.text("Matriz en forma identidad:"), latex.newline(),
-           latex.matrix(mat), latex.newline(), latex.newline())
+    if op.traza_activa():
+        funnel(latex.text("Matriz en forma identidad:"), latex.newline(),
+               traza.matriz(mat), latex.newline(), latex.newline())
     funnel(latex.text(f"El sistema es {tipo_sistema}."), latex.newline())
 
     if num_pivotes == incognitas:
-        funnel(latex.text(
+        funnel_resultado(latex.text(
             "El sistema es consistente con una solución única."), latex.newline())
         if op.columna_nula(mat, columna_resultados):
-            funnel(latex.text(
+            funnel_resultado(latex.text(
                 "El sistema contiene una única solución trivial. (linealmente independiente)"), latex.newline())
         else:
-            funnel(latex.text(
+            funnel_resultado(latex.text(
                 "El sistema contiene una única solución no trivial. (linealmente dependiente)"), latex.newline())
     elif num_pivotes < incognitas:
-        funnel(latex.text(
+        funnel_resultado(latex.text(
             "El sistema es consistente con infinitas soluciones."), latex.newline())
-        funnel(latex.text(
+        funnel_resultado(latex.text(
             "El sistema tiene infinitas soluciones no triviales. (linealmente dependiente)"), latex.newline())
     else:
-        funnel(latex.text("El sistema es consistente."), latex.newline())
+        funnel_resultado(latex.text("El sistema es consistente."), latex.newline())
 
     variables: list[int | None] = [None] * incognitas
     for pivote in pivotes:
@@ -243,19 +450,19 @@ def resolver_sistema(mat: Matriz, ecuaciones: int, incognitas: int) -> None:
     funnel(latex.text(f"Columnas pivote: {columnas_pivote}"), latex.newline())
 
     if num_pivotes == incognitas:
-        funnel(latex.text("El sistema tiene una única solución:"),
+        funnel_resultado(latex.text("El sistema tiene una única solución:"),
                latex.newline(), latex.newline())
         for i in range(1, incognitas + 1):
             x_val = mat.at(i, columna_resultados)
-            funnel("x", latex.subscript(str(i)),
-                   " = ", latex.number_parse(x_val), latex.newline())
+            funnel_resultado("x", latex.subscript(str(i)),
+                   " = ", traza.numero(x_val), latex.newline())
     else:
-        funnel(latex.text("El sistema tiene infinitas soluciones (forma paramétrica):"),
+        funnel_resultado(latex.text("El sistema tiene infinitas soluciones (forma paramétrica):"),
                latex.newline(), latex.newline())
         for i in range(0, len(variables)):
             fila_variable = variables[i]
             if fila_variable is None:
-                funnel("x", latex.subscript(
+                funnel_resultado("x", latex.subscript(
                     str(i + 1)),
                     latex.text(" es libre"), latex.newline())
             else:
@@ -264,7 +471,7 @@ def resolver_sistema(mat: Matriz, ecuaciones: int, incognitas: int) -> None:
                 eq_parts.append("x" + latex.subscript(str(i + 1)) + " = ")
 
                 primer_termino = True
-                if resultado != 0:
+                if not es_cero(resultado):
                     eq_parts.append(latex.number_parse(resultado))
                     primer_termino = False
 
@@ -272,7 +479,7 @@ def resolver_sistema(mat: Matriz, ecuaciones: int, incognitas: int) -> None:
                     if columna == i + 1:
                         continue
                     coeficiente = mat.at(fila_variable, columna) * -1
-                    if coeficiente != 0:
+                    if not es_cero(coeficiente):
                         if not primer_termino:
                             eq_parts.append(" + " if coeficiente >= 0 else " ")
                         else:
@@ -285,14 +492,21 @@ def resolver_sistema(mat: Matriz, ecuaciones: int, incognitas: int) -> None:
                         eq_parts.append(coef_str + "x" +
                                         latex.subscript(str(columna)))
 
-                funnel("".join(eq_parts), latex.newline())
+                funnel_resultado("".join(eq_parts), latex.newline())
 
-    funnel(latex.text("Clasificación: Consistente."), latex.newline())
+    funnel_resultado(latex.text("Clasificación: Consistente."), latex.newline())
 
 
-def calcular_inversa(mat: Matriz, tamaño: int) -> None:
+def calcular_inversa(mat: Matriz, tamaño: int, metodo: str = "clasico", verificar: bool = False, pivoteo: str = "primero") -> None:
+    """
+    Calcula la inversa reduciendo [A | I] una sola vez. Las propiedades de
+    invertibilidad (c), (d) y (e) salen de los pivotes de esa misma
+    reduccion. Con `verificar` se muestra ademas A * A⁻¹, calculado sin traza.
+    """
+    eliminar = _metodo_eliminacion(metodo)
+    _estrategia_pivoteo(pivoteo)
     if mat.filas != tamaño or mat.columnas != tamaño:
-        funnel(latex.text("La matriz debe ser cuadrada!"), latex.newline())
+        funnel_resultado(latex.text("La matriz debe ser cuadrada!"), latex.newline())
         return
 
     funnel(latex.text("=============================================="),
@@ -301,29 +515,26 @@ def calcular_inversa(mat: Matriz, tamaño: int) -> None:
     funnel(latex.text("=============================================="),
            latex.newline(), latex.newline())
 
-    matriz_completa = Matriz(tamaño, tamaño * 2)
     identidad = op.hacer_matriz_identidad(tamaño)
+    matriz_completa = op.aumentar_matrices(mat, identidad)
 
-    for fila in range(1, tamaño + 1):
-        for columna in range(1, tamaño + 1):
-            matriz_completa.set(fila, columna, mat.at(fila, columna))
-            matriz_completa.set(fila, columna + tamaño,
-                                identidad.at(fila, columna))
-
-    funnel(latex.text("Matriz aumentada inicial:"), latex.newline(),
-           latex.matrix(matriz_completa), latex.newline())
+    if op.traza_activa():
+        funnel(latex.text("Matriz aumentada inicial:"), latex.newline(),
+               traza.matriz(matriz_completa), latex.newline())
 
     resetear_pasos()
-    matriz_escalonada_reducida(matriz_completa, tamaño, tamaño)
+    eliminar(matriz_completa, tamaño, tamaño, pivoteo)
 
+    # Los pivotes del bloque izquierdo son los de A: de ellos sale todo lo demas
     pivotes: list[Posicion] = obtener_pivotes(matriz_completa, tamaño, tamaño)
+    invertible = len(pivotes) == tamaño
 
     funnel(latex.newline(), latex.text(
         "--- Propiedades teóricas sobre invertibilidad ---"), latex.newline())
 
     funnel(latex.text(
         f"(c) Pivotes encontrados: {len(pivotes)} de {tamaño}"), latex.newline())
-    if len(pivotes) == tamaño:
+    if invertible:
         funnel(latex.text(
             "Interpretación: A tiene n pivotes, entonces A es invertible."), latex.newline())
     else:
@@ -331,53 +542,75 @@ def calcular_inversa(mat: Matriz, tamaño: int) -> None:
             "Interpretación: A no tiene n pivotes, entonces A no es invertible."), latex.newline())
 
     funnel(latex.text(
-        "(d) Resolviendo Ax = 0 para verificar soluciones..."), latex.newline())
-    matriz_homogenea = Matriz(tamaño, tamaño + 1)
-    for fila in range(1, tamaño + 1):
-        for columna in range(1, tamaño + 1):
-            matriz_homogenea.set(fila, columna, mat.at(fila, columna))
-    funnel(latex.text("Matriz aumentada [A | 0]:"), latex.newline(
-    ), latex.matrix(matriz_homogenea), latex.newline())
-    funnel(latex.text("Resolviendo a identidad..."), latex.newline())
-    matriz_escalonada_reducida(matriz_homogenea, tamaño, tamaño)
-    pivotes_homogenea = obtener_pivotes(matriz_homogenea, tamaño, tamaño)
-    if len(pivotes_homogenea) == tamaño:
+        "(d) Soluciones de Ax = 0 (el bloque izquierdo ya es la forma escalonada reducida de A):"), latex.newline())
+    if invertible:
         funnel(latex.text(
             "Interpretación: Ax = 0 solo tiene la solución trivial, entonces A⁻¹ existe."), latex.newline())
     else:
+        libres = [c for c in range(1, tamaño + 1)
+                  if c not in {p.columna for p in pivotes}]
+        funnel(latex.text(
+            f"Variables libres: {libres}"), latex.newline())
         funnel(latex.text(
             "Interpretación: Ax = 0 tiene soluciones no triviales, entonces A⁻¹ no existe."), latex.newline())
 
     funnel(latex.text(
         "(e) Verificando independencia lineal de las columnas de A..."), latex.newline())
-    if len(pivotes) == tamaño:
+    if invertible:
         funnel(latex.text(
             "Interpretación: Las columnas de A son linealmente independientes, entonces A es invertible."), latex.newline())
     else:
         funnel(latex.text(
             "Interpretación: Las columnas de A no son linealmente independientes, entonces A no es invertible."), latex.newline())
 
-    parte_izquierda = op.slice_matriz(
-        matriz_completa, (1, tamaño), (1, tamaño))
-
-    if parte_izquierda == identidad:
+    if invertible:
         inversa = op.slice_matriz(
             matriz_completa, (1, tamaño), (tamaño + 1, tamaño * 2))
-        funnel(latex.text("La matriz es no singular (determinante diferente de 0) y su inversa es:"),
-               latex.newline(), latex.matrix(inversa), latex.newline())
-
-        funnel(latex.newline(), latex.text(
-            "Verificación (A * A⁻¹):"), latex.newline())
-        verificacion = op.multiplicar_matrices(mat, inversa)
-        funnel(latex.matrix(verificacion), latex.newline())
+        funnel_resultado(latex.text("La matriz es no singular (determinante diferente de 0) y su inversa es:"),
+               latex.newline(), traza.matriz(inversa), latex.newline())
+
+        if verificar:
+            funnel_resultado(latex.newline(), latex.text(
+                "Verificación (A * A⁻¹):"), latex.newline())
+            verificacion = op.producto_sin_traza(mat, inversa)
+            funnel_resultado(traza.matriz(verificacion), latex.newline())
     else:
-        funnel(latex.text(
+        parte_izquierda = op.slice_matriz(
+            matriz_completa, (1, tamaño), (1, tamaño))
+        funnel_resultado(latex.text(
             "La matriz es singular (determinante es 0) y no tiene inversa"), latex.newline())
-        funnel(latex.text("Parte izquierda resultante:"), latex.newline(),
-               latex.matrix(parte_izquierda), latex.newline())
+        funnel_resultado(latex.text("Parte izquierda resultante:"), latex.newline(),
+               traza.matriz(parte_izquierda), latex.newline())
+
 
+def _combinacion_lineal_rapida(vectores: list[Vector], resultado: Vector) -> None:
+    pertenece, coeficientes = espacios.en_generado(
+        vectores, resultado, coeficientes=True)
+    if not pertenece or coeficientes is None:
+        funnel_resultado(latex.text(
+            "El sistema es inconsistente: el vector no es combinación lineal de los vectores dados."), latex.newline())
+        return
+
+    funnel_resultado(latex.text("El vector es combinación lineal de los vectores dados:"),
+           latex.newline(), latex.newline())
+    eq_parts = ["  "]
+    for i, (c, v) in enumerate(zip(coeficientes, vectores)):
+        eq_parts.append(latex.number_parse(c) + latex.cdot() + latex.vector(v))
+        if i < len(vectores) - 1:
+            eq_parts.append(" + ")
+    eq_parts.append(" = " + latex.vector(resultado))
+    funnel_resultado("".join(eq_parts), latex.newline())
+
+
+def combinacion_lineal(dimension: int, vectores: list[Vector], resultado: Vector, detallado: bool = False) -> None:
+    """
+    Sin `detallado` solo se responde si el vector esta en el espacio
+    generado (y con que coeficientes), sin mostrar la reduccion.
+    """
+    if not detallado:
+        _combinacion_lineal_rapida(vectores, resultado)
+        return
 
-def combinacion_lineal(dimension: int, vectores: list[Vector], resultado: Vector) -> None:
     incognitas = len(vectores)
     ecuaciones = dimension
 
@@ -398,7 +631,7 @@ def combinacion_lineal(dimension: int, vectores: list[Vector], resultado: Vector
            latex.newline(), latex.newline())
 
     funnel(latex.newline(), latex.text("Matriz del sistema planteado:"),
-           latex.newline(), latex.newline(), latex.matrix(matriz), latex.newline())
+           latex.newline(), latex.newline(), traza.matriz(matriz), latex.newline())
 
     funnel(latex.newline(), latex.text("=== Resolución del sistema ==="),
            latex.newline(), latex.newline())
@@ -429,54 +662,101 @@ def resolver_ecuacion_matricial(A: Matriz, B: Matriz) -> Matriz:
     if B.filas != n:
         raise Exception("El número de filas de B debe coincidir con las de A")
 
-    m = B.columnas
+    # Una sola factorizacion sirve para todas las columnas de B, y si A ya
+    # se factorizo antes (det, inversa, otro sistema) sale del cache
+    plu = factorizar(A)
 
-    aumentada = Matriz(n, n + m)
+    if op.traza_activa():
+        # P, L y U son copias: solo se arman si se van a mostrar
+        funnel(latex.text("Factorización PA = LU de A:"), latex.newline(),
+               latex.text("P = "), traza.matriz(plu.P()), latex.newline(),
+               latex.text("L = "), traza.matriz(plu.L()), latex.newline(),
+               latex.text("U = "), traza.matriz(plu.U()), latex.newline())
 
-    for i in range(1, n + 1):
-        for j in range(1, n + 1):
-            aumentada.set(i, j, A.at(i, j))
+    if not plu.invertible:
+        raise Exception(
+            "La matriz A no es invertible, la ecuación no tiene solución única")
 
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            aumentada.set(i, n + j, B.at(i, j))
+    funnel(latex.newline(), latex.text(
+        "=== Sustitución hacia adelante (Ly = PB) y hacia atrás (UX = y) ==="), latex.newline())
+    X = plu.resolver_matriz(B)
 
-    funnel(latex.text("Matriz aumentada [A | B]:"), latex.newline(
-    ), latex.matrix(aumentada), latex.newline())
+    funnel_resultado(latex.newline(), latex.text("=== Solución X ==="),
+           latex.newline(), traza.matriz(X), latex.newline())
 
-    resetear_pasos()
-    funnel(latex.newline(), latex.text(
-        "=== Aplicando eliminación de Gauss-Jordan ==="), latex.newline())
-    matriz_escalonada_reducida(aumentada, n, n)
-    matriz_identidad(aumentada, n, n)
+    return X
 
-    X = Matriz(n, m)
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            valor = aumentada.at(i, n + j)
-            X.set(i, j, valor)
 
-    funnel(latex.newline(), latex.text("=== Solución X ==="),
-           latex.newline(), latex.matrix(X), latex.newline())
+def regla_de_cramer(A: Matriz, b: Vector) -> list[Escalar] | None:
+    """
+    Resuelve Ax = b por la regla de Cramer. Devuelve None si det(A) = 0.
+    """
+    if A.filas != A.columnas:
+        raise Exception("La matriz de coeficientes debe ser cuadrada.")
+    n = A.filas
+    if b.dimension != n:
+        raise Exception(
+            "El vector de resultados debe tener la misma cantidad de filas que A.")
+
+    # Una sola factorizacion da det(A) y, resolviendo una vez, todos los
+    # det(A_i): como x_i = det(A_i) / det(A), det(A_i) = det(A) * x_i
+    plu = factorizar(A)
+    detA = plu.determinante()
+    funnel(latex.text("Determinante de A: "),
+           traza.numero(detA), latex.newline())
+
+    if not plu.invertible:
+        funnel_resultado(latex.text(
+            "El sistema no tiene solución única (det(A)=0)."), latex.newline())
+        return None
+
+    soluciones = plu.resolver([valor_exacto(v) for v in b.componentes])
+    for col, xi in enumerate(soluciones, start=1):
+        detAi = detA * xi
+        if isinstance(detAi, sympy.Expr):
+            detAi = sympy.cancel(detAi)
+        funnel(latex.text(f"det(A{col}) = "), traza.numero(detAi),
+               latex.text(f", x_{col} = det(A{col})/det(A)"), latex.newline())
+
+    funnel_resultado(latex.text("Solución por Cramer:"), latex.newline())
+    for idx, val in enumerate(soluciones, start=1):
+        funnel_resultado(latex.text(f"x_{idx} = "), traza.numero(val), latex.newline())
+    return soluciones
+
+
+def _dependencia_lineal_rapida(vectores: list[Vector]) -> None:
+    if espacios.son_independientes(vectores):
+        funnel_resultado(latex.text(
+            "Solo solución trivial (c₁=0, ..., cₙ=0): Los vectores son linealmente independientes."), latex.newline())
+        return
 
-    return X
+    funnel_resultado(latex.text(
+        "Existen soluciones no triviales: Los vectores son linealmente dependientes."), latex.newline())
+    funnel_resultado(latex.text("Base del espacio de soluciones (c₁, ..., cₙ):"), latex.newline())
+    for relacion in espacios.base_nucleo(vectores):
+        funnel_resultado(traza.vector(Vector(relacion)), latex.newline())
 
 
-def dependencia_lineal(dimension: int, vectores: list[Vector]) -> None:
+def dependencia_lineal(dimension: int, vectores: list[Vector], detallado: bool = False) -> None:
     """
     Determina si un conjunto de vectores es linealmente dependiente o independiente.
+    Sin `detallado` se usa la eliminacion corta de `espacios`, sin pasos.
     """
     num_vectores = len(vectores)
 
     if num_vectores > dimension:
         funnel(latex.text(
             f"Paso 1: Más vectores ({num_vectores}) que la dimensión ({dimension}): Dependientes por teorema."), latex.newline())
-        funnel(latex.newline(), latex.text(
+        funnel_resultado(latex.newline(), latex.text(
             "Los vectores ingresados son linealmente dependientes."), latex.newline())
         funnel(latex.newline(), latex.text(
             "=============================================="), latex.newline())
         return
 
+    if not detallado:
+        _dependencia_lineal_rapida(vectores)
+        return
+
     matriz: Matriz = Matriz(dimension, num_vectores + 1)
     for col in range(1, num_vectores + 1):
         vec = vectores[col - 1]
@@ -491,7 +771,7 @@ def dependencia_lineal(dimension: int, vectores: list[Vector]) -> None:
            latex.newline(), latex.newline())
 
     funnel(latex.newline(), latex.text("Matriz del sistema homogéneo planteado:"),
-           latex.newline(), latex.newline(), latex.matrix(matriz), latex.newline())
+           latex.newline(), latex.newline(), traza.matriz(matriz), latex.newline())
 
     eq_parts = ["Paso 1: Planteo: "]
     for i, vec in enumerate(vectores, 1):
@@ -508,10 +788,10 @@ def dependencia_lineal(dimension: int, vectores: list[Vector]) -> None:
 
     pivotes = obtener_pivotes(matriz, dimension, num_vectores)
     if len(pivotes) == num_vectores:
-        funnel(latex.text(
+        funnel_resultado(latex.text(
             "Solo solución trivial (c₁=0, ..., cₙ=0): Los vectores son linealmente independientes."), latex.newline())
     else:
-        funnel(latex.text(
+        funnel_resultado(latex.text(
             "Existen soluciones no triviales: Los vectores son linealmente dependientes."), latex.newline())
 
     funnel(latex.newline(), latex.text(
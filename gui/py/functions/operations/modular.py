@@ -0,0 +1,211 @@
+"""
+Determinante y rango exactos por aritmetica modular.
+
+La matriz racional se escala fila por fila a enteros, se elimina modulo
+varios primos de 31 bits (solo aritmetica de int, sin crecimiento de
+coeficientes) y el determinante exacto se reconstruye con el teorema
+chino del resto. Se usan primos hasta que su producto supera el doble de
+la cota de Hadamard, asi la reconstruccion es exacta y no probabilistica.
+
+Solo sirve para matrices racionales; las simbolicas van por Bareiss o PLU.
+"""
+from fractions import Fraction
+from math import isqrt, lcm, prod
+
+from ..models.matriz import Matriz
+from . import paralelo
+
+# Se empieza a buscar primos desde aqui hacia abajo
+_PRIMO_MAXIMO = 2 ** 31 - 1
+_primos: list[int] = []
+
+
+def _es_primo(n: int) -> bool:
+    # Miller-Rabin con bases fijas, determinista para n < 3.4 * 10^14
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7, 11, 13, 17):
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in (2, 3, 5, 7, 11, 13, 17):
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def primos(cantidad: int) -> list[int]:
+    # Los primos se calculan una vez y se guardan para las siguientes llamadas
+    candidato = _primos[-1] - 2 if _primos else _PRIMO_MAXIMO
+    while len(_primos) < cantidad:
+        if _es_primo(candidato):
+            _primos.append(candidato)
+        candidato -= 2
+    return _primos[:cantidad]
+
+
+def escalar_a_enteros(mat: Matriz) -> tuple[list[list[int]], int]:
+    """
+    Multiplica cada fila por el mcm de sus denominadores. Devuelve las filas
+    enteras y el producto de esos factores: det(A) = det(A') / factor.
+    """
+    if not mat.racional:
+        raise Exception(
+            "El método modular solo funciona con matrices de entradas racionales")
+
+    filas: list[list[int]] = []
+    factor = 1
+    for i in range(mat.filas):
+        fila: list[Fraction] = mat._fila(i)  # type: ignore[assignment]
+        m = lcm(*(v.denominator for v in fila))
+        filas.append([v.numerator * (m // v.denominator) for v in fila])
+        factor *= m
+    return filas, factor
+
+
+def cota_hadamard(filas: list[list[int]], k: int | None = None) -> int:
+    """
+    Cota superior del valor absoluto de cualquier menor k x k: el producto
+    de las k normas de fila mas grandes (redondeado hacia arriba).
+    """
+    normas = sorted((sum(a * a for a in fila) for fila in filas), reverse=True)
+    if k is not None:
+        normas = normas[:k]
+    return isqrt(prod(max(1, n) for n in normas)) + 1
+
+
+def primos_necesarios(cota: int) -> list[int]:
+    # Hace falta producto > 2 * cota para recuperar tambien el signo
+    usados: list[int] = []
+    producto = 1
+    k = 0
+    while producto <= 2 * cota:
+        k += 1
+        p = primos(k)[-1]
+        usados.append(p)
+        producto *= p
+    return usados
+
+
+def _det_mod(filas: list[list[int]], p: int) -> int:
+    n = len(filas)
+    a = [[v % p for v in fila] for fila in filas]
+    det = 1
+    for col in range(n):
+        piv = next((i for i in range(col, n) if a[i][col]), None)
+        if piv is None:
+            return 0
+        if piv != col:
+            a[col], a[piv] = a[piv], a[col]
+            det = -det
+        pivote = a[col][col]
+        det = det * pivote % p
+        inv = pow(pivote, -1, p)
+        # Solo hace falta la parte de la fila a la derecha del pivote
+        resto_pivote = a[col][col + 1:]
+        for i in range(col + 1, n):
+            f = a[i][col] * inv % p
+            if f:
+                a[i][col + 1:] = [(x - f * y) % p
+                                  for x, y in zip(a[i][col + 1:], resto_pivote)]
+    return det % p
+
+
+def _rango_mod(filas: list[list[int]], p: int) -> int:
+    m = len(filas)
+    n = len(filas[0]) if filas else 0
+    a = [[v % p for v in fila] for fila in filas]
+    rango = 0
+    for col in range(n):
+        if rango == m:
+            break
+        piv = next((i for i in range(rango, m) if a[i][col]), None)
+        if piv is None:
+            continue
+        a[rango], a[piv] = a[piv], a[rango]
+        inv = pow(a[rango][col], -1, p)
+        resto_pivote = a[rango][col + 1:]
+        for i in range(rango + 1, m):
+            f = a[i][col] * inv % p
+            if f:
+                a[i][col + 1:] = [(x - f * y) % p
+                                  for x, y in zip(a[i][col + 1:], resto_pivote)]
+        rango += 1
+    return rango
+
+
+# Trabajos para el pool: cada uno recibe las filas y un bloque de primos,
+# asi la matriz se serializa una vez por proceso y no una vez por primo
+def _trabajo_det(tarea: tuple[list[list[int]], list[int]]) -> list[int]:
+    filas, ps = tarea
+    return [_det_mod(filas, p) for p in ps]
+
+
+def _trabajo_rango(tarea: tuple[list[list[int]], list[int]]) -> list[int]:
+    filas, ps = tarea
+    return [_rango_mod(filas, p) for p in ps]
+
+
+def _por_primo(trabajo, filas: list[list[int]], ps: list[int], procesos: int) -> list[int]:  # type: ignore[no-untyped-def]
+    bloques = paralelo.repartir(ps, procesos)
+    resultados = paralelo.mapear(
+        trabajo, [(filas, b) for b in bloques], procesos)
+    return [r for bloque in resultados for r in bloque]
+
+
+def reconstruir(residuos: list[int], ps: list[int]) -> int:
+    """
+    Teorema chino del resto: el unico entero en (-M/2, M/2] congruente con
+    cada residuo, con M el producto de los primos.
+    """
+    x, m = 0, 1
+    for r, p in zip(residuos, ps):
+        # x + m * t = r (mod p)
+        t = (r - x) * pow(m, -1, p) % p
+        x += m * t
+        m *= p
+    return x - m if x > m // 2 else x
+
+
+def determinante_modular(mat: Matriz, procesos: int = 1) -> tuple[Fraction, int]:
+    """
+    Devuelve el determinante exacto y cuantos primos se usaron.
+    """
+    if mat.filas != mat.columnas:
+        raise Exception(
+            f"No se puede obtener el determinante de una matriz no cuadrada")
+
+    filas, factor = escalar_a_enteros(mat)
+    ps = primos_necesarios(cota_hadamard(filas))
+    residuos = _por_primo(_trabajo_det, filas, ps, procesos)
+    return Fraction(reconstruir(residuos, ps), factor), len(ps)
+
+
+def rango_modular(mat: Matriz, procesos: int = 1) -> tuple[int, int]:
+    """
+    Devuelve el rango exacto y cuantos primos se usaron. Modulo p el rango
+    solo puede bajar, y solo si p divide a todos los menores maximos; con
+    primos cuyo producto supera la cota de esos menores, el maximo de los
+    rangos modulares es el rango real.
+    """
+    filas, _ = escalar_a_enteros(mat)
+    k = min(mat.filas, mat.columnas)
+    ps = primos_necesarios(cota_hadamard(filas, k))
+
+    # Si el primer primo ya da rango completo no puede haber uno mayor
+    primero = _rango_mod(filas, ps[0])
+    if primero == k or len(ps) == 1:
+        return primero, 1
+
+    rangos = _por_primo(_trabajo_rango, filas, ps[1:], procesos)
+    return max(primero, *rangos), len(ps)
@@ -0,0 +1,176 @@
+"""
+Multiplicacion de matrices grandes sin traza paso a paso.
+
+Con entradas racionales, las filas de A y las columnas de B se escalan a
+enteros (mcm de sus denominadores). El producto se hace con int de Python,
+mucho mas baratos que Fraction, y cada celda se divide una sola vez al
+final. Por encima de `UMBRAL_STRASSEN` se usa la variante de Winograd de
+Strassen (7 productos de bloques en vez de 8). Por debajo, o con entradas
+simbolicas, se usa el orden i-k-j: cada fila del resultado se acumula
+sumando filas enteras de B, sin recorrer B por columnas. Ese orden no se
+parte en bloques para la cache: las filas son listas de referencias a
+int, y lo que cuesta es la aritmetica, no el acceso a memoria.
+
+Con entradas simbolicas no se usa Strassen. Sus restas solo se cancelan
+si se simplifica, y el resultado quedaria escrito de otra forma. Lo caro
+ahi es sympy, asi que con `procesos > 1` las filas del resultado se
+reparten en bloques entre procesos.
+"""
+from fractions import Fraction
+from math import lcm
+from typing import Any
+
+from ..models.matriz import Matriz
+from ..models.number import Escalar
+from ..utils.auxiliar import sympy_expr
+from . import paralelo
+
+# Tamano (de la dimension mas chica) desde el que conviene partir en bloques
+UMBRAL_STRASSEN = 64
+
+type Filas = list[list[Any]]
+
+
+def _clasico(A: Filas, B: Filas, cero: Any = 0) -> Filas:
+    # Orden i-k-j: C[i] = sum_k A[i][k] * B[k]. Los ceros de A se saltan
+    p = len(B[0])
+    C: Filas = []
+    for fila in A:
+        acumulado = [cero] * p
+        for a, fila_b in zip(fila, B):
+            if a:
+                acumulado = [c + a * b for c, b in zip(acumulado, fila_b)]
+        C.append(acumulado)
+    return C
+
+
+def _sumar(X: Filas, Y: Filas) -> Filas:
+    return [[x + y for x, y in zip(fx, fy)] for fx, fy in zip(X, Y)]
+
+
+def _restar(X: Filas, Y: Filas) -> Filas:
+    return [[x - y for x, y in zip(fx, fy)] for fx, fy in zip(X, Y)]
+
+
+def _bloque(M: Filas, fila: int, columna: int, filas: int, columnas: int) -> Filas:
+    # Submatriz de filas x columnas desde (fila, columna), rellena con ceros
+    # si se sale de M (asi las dimensiones impares no necesitan caso aparte)
+    bloque: Filas = []
+    for i in range(fila, fila + filas):
+        if i < len(M):
+            tramo = M[i][columna:columna + columnas]
+            bloque.append(tramo + [0] * (columnas - len(tramo)))
+        else:
+            bloque.append([0] * columnas)
+    return bloque
+
+
+def strassen(A: Filas, B: Filas, umbral: int = UMBRAL_STRASSEN) -> Filas:
+    """
+    Producto de matrices de enteros (listas de filas) por Strassen-Winograd:
+    7 productos recursivos y 15 sumas por nivel.
+    """
+    m, n, p = len(A), len(B), len(B[0])
+    if min(m, n, p) <= umbral:
+        return _clasico(A, B)
+
+    hm, hn, hp = (m + 1) // 2, (n + 1) // 2, (p + 1) // 2
+    A11, A12 = _bloque(A, 0, 0, hm, hn), _bloque(A, 0, hn, hm, hn)
+    A21, A22 = _bloque(A, hm, 0, hm, hn), _bloque(A, hm, hn, hm, hn)
+    B11, B12 = _bloque(B, 0, 0, hn, hp), _bloque(B, 0, hp, hn, hp)
+    B21, B22 = _bloque(B, hn, 0, hn, hp), _bloque(B, hn, hp, hn, hp)
+
+    S1 = _sumar(A21, A22)
+    S2 = _restar(S1, A11)
+    S3 = _restar(A11, A21)
+    S4 = _restar(A12, S2)
+    T1 = _restar(B12, B11)
+    T2 = _restar(B22, T1)
+    T3 = _restar(B22, B12)
+    T4 = _restar(T2, B21)
+
+    P1 = strassen(A11, B11, umbral)
+    P2 = strassen(A12, B21, umbral)
+    P3 = strassen(S4, B22, umbral)
+    P4 = strassen(A22, T4, umbral)
+    P5 = strassen(S1, T1, umbral)
+    P6 = strassen(S2, T2, umbral)
+    P7 = strassen(S3, T3, umbral)
+
+    U2 = _sumar(P1, P6)
+    U3 = _sumar(U2, P7)
+    C11 = _sumar(P1, P2)
+    C12 = _sumar(_sumar(U2, P5), P3)
+    C21 = _restar(U3, P4)
+    C22 = _sumar(U3, P5)
+
+    arriba = [(f1 + f2)[:p] for f1, f2 in zip(C11, C12)]
+    abajo = [(f1 + f2)[:p] for f1, f2 in zip(C21, C22)]
+    return (arriba + abajo)[:m]
+
+
+def _filas_enteras(mat: Matriz) -> tuple[Filas, list[int]]:
+    # Cada fila por el mcm de sus denominadores
+    filas: Filas = []
+    factores: list[int] = []
+    for i in range(mat.filas):
+        fila: list[Fraction] = mat._fila(i)  # type: ignore[assignment]
+        m = lcm(*(v.denominator for v in fila))
+        filas.append([v.numerator * (m // v.denominator) for v in fila])
+        factores.append(m)
+    return filas, factores
+
+
+def _columnas_enteras(mat: Matriz) -> tuple[Filas, list[int]]:
+    # Cada columna por el mcm de sus denominadores (se devuelve por filas)
+    factores = [lcm(*(v.denominator for v in mat._columna(j)))  # type: ignore[union-attr]
+                for j in range(mat.columnas)]
+    filas: Filas = []
+    for i in range(mat.filas):
+        fila: list[Fraction] = mat._fila(i)  # type: ignore[assignment]
+        filas.append([v.numerator * (m // v.denominator)
+                      for v, m in zip(fila, factores)])
+    return filas, factores
+
+
+def _bloque_simbolico_en_proceso(tarea: tuple[list[list[Any]], list[list[Any]]]) -> list[list[Any]]:
+    filas_a, filas_b = tarea
+    C = _clasico([paralelo.desempaquetar(f) for f in filas_a],
+                 [paralelo.desempaquetar(f) for f in filas_b], sympy_expr(0))
+    return [paralelo.empaquetar(f) for f in C]
+
+
+def producto(a: Matriz, b: Matriz, umbral: int = UMBRAL_STRASSEN,
+             procesos: int = 1) -> tuple[Matriz, str]:
+    """
+    Devuelve A * B y el nombre del algoritmo que se uso.
+    """
+    if a.columnas != b.filas:
+        raise Exception(
+            f"No se puede multiplicar una matriz de {a.filas}x{a.columnas} "
+            f"con una matriz de {b.filas}x{b.columnas}"
+        )
+
+    if a.racional and b.racional:
+        filas_a, factores_a = _filas_enteras(a)
+        filas_b, factores_b = _columnas_enteras(b)
+        usa_strassen = min(a.filas, a.columnas, b.columnas) > umbral
+        C = strassen(filas_a, filas_b, umbral)
+        filas: list[list[Escalar]] = [
+            [Fraction(c, fa * fb) for c, fb in zip(fila, factores_b)]
+            for fila, fa in zip(C, factores_a)]
+        metodo = "Strassen-Winograd con enteros" if usa_strassen else "i-k-j con enteros"
+        return Matriz._desde_filas(filas, True), metodo
+
+    filas_a = [a._fila(i) for i in range(a.filas)]
+    filas_b = [b._fila(i) for i in range(b.filas)]
+    if procesos > 1 and a.filas > 1:
+        B = [paralelo.empaquetar(f) for f in filas_b]
+        tareas = [([paralelo.empaquetar(f) for f in bloque], B)
+                  for bloque in paralelo.repartir(filas_a, procesos)]
+        partes = paralelo.mapear(_bloque_simbolico_en_proceso, tareas, procesos)
+        C = [paralelo.desempaquetar(f) for parte in partes for f in parte]
+    else:
+        C = _clasico(filas_a, filas_b, sympy_expr(0))
+    valores = [v for fila in C for v in fila]
+    return Matriz._desde_valores(a.filas, b.columnas, valores), "i-k-j"
@@ -0,0 +1,113 @@
+"""
+Modo numerico: las matrices se pasan a arreglos float64 de NumPy y las
+operaciones van directo a BLAS/LAPACK. No es exacto (punto flotante), pero
+sirve para matrices grandes donde sympy tardaria demasiado.
+
+NumPy es una dependencia opcional, solo se necesita si se usa este modo.
+"""
+from typing import Any
+
+from ..utils import input as input
+from ..utils import latex as latex
+
+import sympy
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depende del entorno
+    numpy = None
+
+MODO_EXACTO = "exacto"
+MODO_NUMERICO = "numerico"
+MODOS = (MODO_EXACTO, MODO_NUMERICO)
+
+
+def es_numerico(modo: str) -> bool:
+    if modo not in MODOS:
+        raise ValueError(
+            f"Modo desconocido: {modo}. Los modos validos son: {', '.join(MODOS)}")
+    return modo == MODO_NUMERICO
+
+
+def _numpy() -> Any:
+    if numpy is None:
+        raise Exception(
+            "El modo numérico necesita numpy instalado (pip install numpy)")
+    return numpy
+
+
+def _celda_a_float(celda: str) -> float:
+    # La mayoria de celdas son numeros planos: evitamos el parser de LaTeX
+    try:
+        return float(celda)
+    except (TypeError, ValueError):
+        return float(sympy.N(input.fraction_make(str(celda))))
+
+
+def arreglo(entrada: list[list[str]]) -> Any:
+    """
+    Convierte la entrada de la interfaz (lista de filas de texto) a un arreglo float64.
+    """
+    np = _numpy()
+    if len(entrada) == 0:
+        raise Exception("No se ingresaron datos")
+
+    columnas = len(entrada[0])
+    for fila in entrada:
+        if len(fila) != columnas:
+            raise Exception("Matrix is not consistent in its size")
+
+    return np.array([[_celda_a_float(c) for c in fila] for fila in entrada], dtype=np.float64)
+
+
+def vector(entrada: list[str]) -> Any:
+    np = _numpy()
+    if not entrada:
+        raise Exception("Un vector no puede estar vacío.")
+    return np.array([_celda_a_float(c) for c in entrada], dtype=np.float64)
+
+
+def sumar(a: Any, b: Any) -> Any:
+    if a.shape != b.shape:
+        raise Exception(
+            f"No se puede sumar una matriz de {a.shape[0]}x{a.shape[1]} con una matriz de {b.shape[0]}x{b.shape[1]}")
+    return a + b
+
+
+def restar(a: Any, b: Any) -> Any:
+    if a.shape != b.shape:
+        raise Exception(
+            f"No se puede restar una matriz de {a.shape[0]}x{a.shape[1]} con una matriz de {b.shape[0]}x{b.shape[1]}")
+    return a - b
+
+
+def multiplicar(a: Any, b: Any) -> Any:
+    if a.shape[1] != b.shape[0]:
+        raise Exception(
+            f"No se puede multiplicar una matriz de {a.shape[0]}x{a.shape[1]} "
+            f"con una matriz de {b.shape[0]}x{b.shape[1]}")
+    # matmul usa la rutina gemm/gemv de BLAS
+    return a @ b
+
+
+def determinante(a: Any) -> float:
+    np = _numpy()
+    if a.shape[0] != a.shape[1]:
+        raise Exception(
+            f"No se puede obtener el determinante de una matriz no cuadrada")
+    # Factorizacion LU de LAPACK (getrf)
+    return float(np.linalg.det(a))
+
+
+def inversa(a: Any) -> Any:
+    np = _numpy()
+    if a.shape[0] != a.shape[1]:
+        raise Exception(f"No se puede invertir una matriz no cuadrada")
+    try:
+        return np.linalg.inv(a)
+    except np.linalg.LinAlgError as e:
+        raise Exception("La matriz no es invertible.") from e
+
+
+def encabezado(operacion: str) -> str:
+    return latex.text(f"{operacion} (modo numérico, float64)") + latex.newline()
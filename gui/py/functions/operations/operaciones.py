@@ -1,19 +1,127 @@
-from ..models.matriz import Matriz
+from ..models.matriz import Matriz, MatrizView
+from ..models.matriz_dispersa import MatrizDispersa
 from ..models.vector import Vector
+from .factorizacion import factorizar
+from . import dominio
+from . import modular
+from . import multiplicacion
+from . import paralelo
 from fractions import Fraction
-from ..utils.auxiliar import sympy_expr
+from ..utils.auxiliar import sympy_expr, valor_exacto
 
 from ..utils import latex as latex
-from ..models.number import Number
+from ..utils import traza
+from ..utils import contexto
+from ..utils.contexto import NIVEL_RESULTADO, NIVEL_PASOS, NIVEL_COMPLETO, Presupuesto
+from ..utils.ceros import es_cero
+from ..models.number import Number, Escalar
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
 import sympy
 
-SILENT_MODE = False
+niveles_verbosidad: dict[str, int] = {
+    "resultado": NIVEL_RESULTADO,
+    "pasos": NIVEL_PASOS,
+    "completo": NIVEL_COMPLETO,
+}
 
 
-def funnel(*_latex: str) -> None:
-    if not SILENT_MODE:
-        for part in _latex:
-            latex.LATEX_STDOUT.writelatex(part)
+def configurar_traza(verbosidad: str = "completo", presupuesto_pasos: int | None = None, presupuesto_bytes: int | None = None) -> None:
+    # Se llama al empezar cada pedido, con las opciones de esa llamada
+    if verbosidad not in niveles_verbosidad:
+        raise Exception(
+            f"Verbosidad desconocida: {verbosidad}. Opciones: {', '.join(niveles_verbosidad)}")
+    ctx = contexto.actual()
+    ctx.verbosidad = niveles_verbosidad[verbosidad]
+    ctx.presupuesto = Presupuesto(presupuesto_pasos, presupuesto_bytes)
+
+
+def traza_activa(nivel: int = NIVEL_PASOS) -> bool:
+    # Si funnel escribiria algo de este nivel en este momento. Los bucles
+    # la consultan antes de armar los eventos, para no construir nada que
+    # funnel va a descartar
+    ctx = contexto.actual()
+    if ctx.silencioso or nivel > ctx.verbosidad:
+        return False
+    if nivel != NIVEL_RESULTADO and ctx.presupuesto.agotado:
+        # Quien pregunta se va a saltar lo que iba a escribir: queda en el resumen
+        ctx.presupuesto.omitir(())
+        return False
+    return True
+
+
+def nuevo_paso() -> None:
+    # Los pasos numerados son los que cuenta el presupuesto de pasos
+    ctx = contexto.actual()
+    if not ctx.silencioso and ctx.verbosidad >= NIVEL_PASOS:
+        ctx.presupuesto.contar_paso()
+
+
+def cerrar_resumen() -> None:
+    # Si el presupuesto corto la traza, deja constancia de lo que se omitio
+    ctx = contexto.actual()
+    resumen = ctx.presupuesto.resumen()
+    if resumen is not None:
+        ctx.salida.escribir(latex.text(resumen) + latex.newline())
+
+
+def funnel(*_latex: str | traza.Evento, nivel: int = NIVEL_PASOS) -> None:
+    # Los eventos de traza se guardan sin renderizar; el LaTeX se arma
+    # recien cuando alguien lee la salida
+    ctx = contexto.actual()
+    if ctx.silencioso or nivel > ctx.verbosidad:
+        return
+    if nivel == NIVEL_RESULTADO:
+        cerrar_resumen()
+    elif ctx.presupuesto.agotado:
+        ctx.presupuesto.omitir(_latex)
+        return
+    for part in _latex:
+        if isinstance(part, traza.Instantanea):
+            part.enlazar(ctx.instantaneas, ctx.resaltar_cambios)
+        ctx.presupuesto.cargar(part)
+        ctx.salida.escribir(part)
+
+
+def funnel_operacion(crear: Callable[[], traza.Evento]) -> None:
+    # Como funnel, pero el evento de la operacion de fila se arma solo si se
+    # va a escribir. Con el presupuesto agotado igual se cuenta para el resumen
+    ctx = contexto.actual()
+    if ctx.silencioso or NIVEL_PASOS > ctx.verbosidad:
+        return
+    if ctx.presupuesto.agotado:
+        ctx.presupuesto.omitir_operacion()
+        return
+    funnel(crear())
+
+
+def funnel_detalle(*_latex: str | traza.Evento) -> None:
+    # Cuentas elemento a elemento: solo con verbosidad "completo"
+    funnel(*_latex, nivel=NIVEL_COMPLETO)
+
+
+def funnel_resultado(*_latex: str | traza.Evento) -> None:
+    # La respuesta de la operacion: se escribe con cualquier verbosidad
+    # y aunque el presupuesto este agotado
+    funnel(*_latex, nivel=NIVEL_RESULTADO)
+
+
+@contextmanager
+def en_silencio() -> Iterator[None]:
+    # Calcula sin escribir nada en la traza del pedido en curso
+    ctx = contexto.actual()
+    anterior = ctx.silencioso
+    ctx.silencioso = True
+    try:
+        yield
+    finally:
+        ctx.silencioso = anterior
+
+
+def _verbosidad_en_proceso() -> int:
+    # Verbosidad con la que corre un proceso del pool; -1 = en silencio
+    return contexto.actual().verbosidad if traza_activa(NIVEL_PASOS) else -1
 
 # Latex helpers
 
@@ -24,6 +132,79 @@ def latex_fila(numero: int, coeficiente: sympy.Expr = sympy_expr(1), force_sign:
     else:
         return "f" + latex.subscript(str(numero))
 
+# Kernels dispersos: solo recorren las celdas no nulas de las filas
+# involucradas y cuentan el relleno (ceros que dejan de serlo)
+
+
+def _escalar_fila_dispersa(mat: MatrizDispersa, fila: int, escalar: Escalar) -> None:
+    valores = mat._filas_d[fila]
+    if escalar == 0:
+        valores.clear()
+        return
+    for c, v in valores.items():
+        valores[c] = v * escalar
+
+
+# fa -> escalar_a * fa + escalar_b * fb
+def _combinar_filas_dispersas(mat: MatrizDispersa, fila_a: int, escalar_a: Escalar, fila_b: int, escalar_b: Escalar) -> None:
+    if escalar_a != 1:
+        _escalar_fila_dispersa(mat, fila_a, escalar_a)
+    if escalar_b == 0:
+        return
+
+    destino = mat._filas_d[fila_a]
+    for c, v in list(mat._filas_d[fila_b].items()):
+        actual = destino.get(c)
+        if actual is None:
+            destino[c] = escalar_b * v
+            mat.relleno += 1
+            continue
+        nuevo = actual + escalar_b * v
+        if nuevo == 0:
+            del destino[c]
+        else:
+            destino[c] = nuevo
+
+
+# Kernels densos: trabajan sobre la fila entera de la lista plana de una
+# vez (slices y comprensiones) en vez de celda por celda. Los escalares
+# ya llegan normalizados, no se convierten dentro del ciclo
+
+
+def _escalar_fila_densa(mat: Matriz, fila: int, escalar: Escalar) -> None:
+    mat._poner_fila(fila, [v * escalar for v in mat._fila(fila)])
+
+
+# fa -> escalar_a * fa + escalar_b * fb (axpy sobre las filas)
+def _combinar_filas_densas(mat: Matriz, fila_a: int, escalar_a: Escalar, fila_b: int, escalar_b: Escalar) -> None:
+    a, b = mat._fila(fila_a), mat._fila(fila_b)
+    if escalar_b == 0:
+        if escalar_a != 1:
+            mat._poner_fila(fila_a, [x * escalar_a for x in a])
+        return
+    if escalar_a == 1:
+        mat._poner_fila(fila_a, [x + escalar_b * y for x, y in zip(a, b)])
+    else:
+        mat._poner_fila(fila_a, [escalar_a * x + escalar_b * y
+                                 for x, y in zip(a, b)])
+
+
+def _intercambiar_filas_densas(mat: Matriz, fila_a: int, fila_b: int) -> None:
+    # Se intercambian los dos tramos de la lista plana de una vez
+    n = mat.columnas
+    ia, ib = fila_a * n, fila_b * n
+    datos = mat._datos
+    datos[ia:ia + n], datos[ib:ib + n] = datos[ib:ib + n], datos[ia:ia + n]
+
+
+def _combinar_filas(mat: Matriz, fila_a: int, escalar_a: Escalar, fila_b: int, escalar_b: Escalar) -> None:
+    # Elige el kernel segun la representacion (indices desde 0)
+    if isinstance(mat, MatrizDispersa):
+        _combinar_filas_dispersas(mat, fila_a, escalar_a, fila_b, escalar_b)
+    else:
+        _combinar_filas_densas(mat, fila_a, escalar_a, fila_b, escalar_b)
+
+
 # Aqui en este archivo van todas las operaciones sobre matrices
 # Operaciones basicas en una fila
 
@@ -32,18 +213,15 @@ def latex_fila(numero: int, coeficiente: sympy.Expr = sympy_expr(1), force_sign:
 # f -> e*f
 
 
-def escalar_fila(mat: Matriz, fila: int, escalar: sympy.Expr) -> None:
-    funnel(
-        latex.indexedvar("f", fila),
-        latex.rarrow(),
-        latex.term(latex.indexedvar("f", fila), sympy_expr(escalar))
-    )
+def escalar_fila(mat: Matriz, fila: int, escalar: Number) -> None:
+    # Convertimos el escalar una sola vez, no en cada columna
+    escalar = mat._normalizar(escalar)
+    funnel_operacion(lambda: traza.OperacionFila(fila, escalar))
 
-    # Ciclamos por las columnas en la fila
-    for i in range(1, mat.columnas + 1):
-        nuevo_valor: sympy.Expr = mat.at(fila, i) * sympy_expr(escalar)
-        # En la posicion [fila, i] vamos a cambiar el valor por el mismo pero multiplicado por el escalar
-        mat.set(fila, i, nuevo_valor)
+    if isinstance(mat, MatrizDispersa):
+        _escalar_fila_dispersa(mat, fila - 1, escalar)
+    else:
+        _escalar_fila_densa(mat, fila - 1, escalar)
 
 # Sumar una fila B a una fila A
 # el resultado queda guardado en A
@@ -51,17 +229,9 @@ def escalar_fila(mat: Matriz, fila: int, escalar: sympy.Expr) -> None:
 
 
 def sumar_fila(mat: Matriz, fila_a: int, fila_b: int) -> None:
-    funnel(latex.indexedvar("f", fila_a),
-           latex.rarrow(),
-           latex.indexedvar("f", fila_a),
-           " + ",
-           latex.indexedvar("f", fila_b)
-           )
-    # Ciclamos de nuevo por las columnas
-    for i in range(1, mat.columnas + 1):
-        # En la fila A, ponemos el resultado de A + B
-        nuevo_valor: sympy.Expr = mat.at(fila_a, i) + mat.at(fila_b, i)
-        mat.set(fila_a, i, nuevo_valor)
+    funnel_operacion(lambda: traza.OperacionFila(fila_a, 1, fila_b, 1, literal=True))
+    _combinar_filas(mat, fila_a - 1, Fraction(1),
+                    fila_b - 1, mat._normalizar(1))
 
 # Sumar filas escaladas
 # fa -> c*fa + d*fb
@@ -74,35 +244,19 @@ def sumar_fila(mat: Matriz, fila_a: int, fila_b: int) -> None:
 # [0][-9][-3]
 
 
-def sumar_escalar_fila(mat: Matriz, escalar_a: sympy.Expr, fila_a: int, escalar_b: Fraction, fila_b: int) -> None:
-    funnel(
-        latex.indexedvar("f", fila_a),
-        latex.rarrow(),
-        latex.term(latex.indexedvar("f", fila_a), escalar_a),
-        latex.term(latex.indexedvar("f", fila_b), escalar_b, forcesign=True),
-    )
-    # Ciclamos por la fila A para cambiar los valores
-    for i in range(1, mat.columnas + 1):
-        # NUEVO VALor
-        nuevo_valor: sympy.Expr = escalar_a * \
-            mat.at(fila_a, i) + escalar_b * mat.at(fila_b, i)
-        mat.set(fila_a, i, nuevo_valor)
+def sumar_escalar_fila(mat: Matriz, escalar_a: Number, fila_a: int, escalar_b: Number, fila_b: int) -> None:
+    escalar_a = mat._normalizar(escalar_a)
+    escalar_b = mat._normalizar(escalar_b)
+    funnel_operacion(lambda: traza.OperacionFila(fila_a, escalar_a, fila_b, escalar_b))
+    _combinar_filas(mat, fila_a - 1, escalar_a, fila_b - 1, escalar_b)
 
 # La misma operacion pero en resta
 
 
 def restar_fila(mat: Matriz, fila_a: int, fila_b: int) -> None:
-    funnel(latex.indexedvar("f", fila_a),
-           latex.rarrow(),
-           latex.indexedvar("f", fila_a),
-           " - ",
-           latex.indexedvar("f", fila_b)
-           )
-    # Ciclamos de nuevo por las columnas
-    for i in range(1, mat.columnas + 1):
-        # En la fila A, ponemos el resultado de A - B
-        nuevo_valor: sympy.Expr = mat.at(fila_a, i) - mat.at(fila_b, i)
-        mat.set(fila_a, i, nuevo_valor)
+    funnel_operacion(lambda: traza.OperacionFila(fila_a, 1, fila_b, -1, literal=True))
+    _combinar_filas(mat, fila_a - 1, Fraction(1),
+                    fila_b - 1, mat._normalizar(-1))
 
 # Restar filas escaladas
 # fa -> c*fa - d*fb
@@ -119,45 +273,52 @@ def restar_fila(mat: Matriz, fila_a: int, fila_b: int) -> None:
 # [0][-9][-3]
 
 def restar_escalar_fila(mat: Matriz, escalar_a: Number, fila_a: int, escalar_b: Number, fila_b: int) -> None:
-    funnel(
-        latex.indexedvar("f", fila_a),
-        latex.rarrow(),
-        latex.term(latex.indexedvar("f", fila_a), escalar_a),
-        latex.term(latex.indexedvar("f", fila_b),
-                   escalar_b * -1, forcesign=True),
-    )
-    # Ciclamos por la fila A para cambiar los valores
-    for i in range(1, mat.columnas + 1):
-        # NUEVO VALor
-        nuevo_valor: sympy.Expr = sympy_expr(escalar_a) * \
-            mat.at(fila_a, i) - sympy_expr(escalar_b) * mat.at(fila_b, i)
-        mat.set(fila_a, i, nuevo_valor)
+    escalar_a = mat._normalizar(escalar_a)
+    escalar_b = mat._normalizar(escalar_b)
+    funnel_operacion(lambda: traza.OperacionFila(fila_a, escalar_a, fila_b, escalar_b * -1))
+    _combinar_filas(mat, fila_a - 1, escalar_a, fila_b - 1, -escalar_b)
+
+# Combinacion sin fracciones (paso de Bareiss)
+# fa -> (c*fa - d*fb) / divisor
+# La division es exacta: con enteros el resultado sigue siendo entero
+
+
+def combinar_fila_sin_fracciones(mat: Matriz, escalar_a: Number, fila_a: int, escalar_b: Number, fila_b: int, divisor: Number) -> None:
+    escalar_a = mat._normalizar(escalar_a)
+    escalar_b = mat._normalizar(escalar_b)
+    divisor = mat._normalizar(divisor)
+    funnel_operacion(lambda: traza.OperacionFila(fila_a, escalar_a, fila_b, escalar_b * -1, divisor))
+    _combinar_filas(mat, fila_a - 1, escalar_a, fila_b - 1, -escalar_b)
+    if divisor == 1:
+        return
+    if isinstance(mat, MatrizDispersa):
+        valores = mat._filas_d[fila_a - 1]
+        for c, v in valores.items():
+            valores[c] = _division_exacta(v, divisor)
+    else:
+        mat._poner_fila(fila_a - 1, [_division_exacta(v, divisor)
+                                     for v in mat._fila(fila_a - 1)])
 
 # Intercambio de filas
 # fa <-> fb
 
 
 def intercambiar_fila(mat: Matriz, fila_a: int, fila_b: int) -> None:
-    funnel(
-        latex.indexedvar("f", fila_a),
-        latex.barrow(),
-        latex.indexedvar("f", fila_b)
-    )
-    # Ciclamos de nuevo por las columnas
-    for i in range(1, mat.columnas + 1):
-        # Intercambiamos los valores
-        temp: sympy.Expr = mat.at(fila_a, i)
-        mat.set(fila_a, i, mat.at(fila_b, i))
-        mat.set(fila_b, i, temp)
+    funnel_operacion(lambda: traza.Intercambio(fila_a, fila_b))
+    if isinstance(mat, MatrizDispersa):
+        # Basta con intercambiar los diccionarios de cada fila
+        filas = mat._filas_d
+        filas[fila_a - 1], filas[fila_b - 1] = filas[fila_b - 1], filas[fila_a - 1]
+    else:
+        _intercambiar_filas_densas(mat, fila_a - 1, fila_b - 1)
 
 # Detectar si una fila es nula
 
 
 def fila_nula(mat: Matriz, fila: int) -> bool:
     # Ciclamos de nuevo por las columnas
-    for i in range(1, mat.columnas + 1):
-        # Intercambiamos los valores
-        if mat.at(fila, i) != 0:
+    for valor in mat.row(fila):
+        if not es_cero(valor):
             return False
     return True
 
@@ -167,9 +328,9 @@ def fila_nula(mat: Matriz, fila: int) -> bool:
 
 def columna_nula(mat: Matriz, columna: int) -> bool:
     # Ciclamos por todas las filas
-    for i in range(1, mat.filas + 1):
+    for valor in mat.column(columna):
         # Si encontramos un valor que no es 0, retornamos False
-        if mat.at(i, columna) != 0:
+        if not es_cero(valor):
             return False
     # Si no encontramos ningun valor que no es 0, retornamos True
     return True
@@ -188,22 +349,22 @@ def suma_matrices(matrizA: Matriz, matrizB: Matriz) -> Matriz:
     columnas = matrizA.columnas
 
     funnel(latex.text("Sumando matrices"), latex.newline(),
-           latex.matrix(matrizA), " + ", latex.matrix(matrizB), latex.newline())
-
-    nueva_matriz: Matriz = Matriz(filas, columnas)
+           traza.matriz(matrizA), " + ", traza.matriz(matrizB), latex.newline())
 
     # Cada cuadrado de la nueva matriz es el resultado de la suma de los numeros
     # en esa posicion en ambas matrices
-    for fila in range(1, filas + 1):
-        for columna in range(1, columnas + 1):
-            a = matrizA.at(fila, columna)
-            b = matrizB.at(fila, columna)
+    datos: list[Escalar] = []
+    detalle = traza_activa(NIVEL_COMPLETO)
+    for fila in range(filas):
+        for a, b in zip(matrizA._fila(fila), matrizB._fila(fila)):
             res = a + b
-            funnel(
-                latex.number_parse(
-                    a), " + ", latex.number_parse(b), " = ", latex.number_parse(res), latex.newline()
-            )
-            nueva_matriz.set(fila, columna, res)
+            if detalle:
+                funnel_detalle(
+                    traza.numero(
+                        a), " + ", traza.numero(b), " = ", traza.numero(res), latex.newline()
+                )
+            datos.append(res)
+    nueva_matriz = Matriz._desde_valores(filas, columnas, datos)
 
     return nueva_matriz
 
@@ -220,44 +381,101 @@ def resta_matrices(matrizA: Matriz, matrizB: Matriz) -> Matriz:
     columnas = matrizA.columnas
 
     funnel(latex.text("Restando matrices"), latex.newline(),
-           latex.matrix(matrizA), " - ", latex.matrix(matrizB), latex.newline())
-
-    nueva_matriz: Matriz = Matriz(filas, columnas)
+           traza.matriz(matrizA), " - ", traza.matriz(matrizB), latex.newline())
 
     # Cada cuadrado de la nueva matriz es el resultado de la suma de los numeros
     # en esa posicion en ambas matrices
-    for fila in range(1, filas + 1):
-        for columna in range(1, columnas + 1):
-            a = matrizA.at(fila, columna)
-            b = matrizB.at(fila, columna)
+    datos: list[Escalar] = []
+    detalle = traza_activa(NIVEL_COMPLETO)
+    for fila in range(filas):
+        for a, b in zip(matrizA._fila(fila), matrizB._fila(fila)):
             res = a - b
-            funnel(
-                latex.number_parse(
-                    a), " - ", latex.number_parse(b), " = ", latex.number_parse(res), latex.newline()
-            )
-            nueva_matriz.set(fila, columna, res)
+            if detalle:
+                funnel_detalle(
+                    traza.numero(
+                        a), " - ", traza.numero(b), " = ", traza.numero(res), latex.newline()
+                )
+            datos.append(res)
+    nueva_matriz = Matriz._desde_valores(filas, columnas, datos)
 
     return nueva_matriz
 
 
-def matriz_por_escalar(matriz: Matriz, escalar: sympy.Expr) -> Matriz:
-    funnel(latex.text("Escalando matriz por "), latex.number_parse(sympy_expr(escalar)), latex.newline(),
-           latex.matrix(matriz), latex.newline())
-
-    nueva_matriz: Matriz = Matriz(matriz.filas, matriz.columnas)
+def matriz_por_escalar(matriz: Matriz, escalar: Number) -> Matriz:
+    escalar = valor_exacto(escalar)
+    funnel(latex.text("Escalando matriz por "), traza.numero(escalar), latex.newline(),
+           traza.matriz(matriz), latex.newline())
 
-    for fila in range(1, matriz.filas + 1):
-        for columna in range(1, matriz.columnas + 1):
-            val = matriz.at(fila, columna)
-            res = val * sympy_expr(escalar)
-            funnel(latex.number_parse(val), latex.cdot(), latex.number_parse(
-                sympy_expr(escalar)), " = ", latex.number_parse(res), latex.newline())
-            nueva_matriz.set(fila, columna, res)
+    datos: list[Escalar] = []
+    detalle = traza_activa(NIVEL_COMPLETO)
+    for fila in range(matriz.filas):
+        for val in matriz._fila(fila):
+            res = val * escalar
+            if detalle:
+                funnel_detalle(traza.numero(val), latex.cdot(), traza.numero(
+                    escalar), " = ", traza.numero(res), latex.newline())
+            datos.append(res)
+    nueva_matriz = Matriz._desde_valores(matriz.filas, matriz.columnas, datos)
 
     return nueva_matriz
 
 
-def multiplicar_matrices(matrizA: Matriz, matrizB: Matriz) -> Matriz:
+def _filas_del_producto(filas_a: list[list[Escalar]], columnas_b: list[list[Escalar]], primera: int) -> list[Escalar]:
+    # Filas del producto a partir de la fila `primera` (1..m), con su traza.
+    # Sirve igual para todo el producto o para un bloque de filas
+    datos: list[Escalar] = []
+    pasos = traza_activa(NIVEL_PASOS)
+    detalle = traza_activa(NIVEL_COMPLETO)
+
+    # Paso 3: Recorrer todas las posiciones de la matriz resultado
+    for i, fila_a in enumerate(filas_a, start=primera):   # Recorre filas de A (1..m)
+        for j, columna_b in enumerate(columnas_b, start=1):   # Recorre columnas de B (1..p)
+            # Acumulador para el producto escalar fila_i(A) · columna_j(B)
+            suma: Escalar = Fraction(0)
+
+            # Paso 3.1: Calcular el producto escalar
+            # k recorre los índices compartidos (1..n)
+
+            # Entonces aca, por ejemplo, en la fila 1, columna 1
+            # vas a querer recorrer las posiciones:
+
+            # (1, 1) * (1, 1)
+            # (1, 2) * (2, 1)
+            # (1, 3) * (3, 1)
+            # y sumarlas todas
+            # Veanse este video https://www.youtube.com/watch?v=7E_VvhYvJgU
+            nuevo_paso()
+            if pasos:
+                funnel(latex.text(f"Elemento ({i},{j})"), latex.newline())
+            terms = []
+            for a, b in zip(fila_a, columna_b):
+                prod = a * b
+                terms.append(prod)
+                if detalle:
+                    funnel_detalle(traza.numero(a), latex.cdot(), traza.numero(
+                        b), " = ", traza.numero(prod), latex.newline())
+                suma += prod
+            # Mostrar suma total
+            if pasos:
+                funnel(traza.terminos(terms, " + "),
+                       " = ", traza.numero(suma), latex.newline())
+
+            # Paso 4: Asignar el valor calculado a la celda (i, j) del resultado
+            datos.append(suma)
+
+    return datos
+
+
+def _bloque_producto_en_proceso(tarea: tuple[list[list[Any]], list[list[Any]], int, int]) -> tuple[list[Any], str]:
+    filas_a, columnas_b, primera, verbosidad = tarea
+    datos, fragmento = _capturar_traza(
+        verbosidad, _filas_del_producto,
+        [paralelo.desempaquetar(f) for f in filas_a],
+        [paralelo.desempaquetar(c) for c in columnas_b], primera)
+    return paralelo.empaquetar(datos), fragmento
+
+
+def multiplicar_matrices(matrizA: Matriz, matrizB: Matriz, procesos: int = 1) -> Matriz:
     """
     Multiplica dos matrices y devuelve la matriz resultado.
 
@@ -315,58 +533,88 @@ def multiplicar_matrices(matrizA: Matriz, matrizB: Matriz) -> Matriz:
 
     # Paso 2: Crear matriz resultado con el tamaño correcto (m x p)
     funnel(latex.text("Multiplicando matrices"), latex.newline(),
-           latex.matrix(matrizA), latex.cdot(), latex.matrix(matrizB), latex.newline())
+           traza.matriz(matrizA), latex.cdot(), traza.matriz(matrizB), latex.newline())
+
+    # Leemos cada fila de A y cada columna de B una sola vez
+    filas_a = [matrizA._fila(i) for i in range(matrizA.filas)]
+    columnas_b = [matrizB._columna(j) for j in range(matrizB.columnas)]
+    datos: list[Escalar]
+
+    if procesos > 1 and matrizA.filas > 1:
+        # Cada proceso calcula un bloque de filas del resultado y devuelve su
+        # parte de la traza; los bloques se pegan en el orden de las filas
+        columnas = [paralelo.empaquetar(c) for c in columnas_b]
+        tareas = []
+        primera = 1
+        for bloque in paralelo.repartir(filas_a, procesos):
+            tareas.append(([paralelo.empaquetar(f) for f in bloque],
+                           columnas, primera, _verbosidad_en_proceso()))
+            primera += len(bloque)
+        datos = []
+        for valores, fragmento in paralelo.mapear(_bloque_producto_en_proceso, tareas, procesos):
+            funnel(fragmento)
+            datos.extend(paralelo.desempaquetar(valores))
+    else:
+        datos = _filas_del_producto(filas_a, columnas_b, 1)
 
-    nueva_matriz = Matriz(matrizA.filas, matrizB.columnas)
+    # Paso 5: Devolver la matriz resultante
+    return Matriz._desde_valores(matrizA.filas, matrizB.columnas, datos)
 
-    # Paso 3: Recorrer todas las posiciones de la matriz resultado
-    for i in range(1, matrizA.filas + 1):          # Recorre filas de A (1..m)
-        for j in range(1, matrizB.columnas + 1):   # Recorre columnas de B (1..p)
-            # Acumulador para el producto escalar fila_i(A) · columna_j(B)
-            suma = sympy_expr(0)
 
-            # Paso 3.1: Calcular el producto escalar
-            # k recorre los índices compartidos (1..n)
+def producto_sin_traza(matrizA: Matriz, matrizB: Matriz) -> Matriz:
+    # El mismo producto que multiplicar_matrices, sin armar ninguna traza.
+    # Para verificaciones y calculos internos donde no se muestran los pasos
+    if matrizA.columnas != matrizB.filas:
+        raise Exception(
+            f"No se puede multiplicar una matriz de {matrizA.filas}x{matrizA.columnas} "
+            f"con una matriz de {matrizB.filas}x{matrizB.columnas}"
+        )
+    columnas_b = [matrizB._columna(j) for j in range(matrizB.columnas)]
+    datos: list[Escalar] = []
+    for i in range(matrizA.filas):
+        fila_a = matrizA._fila(i)
+        for columna_b in columnas_b:
+            datos.append(sum((a * b for a, b in zip(fila_a, columna_b)), Fraction(0)))
+    return Matriz._desde_valores(matrizA.filas, matrizB.columnas, datos)
 
-            # Entonces aca, por ejemplo, en la fila 1, columna 1
-            # vas a querer recorrer las posiciones:
 
-            # (1, 1) * (1, 1)
-            # (1, 2) * (2, 1)
-            # (1, 3) * (3, 1)
-            # y sumarlas todas
-            # Veanse este video https://www.youtube.com/watch?v=7E_VvhYvJgU
-            funnel(latex.text(f"Elemento ({i},{j})"), latex.newline())
-            terms = []
-            for k in range(1, matrizA.columnas + 1):
-                prod = matrizA.at(i, k) * matrizB.at(k, j)
-                terms.append(prod)
-                funnel(latex.number_parse(matrizA.at(i, k)), latex.cdot(), latex.number_parse(
-                    matrizB.at(k, j)), " = ", latex.number_parse(prod), latex.newline())
-                suma += prod
-            # Mostrar suma total
-            funnel(" + ".join(latex.number_parse(t) for t in terms),
-                   " = ", latex.number_parse(suma), latex.newline())
+# Desde esta cantidad de productos escalares (m * n * p) la multiplicacion
+# se hace con `multiplicacion.producto` y la traza es solo un resumen; las
+# mas chicas siguen mostrando cada elemento
+MIN_PRODUCTO_RESUMIDO = 20 ** 3
 
-            # Paso 4: Asignar el valor calculado a la celda (i, j) del resultado
-            nueva_matriz.set(i, j, suma)
 
-    # Paso 5: Devolver la matriz resultante
-    return nueva_matriz
+def multiplicar_resumido(matrizA: Matriz, matrizB: Matriz,
+                         umbral: int = multiplicacion.UMBRAL_STRASSEN,
+                         procesos: int = 1) -> Matriz:
+    resultado, metodo = multiplicacion.producto(matrizA, matrizB, umbral, procesos)
+    funnel(latex.text(
+        f"Multiplicando matrices de {matrizA.filas}x{matrizA.columnas} y "
+        f"{matrizB.filas}x{matrizB.columnas} ({metodo})"), latex.newline(),
+        latex.text(f"Umbral de Strassen: {umbral}"), latex.newline())
+    return resultado
+
+
+def multiplicar(matrizA: Matriz, matrizB: Matriz, procesos: int = 1, detallado: bool = False) -> Matriz:
+    # Elige por tamano entre la multiplicacion con todos los pasos y la
+    # resumida. Con `detallado` se muestra cada elemento aunque sea grande
+    if (not detallado
+            and matrizA.filas * matrizA.columnas * matrizB.columnas >= MIN_PRODUCTO_RESUMIDO):
+        return multiplicar_resumido(matrizA, matrizB, procesos=procesos)
+    return multiplicar_matrices(matrizA, matrizB, procesos)
 
 
 def transponer_matriz(matriz: Matriz) -> Matriz:
     funnel(latex.text("Transponiendo matriz"), latex.newline(),
-           latex.matrix(matriz), latex.newline())
-    nueva_matriz = Matriz(matriz.columnas, matriz.filas)
-
-    for fila in range(1, matriz.filas + 1):
-        funnel(latex.text(
-            f"La fila {fila} pasa a columna {fila}"), latex.newline())
-        for columna in range(1, matriz.columnas + 1):
-            nueva_matriz.set(columna, fila, matriz.at(fila, columna))
+           traza.matriz(matriz), latex.newline())
+    if traza_activa(NIVEL_PASOS):
+        for fila in range(1, matriz.filas + 1):
+            funnel(latex.text(
+                f"La fila {fila} pasa a columna {fila}"), latex.newline())
 
-    return nueva_matriz
+    # Las columnas de la original son las filas de la nueva
+    return Matriz._desde_filas(
+        [matriz._columna(c) for c in range(matriz.columnas)], matriz.racional)
 
 
 def matriz_inversa(matriz: Matriz) -> Matriz:
@@ -374,64 +622,60 @@ def matriz_inversa(matriz: Matriz) -> Matriz:
         raise Exception(
             f"No se puede invertir una matriz no cuadrada")
 
-    nueva_matriz = Matriz(matriz.filas, matriz.columnas)
+    # La factorizacion queda en cache: si la misma matriz ya se uso para un
+    # determinante o un sistema, aqui no se vuelve a eliminar
+    plu = factorizar(matriz)
+    if not plu.invertible:
+        raise Exception(f"La matriz no es invertible.")
 
-    determinante = determinante_por_cofactores(matriz)
+    inversa = plu.inversa()
+    funnel(latex.text("Inversa por factorización PLU"), latex.newline(),
+           traza.matriz(matriz), latex.newline(),
+           latex.text("Resultado:"), latex.newline(),
+           traza.matriz(inversa), latex.newline())
+    return inversa
 
-    for fila in range(1, matriz.filas + 1):
-        for columna in range(1, matriz.columnas + 1):
-            valor: sympy.Expr
 
-            # Diagonal
-            if fila == columna:
-                funnel(latex.text(
-                    f"Invirtiendo diagonal {fila},{columna} con {matriz.filas - fila + 1},{matriz.columnas - columna + 1}"), latex.newline())
-                valor = matriz.at(
-                    matriz.filas - fila + 1, matriz.columnas - columna + 1)
-            else:
-                valor = matriz.at(fila, columna) * -1
+def inversa_por_dominio(matriz: Matriz) -> Matriz:
+    # La inversa se calcula en el DomainMatrix y solo el resultado vuelve a
+    # expresiones de sympy
+    inversa, nombre = dominio.inversa(matriz)
+    funnel(latex.text(f"Inversa con DomainMatrix sobre {nombre}"), latex.newline(),
+           traza.matriz(matriz), latex.newline(),
+           latex.text("Resultado:"), latex.newline(),
+           traza.matriz(inversa), latex.newline())
+    return inversa
 
-            valor /= determinante
-            nueva_matriz.set(fila, columna, valor)
 
-    return nueva_matriz
+# remover_columna, remover_fila, cofactor y slice_matriz devuelven una
+# MatrizView: no copian celdas, solo guardan que filas/columnas se ven.
+# Si el que llama necesita modificar el resultado, usa .materializar()
 
 
-def remover_columna(matriz: Matriz, columna: int) -> Matriz:
+def remover_columna(matriz: Matriz, columna: int) -> MatrizView:
     if columna < 1 or columna > matriz.columnas:
         raise Exception("La columna dada a remover es inválida")
 
-    nueva_matriz = Matriz(matriz.filas, matriz.columnas - 1)
-    for f in range(1, matriz.filas + 1):
-        col: int = 1
-        for c in range(1, matriz.columnas + 1):
-            if c == columna:
-                continue
-            nueva_matriz.set(f, col, matriz.at(f, c))
-            col += 1
-
-    return nueva_matriz
+    columnas = [c for c in range(matriz.columnas) if c != columna - 1]
+    return MatrizView(matriz, list(range(matriz.filas)), columnas)
 
 
-def remover_fila(matriz: Matriz, fila: int) -> Matriz:
+def remover_fila(matriz: Matriz, fila: int) -> MatrizView:
     if fila < 1 or fila > matriz.filas:
         raise Exception("La fila dada a remover es inválida")
 
-    nueva_matriz = Matriz(matriz.filas - 1, matriz.columnas)
+    filas = [f for f in range(matriz.filas) if f != fila - 1]
+    return MatrizView(matriz, filas, list(range(matriz.columnas)))
 
-    fil: int = 1
-    for f in range(1, matriz.filas + 1):
-        if f == fila:
-            continue
-        for c in range(1, matriz.columnas + 1):
-            nueva_matriz.set(fil, c, matriz.at(f, c))
-        fil += 1
-
-    return nueva_matriz
 
+def cofactor(matriz: Matriz, i: int, j: int) -> MatrizView:
+    if i < 1 or i > matriz.filas or j < 1 or j > matriz.columnas:
+        raise Exception("La posición del cofactor es inválida")
 
-def cofactor(matriz: Matriz, i: int, j: int) -> Matriz:
-    return remover_fila(remover_columna(matriz, j), i)
+    # Una sola vista en vez de dos anidadas
+    filas = [f for f in range(matriz.filas) if f != i - 1]
+    columnas = [c for c in range(matriz.columnas) if c != j - 1]
+    return MatrizView(matriz, filas, columnas)
 
 
 # def calcular_determinante(matriz: Matriz) -> sympy.Expr:
@@ -457,7 +701,7 @@ def cofactor(matriz: Matriz, i: int, j: int) -> Matriz:
 #         raise Exception(
 #             f"No se ha implementado la obtención del determinante en matrices {n}x{n}")
 
-def determinante_por_sarrus(matriz: Matriz) -> sympy.Expr:
+def determinante_por_sarrus(matriz: Matriz) -> Escalar:
     if matriz.filas != matriz.columnas:
         raise Exception(
             f"No se puede obtener el determinante de una matriz no cuadrada")
@@ -468,103 +712,417 @@ def determinante_por_sarrus(matriz: Matriz) -> sympy.Expr:
             f"El metodo de sarrus solo es válido para matrices 3x3")
 
     funnel(latex.text("Determinante por Sarrus"),
-           latex.newline(), latex.matrix(matriz), latex.newline())
+           latex.newline(), traza.matriz(matriz), latex.newline())
     # Para sarrus necesitamos agregar (n - 1) filas adicionales a una nueva matriz
-    detmatriz = Matriz(n + (n - 1), n)
-
-    for i in range(1, matriz.filas + 1):
-        for j in range(1, matriz.columnas + 1):
-            detmatriz.set(i, j, matriz.at(i, j))
+    filas = [matriz._fila(i) for i in range(n)]
 
     # Añadimos las copias de las filas adicionales
-    for i in range(1, matriz.filas):
-        for j in range(1, matriz.columnas + 1):
-            detmatriz.set(n + i, j, matriz.at(i, j))
+    detmatriz = Matriz._desde_filas(filas + filas[:n - 1], matriz.racional)
 
     funnel(latex.text("Matriz expandida para Sarrus"),
-           latex.newline(), latex.matrix(detmatriz), latex.newline())
+           latex.newline(), traza.matriz(detmatriz), latex.newline())
+    pasos = traza_activa(NIVEL_PASOS)
 
     # Ahora calculamos las diagonales positivas
-    suma_diagonales_positivas = sympy_expr(0)
+    suma_diagonales_positivas: Escalar = Fraction(0)
 
     for i in range(0, n):
         diagonal = []
-        valor_diagonal = sympy_expr(1)
+        valor_diagonal: Escalar = Fraction(1)
         for j in range(1, n + 1):
-            diagonal.append(detmatriz.at(j + i, j))
-            valor_diagonal *= detmatriz.at(j + i, j)
-        funnel(latex.text(f"Diagonal positiva #{i+1}: "), " ",
-               " ".join(latex.number_parse(x) for x in diagonal),
-               " = ", latex.number_parse(valor_diagonal), latex.newline())
+            diagonal.append(detmatriz._get(j + i - 1, j - 1))
+            valor_diagonal *= detmatriz._get(j + i - 1, j - 1)
+        if pasos:
+            funnel(latex.text(f"Diagonal positiva #{i+1}: "), " ",
+                   traza.terminos(diagonal, " "),
+                   " = ", traza.numero(valor_diagonal), latex.newline())
         suma_diagonales_positivas += valor_diagonal
 
     # Ahora la de las diagonales negativas
-    suma_diagonales_negativas = sympy_expr(0)
+    suma_diagonales_negativas: Escalar = Fraction(0)
 
     for i in range(0, n):
         diagonal = []
-        valor_diagonal = sympy_expr(1)
+        valor_diagonal: Escalar = Fraction(1)
         for j in range(1, n + 1):
-            diagonal.append(detmatriz.at(j + i, n - j + 1))
-            valor_diagonal *= detmatriz.at(j + i, n - j + 1)
-        funnel(latex.text(f"Diagonal negativa #{i+1}: "), " ",
-               " ".join(latex.number_parse(x) for x in diagonal),
-               " = ", latex.number_parse(valor_diagonal), latex.newline())
+            diagonal.append(detmatriz._get(j + i - 1, n - j))
+            valor_diagonal *= detmatriz._get(j + i - 1, n - j)
+        if pasos:
+            funnel(latex.text(f"Diagonal negativa #{i+1}: "), " ",
+                   traza.terminos(diagonal, " "),
+                   " = ", traza.numero(valor_diagonal), latex.newline())
         suma_diagonales_negativas += valor_diagonal
 
     return suma_diagonales_positivas - suma_diagonales_negativas
 
 
-def determinante_por_cofactores(matriz: Matriz, iteration: int = 0) -> sympy.Expr:
+# Menor identificado por sus indices de fila y columna en la matriz padre
+type ClaveMenor = tuple[tuple[int, ...], tuple[int, ...]]
+
+# Desde este tamano vale la pena repartir los cofactores entre procesos
+MIN_COFACTORES_PARALELO = 5
+
+
+def _clave_menor(matriz: Matriz) -> ClaveMenor:
+    # Todas las submatrices de la expansion son vistas del mismo padre, asi
+    # que sus indices de fila y columna en el padre identifican al menor
+    if isinstance(matriz, MatrizView):
+        return tuple(matriz._idx_filas), tuple(matriz._idx_columnas)
+    return tuple(range(matriz.filas)), tuple(range(matriz.columnas))
+
+
+def _linea_de_expansion(matriz: Matriz) -> tuple[bool, int]:
+    """
+    Elige la fila o columna con mas ceros (indice desde 0). Devuelve
+    (es_fila, indice). En empate gana la fila 1, que es la de siempre.
+    """
+    mejor = (True, 0)
+    mas_ceros = -1
+    for i in range(matriz.filas):
+        ceros = sum(1 for v in matriz._fila(i) if v == 0)
+        if ceros > mas_ceros:
+            mejor, mas_ceros = (True, i), ceros
+    for j in range(matriz.columnas):
+        ceros = sum(1 for v in matriz._columna(j) if v == 0)
+        if ceros > mas_ceros:
+            mejor, mas_ceros = (False, j), ceros
+    return mejor
+
+
+def _terminos_expansion(matriz: Matriz) -> tuple[bool, int, list[tuple[int, int, Escalar, MatrizView]]]:
+    # Linea elegida y, por cada elemento no nulo de ella, su posicion
+    # (desde 1), su valor y el menor que queda al quitar su fila y columna
+    es_fila, linea = _linea_de_expansion(matriz)
+    terminos: list[tuple[int, int, Escalar, MatrizView]] = []
+    for k in range(1, matriz.filas + 1):
+        f, c = (linea + 1, k) if es_fila else (k, linea + 1)
+        valor = matriz.at(f, c)
+
+        # si el elemento es 0, no aporta al determinante (evitamos trabajo extra)
+        if valor == 0:
+            continue
+
+        # construimos el menor (removiendo la fila f y la columna c)
+        terminos.append((f, c, valor, remover_fila(remover_columna(matriz, c), f)))
+    return es_fila, linea, terminos
+
+
+def _registrar_menores(matriz: Matriz, vistos: set[ClaveMenor]) -> None:
+    # Recorre la expansion igual que determinante_por_cofactores pero sin
+    # calcular nada: solo anota que menores quedarian en el memo
+    if matriz.filas == 1:
+        return
+    for _, _, _, mat in _terminos_expansion(matriz)[2]:
+        clave = _clave_menor(mat)
+        if mat.filas > 1 and clave in vistos:
+            continue
+        _registrar_menores(mat, vistos)
+        if mat.filas > 1:
+            vistos.add(clave)
+
+
+class _MemoCompartido(dict[ClaveMenor, Escalar]):
+    """
+    Memo de un proceso del pool. Conoce los menores que, en la version de un
+    solo proceso, ya habria calculado una rama anterior: para esos imprime
+    "det ya calculado" igual que la version secuencial, aunque aqui tenga
+    que calcular el valor en silencio porque lo tiene otro proceso.
+    """
+
+    def __init__(self, base: Matriz, vistos: frozenset[ClaveMenor]):
+        super().__init__()
+        self._base = base
+        self._vistos = vistos
+
+    def __contains__(self, clave: object) -> bool:
+        return dict.__contains__(self, clave) or clave in self._vistos
+
+    def __missing__(self, clave: ClaveMenor) -> Escalar:
+        filas, columnas = clave
+        with en_silencio():
+            det = determinante_por_cofactores(
+                MatrizView(self._base, list(filas), list(columnas)), memo=self)
+        self[clave] = det
+        return det
+
+
+def _capturar_traza(verbosidad: int, calculo: Callable[..., Any], *args: Any) -> tuple[Any, str]:
+    # Corre dentro de un proceso del pool: la traza se escribe en el buffer
+    # propio del proceso y se devuelve junto al valor para pegarla en orden.
+    # verbosidad = -1 calcula en silencio
+    with contexto.nuevo(silencioso=verbosidad < 0,
+                        verbosidad=max(verbosidad, NIVEL_RESULTADO)) as ctx:
+        valor = calculo(*args)
+        return valor, ctx.salida.stdout
+
+
+def _cofactor_en_proceso(tarea: tuple[Matriz, list[int], list[int], int, int, frozenset[ClaveMenor]]) -> tuple[Escalar, str]:
+    base, filas, columnas, iteration, verbosidad, vistos = tarea
+    menor = MatrizView(base, filas, columnas)
+    return _capturar_traza(verbosidad, determinante_por_cofactores, menor,
+                           iteration, _MemoCompartido(base, vistos))
+
+
+def _fila_adjunta_en_proceso(tarea: tuple[Matriz, int, int, frozenset[ClaveMenor]]) -> tuple[list[Escalar], str]:
+    base, i, verbosidad, vistos = tarea
+    return _capturar_traza(verbosidad, _fila_adjunta, base, i, _MemoCompartido(base, vistos))
+
+
+def determinante_por_cofactores(matriz: Matriz, iteration: int = 0,
+                                memo: dict[ClaveMenor, Escalar] | None = None,
+                                procesos: int = 1) -> Escalar:
     if matriz.filas != matriz.columnas:
         raise Exception(
             f"No se puede obtener el determinante de una matriz no cuadrada")
 
-    def printmat() -> str:
-        return latex.matrix(matriz)
+    # Determinantes de menores ya calculados, por sus indices en el padre.
+    # Quien llama varias veces sobre la misma matriz (la adjunta) pasa el
+    # mismo diccionario para compartirlos
+    if memo is None:
+        memo = {}
 
     n = matriz.filas
-    funnel(latex.text(("|" * iteration) + " Calculando determinante (cofactores) de:"),
-           latex.newline(), printmat(), latex.newline())
+    en_paralelo = procesos > 1 and n >= MIN_COFACTORES_PARALELO
+    if en_paralelo and isinstance(matriz, MatrizView):
+        # Los procesos reciben una matriz normal y arman sus menores sobre ella
+        matriz = matriz.materializar()
+
+    # El primer nivel de la expansion son los pasos; los menores de adentro
+    # son el detalle
+    escribir = funnel if iteration == 0 else funnel_detalle
+    # Sin traza de este nivel no se arma nada: los menores de adentro se
+    # recorren miles de veces
+    activa = traza_activa(NIVEL_PASOS if iteration == 0 else NIVEL_COMPLETO)
+
+    if activa:
+        escribir(latex.text(("|" * iteration) + " Calculando determinante (cofactores) de:"),
+               latex.newline(), traza.matriz(matriz), latex.newline())
 
     # El determinante de una matriz de 1 x 1 es el valor de su unico elemento
     if n == 1:
-        funnel(latex.text(("|" * iteration) + " Matriz 1x1: det = "),
-               latex.number_parse(matriz.at(1, 1)), latex.newline())
+        if activa:
+            escribir(latex.text(("|" * iteration) + " Matriz 1x1: det = "),
+                   traza.numero(matriz.at(1, 1)), latex.newline())
         return matriz.at(1, 1)
 
-    suma: sympy.Expr = sympy_expr(0)
-    componentes: list[sympy.Expr] = []
-
-    for i in range(1, matriz.columnas + 1):
-        valor = matriz.at(1, i)
-        # signo del cofactor: (-1)^(1+i)
-        inv = sympy_expr((-1) ** (1 + i))
-
-        # si el elemento es 0, no aporta al determinante (evitamos trabajo extra)
-        if valor == 0:
-            continue
-
-        # construimos el menor (removiendo columna i y la fila 1)
-        mat = remover_fila(remover_columna(matriz, i), 1)
-        funnel(latex.text(("|" * iteration) +
-               f" Cofactor (1,{i})"), latex.newline(), latex.matrix(mat), latex.newline())
-        det = determinante_por_cofactores(mat, iteration=iteration + 1)
-        funnel(latex.text(("|" * iteration) + " Termino:"), " ",
-               latex.number_parse(valor), latex.cdot(), latex.text(
-                   f"(-1)^{{{1 + i}}}"), latex.cdot(), latex.number_parse(det),
-               " = ", latex.number_parse(valor * inv * det), latex.newline())
+    # Expandimos por la linea con mas ceros: cada cero es un menor que no se calcula
+    es_fila, linea, terminos = _terminos_expansion(matriz)
+    if activa and not (es_fila and linea == 0):
+        escribir(latex.text(("|" * iteration) +
+               f" Expandiendo por la {'fila' if es_fila else 'columna'} {linea + 1}"), latex.newline())
+
+    suma: Escalar = Fraction(0)
+    componentes: list[Escalar] = []
+
+    # Los menores del primer nivel son independientes: con varios procesos
+    # se calculan a la vez y cada uno devuelve su valor y su parte de la
+    # traza. A cada rama se le dice que menores habrian calculado las ramas
+    # anteriores, asi la traza pegada es la misma que la secuencial
+    en_paralelo = en_paralelo and len(terminos) > 1
+    if en_paralelo:
+        vistos: set[ClaveMenor] = set(memo)
+        tareas = []
+        for _, _, _, mat in terminos:
+            tareas.append((matriz, mat._idx_filas, mat._idx_columnas,
+                           iteration + 1, _verbosidad_en_proceso(), frozenset(vistos)))
+            _registrar_menores(mat, vistos)
+            vistos.add(_clave_menor(mat))
+        calculados = paralelo.mapear(_cofactor_en_proceso, tareas, procesos)
+
+    for idx, (f, c, valor, mat) in enumerate(terminos):
+        # signo del cofactor: (-1)^(f+c)
+        inv = (-1) ** (f + c)
+
+        if activa:
+            escribir(latex.text(("|" * iteration) +
+                   f" Cofactor ({f},{c})"), latex.newline(), traza.matriz(mat), latex.newline())
+
+        # Los menores 1x1 no se guardan: leerlos cuesta lo mismo que recordarlos
+        clave = _clave_menor(mat)
+        if en_paralelo:
+            det, fragmento = calculados[idx]
+            escribir(fragmento)
+            memo[clave] = det
+        elif mat.filas > 1 and clave in memo:
+            det = memo[clave]
+            if activa:
+                escribir(latex.text(("|" * iteration) + " det ya calculado = "),
+                       traza.numero(det), latex.newline())
+        else:
+            det = determinante_por_cofactores(
+                mat, iteration=iteration + 1, memo=memo)
+            if mat.filas > 1:
+                memo[clave] = det
+
+        if activa:
+            escribir(latex.text(("|" * iteration) + " Termino:"), " ",
+                   traza.numero(valor), latex.cdot(), latex.text(
+                       f"(-1)^{{{f + c}}}"), latex.cdot(), traza.numero(det),
+                   " = ", traza.numero(valor * inv * det), latex.newline())
         suma += valor * inv * det
         componentes.append(valor * inv * det)
 
-    funnel(latex.text(("|" * iteration) + " Resultado det:"),
-           " ",
-           " + ".join(latex.number_parse(x) for x in componentes),
-           " = ", latex.number_parse(suma), latex.newline())
+    if activa:
+        escribir(latex.text(("|" * iteration) + " Resultado det:"),
+               " ",
+               traza.terminos(componentes, " + "),
+               " = ", traza.numero(suma), latex.newline())
     return suma
 
 
-def matriz_adjunta(matriz: Matriz) -> Matriz:
+def _division_exacta(numerador: Escalar, divisor: Escalar) -> Escalar:
+    # En Bareiss la division siempre es exacta. Con Fraction no hay nada que
+    # hacer, con expresiones simbolicas hay que cancelar el factor comun o
+    # el cociente se queda sin simplificar y crece en cada paso
+    cociente = numerador / divisor
+    if isinstance(cociente, sympy.Expr):
+        return sympy.cancel(cociente)
+    return cociente
+
+
+def determinante_por_bareiss(matriz: Matriz) -> Escalar:
+    """
+    Determinante por eliminacion de Bareiss (sin fracciones), O(n^3).
+
+    En el paso k cada elemento se actualiza como
+        a[i][j] = (a[i][j] * a[k][k] - a[i][k] * a[k][j]) / pivote_anterior
+    y esa division siempre es exacta, asi que con entradas enteras todos los
+    valores intermedios siguen siendo enteros. Al terminar, el ultimo
+    elemento de la diagonal es el determinante (con el signo corregido por
+    los intercambios de filas).
+
+    Sirve para entradas racionales, simbolicas o decimales. La traza solo
+    muestra una linea por paso, no cada menor como en cofactores.
+    """
+    if matriz.filas != matriz.columnas:
+        raise Exception(
+            f"No se puede obtener el determinante de una matriz no cuadrada")
+
+    n = matriz.filas
+    funnel(latex.text("Determinante por Bareiss (eliminación sin fracciones)"),
+           latex.newline(), traza.matriz(matriz), latex.newline())
+
+    a: list[list[Escalar]] = [matriz._fila(i) for i in range(n)]
+    signo = 1
+    anterior: Escalar = Fraction(1)
+
+    for k in range(n - 1):
+        nuevo_paso()
+        if es_cero(a[k][k]):
+            # Buscamos una fila de abajo con pivote no nulo
+            encontrada = next(
+                (i for i in range(k + 1, n) if not es_cero(a[i][k])), None)
+            if encontrada is None:
+                funnel(latex.text(
+                    f"Paso {k + 1}: la columna {k + 1} no tiene pivote, det = 0"), latex.newline())
+                return Fraction(0)
+            a[k], a[encontrada] = a[encontrada], a[k]
+            signo = -signo
+            funnel(latex.text(f"Paso {k + 1}: "), latex.indexedvar("f", k + 1),
+                   latex.barrow(), latex.indexedvar("f", encontrada + 1),
+                   latex.text(" (cambia el signo)"), latex.newline())
+
+        pivote = a[k][k]
+        fila_pivote = a[k]
+        for i in range(k + 1, n):
+            fila = a[i]
+            factor = fila[k]
+            for j in range(k + 1, n):
+                fila[j] = _division_exacta(
+                    fila[j] * pivote - factor * fila_pivote[j], anterior)
+            fila[k] = Fraction(0) if matriz.racional else sympy_expr(0)
+
+        funnel(latex.text(f"Paso {k + 1}: pivote = "), traza.numero(pivote),
+               latex.text(", divisor = "), traza.numero(anterior), latex.newline())
+        anterior = pivote
+
+    det = a[n - 1][n - 1] if signo == 1 else -a[n - 1][n - 1]
+
+    funnel(latex.text("Matriz triangular resultante:"), latex.newline(),
+           traza.matriz(Matriz._desde_filas(a, matriz.racional)), latex.newline(),
+           latex.text("Resultado det: "), traza.numero(det), latex.newline())
+    return det
+
+
+def determinante_por_modular(matriz: Matriz, procesos: int = 1) -> Escalar:
+    # Solo para matrices racionales: se elimina modulo varios primos y el
+    # resultado exacto se arma con el teorema chino del resto
+    funnel(latex.text("Determinante modular (residuos + teorema chino del resto)"), latex.newline(),
+           traza.matriz(matriz), latex.newline())
+    det, usados = modular.determinante_modular(matriz, procesos)
+    funnel(latex.text(f"Primos usados: {usados} (producto mayor que el doble de la cota de Hadamard)"), latex.newline(),
+           latex.text("Resultado det: "), traza.numero(det), latex.newline())
+    return det
+
+
+def determinante_por_dominio(matriz: Matriz) -> Escalar:
+    det, nombre = dominio.determinante(matriz)
+    funnel(latex.text(f"Determinante con DomainMatrix sobre {nombre}"), latex.newline(),
+           traza.matriz(matriz), latex.newline(),
+           latex.text("Resultado det: "), traza.numero(det), latex.newline())
+    return det
+
+
+# Metodos disponibles para `determinante`. Cofactores queda como modo de
+# ensenanza (muestra toda la expansion), Bareiss es el de uso general.
+# Cada uno recibe la matriz y los procesos; solo cofactores y modular los usan
+metodos_determinante: dict[str, Callable[[Matriz, int], Escalar]] = {
+    "bareiss": lambda matriz, procesos: determinante_por_bareiss(matriz),
+    "cofactores": lambda matriz, procesos: determinante_por_cofactores(matriz, procesos=procesos),
+    "sarrus": lambda matriz, procesos: determinante_por_sarrus(matriz),
+    "plu": lambda matriz, procesos: factorizar(matriz).determinante(),
+    "modular": determinante_por_modular,
+    "dominio": lambda matriz, procesos: determinante_por_dominio(matriz),
+}
+
+
+def determinante(matriz: Matriz, metodo: str = "bareiss", procesos: int = 1) -> Escalar:
+    calcular = metodos_determinante.get(metodo)
+    if calcular is None:
+        raise Exception(
+            f"Método de determinante desconocido: {metodo}. Opciones: {', '.join(metodos_determinante)}")
+    return calcular(matriz, procesos)
+
+
+def _rango_modular(matriz: Matriz, procesos: int) -> int:
+    rango, usados = modular.rango_modular(matriz, procesos)
+    funnel(latex.text(f"Rango modular: {usados} primos usados"), latex.newline())
+    return rango
+
+
+# Metodos disponibles para `rango`. El modular solo acepta matrices racionales
+metodos_rango: dict[str, Callable[[Matriz, int], int]] = {
+    "plu": lambda matriz, procesos: factorizar(matriz).rango,
+    "modular": _rango_modular,
+    "dominio": lambda matriz, procesos: dominio.rango(matriz),
+}
+
+
+def rango(matriz: Matriz, metodo: str = "plu", procesos: int = 1) -> int:
+    calcular = metodos_rango.get(metodo)
+    if calcular is None:
+        raise Exception(
+            f"Método de rango desconocido: {metodo}. Opciones: {', '.join(metodos_rango)}")
+    return calcular(matriz, procesos)
+
+
+def _fila_adjunta(matriz: Matriz, i: int, memo: dict[ClaveMenor, Escalar]) -> list[Escalar]:
+    valores: list[Escalar] = []
+    detalle = traza_activa(NIVEL_COMPLETO)
+    for j in range(1, matriz.columnas + 1):
+        inv = (-1) ** (i + j)
+        co = cofactor(matriz, i, j)
+        if detalle:
+            funnel_detalle(latex.text(f"Cofactor ({i},{j})"), latex.newline(
+            ), traza.matriz(co), latex.newline())
+        det = determinante_por_cofactores(co, memo=memo)
+        valores.append(det * inv)
+        funnel(latex.text(f"C{i}{j} = det(cof) * (-1)^{{{i + j}}} = "),
+               traza.numero(det * inv), latex.newline())
+    return valores
+
+
+def matriz_adjunta(matriz: Matriz, procesos: int = 1) -> Matriz:
     if matriz.filas != matriz.columnas:
         raise Exception(
             f"No se puede obtener la adjunta de una matriz no cuadrada")
@@ -573,44 +1131,56 @@ def matriz_adjunta(matriz: Matriz) -> Matriz:
     mat = Matriz(n, n)
 
     funnel(latex.text("Calculando matriz adjunta de:"),
-           latex.newline(), latex.matrix(matriz), latex.newline())
-
-    for i in range(1, n + 1):
-        for j in range(1, n + 1):
-            inv = (-1) ** (i + j)
-            co = cofactor(matriz, i, j)
-            funnel(latex.text(f"Cofactor ({i},{j})"), latex.newline(
-            ), latex.matrix(co), latex.newline())
-            det = determinante_por_cofactores(co)
-            mat.set(i, j, det * inv)
-            funnel(latex.text(f"C{i}{j} = det(cof) * (-1)^{{{i + j}}} = "),
-                   latex.number_parse(det * inv), latex.newline())
+           latex.newline(), traza.matriz(matriz), latex.newline())
+
+    if procesos > 1 and n >= MIN_COFACTORES_PARALELO:
+        # Una tarea por fila de la adjunta. Igual que en
+        # determinante_por_cofactores, cada fila sabe que menores ya habrian
+        # calculado las filas anteriores para que la traza no cambie
+        base = matriz.materializar() if isinstance(matriz, MatrizView) else matriz
+        vistos: set[ClaveMenor] = set()
+        tareas = []
+        for i in range(1, n + 1):
+            tareas.append((base, i, _verbosidad_en_proceso(), frozenset(vistos)))
+            for j in range(1, n + 1):
+                _registrar_menores(cofactor(base, i, j), vistos)
+        filas = paralelo.mapear(_fila_adjunta_en_proceso, tareas, procesos)
+        for i, (valores, fragmento) in enumerate(filas, start=1):
+            funnel(fragmento)
+            for j, valor in enumerate(valores, start=1):
+                mat.set(i, j, valor)
+    else:
+        # Los n^2 cofactores comparten casi todos sus menores
+        memo: dict[ClaveMenor, Escalar] = {}
+        for i in range(1, n + 1):
+            for j, valor in enumerate(_fila_adjunta(matriz, i, memo), start=1):
+                mat.set(i, j, valor)
 
     funnel(latex.text("Matriz adjunta obtenida:"),
-           latex.newline(), latex.matrix(mat), latex.newline())
+           latex.newline(), traza.matriz(mat), latex.newline())
     return mat
 
 
-def inversion_por_adjunta(matriz: Matriz) -> Matriz:
+def inversion_por_adjunta(matriz: Matriz, procesos: int = 1) -> Matriz:
     if matriz.filas != matriz.columnas:
         raise Exception(
             f"No se puede invertir una matriz no cuadrada")
 
     funnel(latex.text("Inversa por adjunta"), latex.newline(),
-           latex.matrix(matriz), latex.newline())
-    det = determinante_por_cofactores(matriz)
+           traza.matriz(matriz), latex.newline())
+    det = determinante_por_bareiss(matriz)
 
     if det == 0:
         raise Exception(f"La matriz no es invertible.")
 
     # Calculamos la matriz adjunta
-    adj = matriz_adjunta(matriz)
+    adj = matriz_adjunta(matriz, procesos)
 
     funnel(latex.text("Transponiendo adjunta"), latex.newline())
     # La trasponemos
     trasp = transponer_matriz(adj)
-    funnel(latex.text("Matriz traspuesta:"), latex.newline(), latex.matrix(trasp), latex.newline(),
-           latex.text("Multiplicando por 1/det"), " = ", latex.number_parse(sympy_expr(1) / det), latex.newline())
+    funnel(latex.text("Matriz traspuesta:"), latex.newline(), traza.matriz(trasp), latex.newline(),
+           latex.text("Multiplicando por 1/det"), " = ", traza.numero(sympy_expr(1) / det), latex.newline())
 
     return matriz_por_escalar(trasp, 1/det)
 
@@ -618,26 +1188,45 @@ def inversion_por_adjunta(matriz: Matriz) -> Matriz:
 def hacer_matriz_identidad(tamaño: int) -> Matriz:
     nueva_matriz = Matriz(tamaño, tamaño)
 
-    for fila in range(1, tamaño + 1):
-        for columna in range(1, tamaño + 1):
-            if fila == columna:
-                nueva_matriz.set(fila, columna, sympy_expr(1))
-            else:
-                nueva_matriz.set(fila, columna, sympy_expr(0))
+    # La matriz ya nace en 0, solo falta la diagonal
+    for i in range(tamaño):
+        nueva_matriz._put(i, i, Fraction(1))
 
     return nueva_matriz
 
 
-def slice_matriz(mat: Matriz, rango_filas: tuple[int, int], rango_columnas: tuple[int, int]) -> Matriz:
-    nueva_matriz = Matriz(
-        rango_filas[1] - rango_filas[0] + 1, rango_columnas[1] - rango_columnas[0] + 1)
+def slice_matriz(mat: Matriz, rango_filas: tuple[int, int], rango_columnas: tuple[int, int]) -> MatrizView:
+    mat._boundcheck_(rango_filas[0], rango_columnas[0])
+    mat._boundcheck_(rango_filas[1], rango_columnas[1])
 
-    for fila in range(rango_filas[0], rango_filas[1] + 1):
-        for columna in range(rango_columnas[0], rango_columnas[1] + 1):
-            nueva_matriz.set(
-                fila - rango_filas[0] + 1, columna - rango_columnas[0] + 1, mat.at(fila, columna))
+    return MatrizView(mat,
+                      list(range(rango_filas[0] - 1, rango_filas[1])),
+                      list(range(rango_columnas[0] - 1, rango_columnas[1])))
 
-    return nueva_matriz
+
+def aumentar_matrices(izquierda: Matriz, derecha: Matriz) -> Matriz:
+    """
+    Arma la matriz aumentada [izquierda | derecha] pegando filas completas.
+    El resultado es una Matriz nueva (se va a modificar al eliminar), pero se
+    construye fila por fila en vez de celda por celda.
+    """
+    if izquierda.filas != derecha.filas:
+        raise Exception(
+            f"No se puede aumentar una matriz de {izquierda.filas} filas con una de {derecha.filas} filas")
+
+    filas = [izquierda._fila(i) + derecha._fila(i)
+             for i in range(izquierda.filas)]
+
+    if izquierda.racional == derecha.racional:
+        aumentada = Matriz._desde_filas(filas, izquierda.racional)
+    else:
+        aumentada = Matriz._desde_valores(
+            izquierda.filas, izquierda.columnas + derecha.columnas, [v for f in filas for v in f])
+
+    # Si la entrada ya venia dispersa, la aumentada tambien
+    if isinstance(izquierda, MatrizDispersa) or isinstance(derecha, MatrizDispersa):
+        return MatrizDispersa.desde(aumentada)
+    return aumentada
 
 # OPERACIONES DE VECTORES
 
@@ -648,15 +1237,17 @@ def suma_vectores(vectorA: Vector, vectorB: Vector) -> Vector:
         raise Exception(
             f"No se puede sumar un vector de dimension {vectorA.dimension} con un vector de dimension {vectorB.dimension}")
 
-    funnel(latex.text("Sumando vectores"), latex.newline(), latex.vector(
-        vectorA), " + ", latex.vector(vectorB), latex.newline())
+    funnel(latex.text("Sumando vectores"), latex.newline(), traza.vector(
+        vectorA), " + ", traza.vector(vectorB), latex.newline())
     componentes = []
+    detalle = traza_activa(NIVEL_COMPLETO)
     for i in range(1, vectorA.dimension + 1):
         a = vectorA.at(i)
         b = vectorB.at(i)
         r = a + b
-        funnel(latex.number_parse(a), " + ", latex.number_parse(b),
-               " = ", latex.number_parse(r), latex.newline())
+        if detalle:
+            funnel_detalle(traza.numero(a), " + ", traza.numero(b),
+                   " = ", traza.numero(r), latex.newline())
         componentes.append(r)
 
     return Vector(componentes)
@@ -668,36 +1259,77 @@ def resta_vectores(vectorA: Vector, vectorB: Vector) -> Vector:
         raise Exception(
             f"No se puede sumar un vector de dimension {vectorA.dimension} con un vector de dimension {vectorB.dimension}")
 
-    funnel(latex.text("Restando vectores"), latex.newline(), latex.vector(
-        vectorA), " - ", latex.vector(vectorB), latex.newline())
+    funnel(latex.text("Restando vectores"), latex.newline(), traza.vector(
+        vectorA), " - ", traza.vector(vectorB), latex.newline())
     componentes = []
+    detalle = traza_activa(NIVEL_COMPLETO)
     for i in range(1, vectorA.dimension + 1):
         a = vectorA.at(i)
         b = vectorB.at(i)
         r = a - b
-        funnel(latex.number_parse(a), " - ", latex.number_parse(b),
-               " = ", latex.number_parse(r), latex.newline())
+        if detalle:
+            funnel_detalle(traza.numero(a), " - ", traza.numero(b),
+                   " = ", traza.numero(r), latex.newline())
         componentes.append(r)
 
     return Vector(componentes)
 
 
 def vector_por_escalar(vector: Vector, escalar: Number) -> Vector:
-    funnel(latex.text("Escalando vector por "), latex.number_parse(sympy_expr(
-        escalar)), latex.newline(), latex.vector(vector), latex.newline())
+    funnel(latex.text("Escalando vector por "), traza.numero(sympy_expr(
+        escalar)), latex.newline(), traza.vector(vector), latex.newline())
     componentes = []
+    detalle = traza_activa(NIVEL_COMPLETO)
 
     for i in range(1, vector.dimension + 1):
         v = vector.at(i)
         r = v * sympy_expr(escalar)
-        funnel(latex.number_parse(v), latex.cdot(), latex.number_parse(
-            sympy_expr(escalar)), " = ", latex.number_parse(r), latex.newline())
+        if detalle:
+            funnel_detalle(traza.numero(v), latex.cdot(), traza.numero(
+                sympy_expr(escalar)), " = ", traza.numero(r), latex.newline())
         componentes.append(r)
 
     return Vector(componentes)
 
 
-def matriz_por_vector(matriz: Matriz, vector: Vector) -> Vector:
+def _componentes_por_vector(filas: list[list[Escalar]], componentes: list[sympy.Expr], primera: int) -> list[Escalar]:
+    # Componentes del resultado desde la fila `primera` (1..n), con su traza
+    resultado: list[Escalar] = []
+    pasos = traza_activa(NIVEL_PASOS)
+    detalle = traza_activa(NIVEL_COMPLETO)
+    # Para cada fila de la matriz
+    for i, fila in enumerate(filas, start=primera):
+        suma = sympy_expr(0)
+        elementos: list[sympy.Expr] = []
+        # Multiplicamos cada elemento de la fila por el correspondiente del vector
+        nuevo_paso()
+        if pasos:
+            funnel(latex.text(f"Fila {i} · vector"), latex.newline())
+        for a, x in zip(fila, componentes):
+            prod = a * x
+            if detalle:
+                funnel_detalle(traza.numero(a), latex.cdot(), traza.numero(
+                    x), " = ", traza.numero(prod), latex.newline())
+            suma += prod
+            elementos.append(prod)
+
+        if pasos:
+            funnel(traza.terminos(elementos, " + "),
+                   " = ", traza.numero(suma), latex.newline())
+        resultado.append(suma)
+    return resultado
+
+
+def _bloque_por_vector_en_proceso(tarea: tuple[list[list[Any]], list[Any], int, int]) -> tuple[list[Any], str]:
+    filas, componentes, primera, verbosidad = tarea
+    resultado, fragmento = _capturar_traza(
+        verbosidad, _componentes_por_vector,
+        [paralelo.desempaquetar(f) for f in filas],
+        paralelo.desempaquetar(componentes), primera)
+    return paralelo.empaquetar(resultado), fragmento
+
+
+def matriz_por_vector(matriz: Matriz, vector: Vector, procesos: int = 1) -> Vector:
     """
     Multiplica una matriz por un vector.
     matriz: instancia de Matriz (n x m)
@@ -714,24 +1346,25 @@ def matriz_por_vector(matriz: Matriz, vector: Vector) -> Vector:
         raise Exception(
             "Las dimensiones no son compatibles para la multiplicación.")
     funnel(latex.text("Multiplicando matriz por vector"), latex.newline(),
-           latex.matrix(matriz), latex.cdot(), latex.vector(vector), latex.newline())
-    resultado = []
-    # Para cada fila de la matriz
-    for i in range(1, matriz.filas + 1):
-        suma = sympy_expr(0)
-        elementos: list[sympy.Expr] = []
-        # Multiplicamos cada elemento de la fila por el correspondiente del vector
-        funnel(latex.text(f"Fila {i} · vector"), latex.newline())
-        for j in range(1, matriz.columnas + 1):
-            prod = matriz.at(i, j) * vector.at(j)
-            funnel(latex.number_parse(matriz.at(i, j)), latex.cdot(), latex.number_parse(
-                vector.at(j)), " = ", latex.number_parse(prod), latex.newline())
-            suma += prod
-            elementos.append(prod)
-
-        funnel(" + ".join(latex.number_parse(elem) for elem in elementos),
-               " = ", latex.number_parse(suma), latex.newline())
-        resultado.append(suma)
+           traza.matriz(matriz), latex.cdot(), traza.vector(vector), latex.newline())
+    filas = [matriz._fila(i) for i in range(matriz.filas)]
+    resultado: list[Escalar]
+
+    if procesos > 1 and matriz.filas > 1:
+        # Igual que en multiplicar_matrices: un bloque de filas por proceso
+        componentes = paralelo.empaquetar(vector.componentes)
+        tareas = []
+        primera = 1
+        for bloque in paralelo.repartir(filas, procesos):
+            tareas.append(([paralelo.empaquetar(f) for f in bloque],
+                           componentes, primera, _verbosidad_en_proceso()))
+            primera += len(bloque)
+        resultado = []
+        for valores, fragmento in paralelo.mapear(_bloque_por_vector_en_proceso, tareas, procesos):
+            funnel(fragmento)
+            resultado.extend(paralelo.desempaquetar(valores))
+    else:
+        resultado = _componentes_por_vector(filas, vector.componentes, 1)
     # Retornamos el vector resultado
     return Vector(resultado)
 
@@ -744,9 +1377,9 @@ def crear_matriz_identidad(tamaño: int) -> Matriz:
     nueva_matriz: Matriz = Matriz(tamaño, tamaño)
 
     # La matriz se inicializa en 0s, asi que vamos a ir poniendo 1s en la diagonal
-    for i in range(1, tamaño + 1):
+    for i in range(tamaño):
         # En la posicion i, i durante la diagonal vamos poniendo 1s
-        nueva_matriz.set(i, i, 1)
+        nueva_matriz._put(i, i, Fraction(1))
 
     return nueva_matriz
 
@@ -0,0 +1,116 @@
+"""
+Pool de procesos compartido para los calculos que se pueden repartir.
+
+Todo es opcional: con `procesos <= 1` las tareas se corren en el mismo
+proceso, en orden, sin crear ningun pool. El pool se crea la primera vez
+que se pide y se reutiliza en las llamadas siguientes, porque levantar
+procesos nuevos cuesta mas que la mayoria de los calculos chicos.
+
+Hay un solo pool, del tamano del mayor `procesos` que se haya pedido. Si
+llega un pedido con mas procesos se crea uno mas grande, y el anterior se
+cierra recien cuando terminan los pedidos que lo estaban usando.
+
+Las funciones que se mandan al pool tienen que estar definidas a nivel de
+modulo (pickle no puede mandar lambdas ni funciones anidadas).
+
+Los escalares viajan empaquetados: una Fraction como el par (numerador,
+denominador), que pesa menos que su pickle (que la pasa como texto). Las
+expresiones de sympy van tal cual: pickle comparte los subarboles
+repetidos y sale varias veces mas chico y rapido que `srepr`.
+"""
+import atexit
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from fractions import Fraction
+from threading import Lock
+from typing import Any
+
+import sympy
+
+from ..models.number import Escalar
+
+_pool: ProcessPoolExecutor | None = None
+_procesos_pool = 0
+# Cuantos mapear estan usando cada pool en este momento
+_usos: dict[ProcessPoolExecutor, int] = {}
+_lock = Lock()
+
+
+def procesos_disponibles() -> int:
+    return os.cpu_count() or 1
+
+
+def normalizar_procesos(procesos: int) -> int:
+    # 0 (o negativo) significa "todos los nucleos"
+    return procesos if procesos > 0 else procesos_disponibles()
+
+
+@contextmanager
+def usar_pool(procesos: int) -> Iterator[ProcessPoolExecutor]:
+    # El pool compartido, con al menos `procesos` procesos. Mientras dura el
+    # with nadie lo cierra, aunque otro pedido lo reemplace por uno mayor
+    global _pool, _procesos_pool
+    with _lock:
+        if _pool is None or _procesos_pool < procesos:
+            if _pool is not None and not _usos.get(_pool):
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=procesos)
+            _procesos_pool = procesos
+        pool = _pool
+        _usos[pool] = _usos.get(pool, 0) + 1
+    try:
+        yield pool
+    finally:
+        with _lock:
+            _usos[pool] -= 1
+            if not _usos[pool]:
+                del _usos[pool]
+                if pool is not _pool:
+                    # Lo reemplazo uno mas grande mientras se usaba
+                    pool.shutdown(wait=False)
+
+
+def mapear(funcion: Callable[[Any], Any], tareas: Iterable[Any], procesos: int = 1) -> list[Any]:
+    """
+    Igual que `list(map(funcion, tareas))`, repartiendo entre `procesos`
+    procesos cuando vale la pena. El orden de los resultados se mantiene.
+    """
+    tareas = list(tareas)
+    if procesos <= 1 or len(tareas) <= 1:
+        return [funcion(t) for t in tareas]
+    with usar_pool(procesos) as pool:
+        return list(pool.map(funcion, tareas))
+
+
+def repartir(elementos: list[Any], partes: int) -> list[list[Any]]:
+    # Divide la lista en `partes` bloques contiguos de tamano parecido
+    partes = max(1, min(partes, len(elementos)))
+    tam, sobra = divmod(len(elementos), partes)
+    bloques: list[list[Any]] = []
+    inicio = 0
+    for k in range(partes):
+        fin = inicio + tam + (1 if k < sobra else 0)
+        bloques.append(elementos[inicio:fin])
+        inicio = fin
+    return bloques
+
+
+def empaquetar(valores: Iterable[Escalar]) -> list[tuple[int, int] | sympy.Expr]:
+    return [(v.numerator, v.denominator) if isinstance(v, Fraction) else v
+            for v in valores]
+
+
+def desempaquetar(datos: Iterable[tuple[int, int] | sympy.Expr]) -> list[Escalar]:
+    return [Fraction(*d) if isinstance(d, tuple) else d for d in datos]
+
+
+@atexit.register
+def cerrar_pool() -> None:
+    global _pool, _procesos_pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+            _procesos_pool = 0
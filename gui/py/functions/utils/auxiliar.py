@@ -1,6 +1,6 @@
 from fractions import Fraction
 from typing import TypeVar
-from ..models.number import Number
+from ..models.number import Number, Escalar
 import sympy
 import sympy.parsing.sympy_parser
 
@@ -34,6 +34,33 @@ def sympy_expr(x: str | Number) -> sympy.Expr:
         raise ValueError(f"Entrada invalida: {x}") from e
 
 
+def valor_exacto(x: str | Number) -> Escalar:
+    """
+    Igual que `sympy_expr` pero deja los racionales como `Fraction`.
+    La aritmetica con Fraction corre a velocidad de enteros de Python,
+    mientras que sympy construye un arbol por cada operacion.
+    """
+    if isinstance(x, Fraction):
+        return x
+    if isinstance(x, int):
+        return Fraction(x)
+    if isinstance(x, sympy.Rational):
+        return Fraction(int(x.p), int(x.q))
+
+    expr = sympy_expr(x)
+    if isinstance(expr, sympy.Rational):
+        return Fraction(int(expr.p), int(expr.q))
+    return expr
+
+
+def normalizar(valor: Escalar) -> Escalar:
+    # Los Fraction ya estan en forma canonica. Las expresiones simbolicas se
+    # cancelan para que un cero no quede escondido en un cociente
+    if isinstance(valor, sympy.Expr):
+        return sympy.cancel(valor)
+    return valor
+
+
 def decimal_a_fraccion(x: str) -> Fraction:
     """
     Convierte strings numericos (enteros o decimales) a Fraction exacta.
@@ -0,0 +1,118 @@
+"""
+Oraculo de ceros para entradas exactas y simbolicas.
+
+Comparar una expresion de sympy con `== 0` es comparar arboles: un cero
+sin simplificar, como (x + 1)^2 - x^2 - 2x - 1, no se reconoce y termina
+elegido como pivote. `es_cero` decide en tres niveles:
+
+1. Racionales (Fraction, int, sympy.Rational): comparacion exacta.
+2. Expresiones: se prueban en unos pocos puntos racionales al azar de sus
+   simbolos (o tal cual, si no tienen). Primero se reemplaza el punto en
+   forma exacta; si queda un racional la prueba es exacta. Si no (hay pi,
+   raices, funciones), se evalua con precision alta y el valor se compara
+   con el tamano de los terminos que se suman en la expresion: solo un
+   valor grande frente a ellos prueba que no es cero. Si todas las
+   pruebas exactas dan cero, la expresion es cero salvo con probabilidad
+   despreciable (una expresion no nula se anula en muy pocos puntos).
+3. Si alguna prueba no alcanza (un valor chico pero no exacto, division
+   por cero en el punto, valor no finito), se decide con `simplify`, que
+   es lento pero seguro. Un valor chico nunca se toma como cero sin mas.
+
+Los veredictos se guardan por expresion, porque durante una eliminacion
+la misma entrada se pregunta muchas veces.
+"""
+import random
+from collections import OrderedDict
+from fractions import Fraction
+from threading import Lock
+from typing import Any
+
+import sympy
+
+# Pruebas por expresion y digitos con los que se evalua cada una
+PRUEBAS = 3
+DIGITOS = 30
+# Un valor no prueba nada si es menor que esto por el mayor de los
+# terminos sumados en la expresion (puede ser cancelacion)
+TOLERANCIA = sympy.Float(10) ** -(DIGITOS // 2)
+
+TAMANO_CACHE = 4096
+_cache: OrderedDict[sympy.Expr, bool] = OrderedDict()
+_lock = Lock()
+# Generador propio, para no depender ni alterar el estado global de random
+_azar = random.Random(0x5EED)
+
+
+def _evaluar(expr: sympy.Expr, punto: dict[sympy.Symbol, sympy.Rational]) -> Any:
+    # Devuelve el valor numerico o None si en ese punto no se puede evaluar
+    try:
+        valor = expr.evalf(DIGITOS, subs=punto)
+    except (ZeroDivisionError, ValueError, TypeError):
+        return None
+    if not valor.is_number or valor.has(sympy.zoo, sympy.nan, sympy.oo, -sympy.oo):
+        return None
+    return valor
+
+
+def _escala(expr: sympy.Expr, valor: Any) -> Any:
+    # El mayor de los terminos que se suman en cualquier parte de la
+    # expresion. Sin sumas no hay cancelacion posible: la escala es el valor
+    escala = None
+    for nodo in sympy.preorder_traversal(expr):
+        if not nodo.is_Add:
+            continue
+        for termino in nodo.args:
+            magnitud = _evaluar(termino, {})
+            if magnitud is None:
+                return None
+            magnitud = abs(magnitud)
+            if escala is None or magnitud > escala:
+                escala = magnitud
+    return abs(valor) if escala is None else escala
+
+
+def _probar(expr: sympy.Expr) -> bool | None:
+    # True/False si las pruebas alcanzan para decidir, None si no
+    simbolos = sorted(expr.free_symbols, key=str)
+    pruebas = PRUEBAS if simbolos else 1
+    for _ in range(pruebas):
+        punto = {s: sympy.Rational(_azar.randint(-97, 97), _azar.randint(1, 97))
+                 for s in simbolos}
+        exacto = expr.xreplace(punto)
+        if exacto.has(sympy.zoo, sympy.nan, sympy.oo, -sympy.oo):
+            return None
+        if exacto.is_Rational:
+            if exacto != 0:
+                return False
+            continue
+        valor = _evaluar(exacto, {})
+        if valor is None:
+            return None
+        escala = _escala(exacto, valor)
+        if escala is None or valor == 0 or abs(valor) <= TOLERANCIA * escala:
+            # Puede ser un cero o un valor muy chico: lo decide simplify
+            return None
+        return False
+    return True
+
+
+def es_cero(valor: Any) -> bool:
+    if isinstance(valor, (Fraction, int)):
+        return valor == 0
+    if not isinstance(valor, sympy.Expr) or valor.is_Rational:
+        return bool(valor == 0)
+
+    with _lock:
+        if valor in _cache:
+            _cache.move_to_end(valor)
+            return _cache[valor]
+
+    veredicto = _probar(valor)
+    if veredicto is None:
+        veredicto = sympy.simplify(valor) == 0
+
+    with _lock:
+        _cache[valor] = veredicto
+        if len(_cache) > TAMANO_CACHE:
+            _cache.popitem(last=False)
+    return veredicto
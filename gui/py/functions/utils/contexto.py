@@ -0,0 +1,193 @@
+"""
+Contexto de ejecucion de cada pedido.
+
+Todo el estado de una operacion (el buffer de la traza, si se escribe o
+no, la verbosidad, el presupuesto y el contador de pasos) vive en un
+`Contexto` guardado en una ContextVar, no en variables de modulo. Cada
+llamada del frontend corre en su propio contexto (`por_pedido`), asi dos
+llamadas concurrentes (hilos, greenlets de Eel, tareas de asyncio) no se
+pisan la traza ni los contadores. Fuera de un pedido se usa un contexto
+por defecto, propio de cada hilo.
+
+Los caches de factorizaciones y de ceros siguen siendo de todo el
+proceso a proposito: se indexan por contenido, tienen su propio lock y
+sirven entre pedidos.
+"""
+import contextvars
+import functools
+import itertools
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, TypeVar
+
+from . import traza
+from .latex import LatexBuffer
+
+# Niveles de detalle de la traza. Cada llamada a funnel tiene un nivel y
+# solo se escribe si la verbosidad del pedido en curso lo alcanza:
+# "resultado" muestra solo la respuesta, "pasos" las operaciones de fila y
+# los pasos principales, "completo" ademas cada cuenta elemento a elemento
+NIVEL_RESULTADO = 0
+NIVEL_PASOS = 1
+NIVEL_COMPLETO = 2
+
+
+class Presupuesto:
+    """
+    Tope de pasos y/o de bytes para la traza de una operacion. Cuando se
+    agota, lo que sigue (salvo el resultado) no se escribe: solo se cuenta,
+    y antes del resultado queda un resumen de lo omitido.
+    """
+
+    def __init__(self, limite_pasos: int | None = None, limite_bytes: int | None = None):
+        self.limite_pasos = limite_pasos
+        self.limite_bytes = limite_bytes
+        self.pasos_usados = 0
+        self.bytes_usados = 0
+        self.agotado = False
+        self.pasos_omitidos = 0
+        self.operaciones_omitidas = 0
+        self.fragmentos_omitidos = 0
+        self.resumido = False
+
+    def contar_paso(self) -> None:
+        self.pasos_usados += 1
+        if self.limite_pasos is not None and self.pasos_usados > self.limite_pasos:
+            self.agotado = True
+        if self.agotado:
+            self.pasos_omitidos += 1
+
+    def cargar(self, parte: str | traza.Evento) -> None:
+        if self.limite_bytes is None:
+            return
+        # Los eventos se miden con su estimacion: se renderizan recien al leer
+        self.bytes_usados += traza.tamano(parte)
+        if self.bytes_usados > self.limite_bytes:
+            self.agotado = True
+
+    def omitir(self, partes: tuple[str | traza.Evento, ...]) -> None:
+        operaciones = sum(isinstance(p, (traza.OperacionFila, traza.Intercambio))
+                          for p in partes)
+        self.operaciones_omitidas += operaciones
+        if not operaciones:
+            self.fragmentos_omitidos += 1
+
+    def omitir_operacion(self) -> None:
+        # Una operacion de fila que ni se llego a armar
+        self.operaciones_omitidas += 1
+
+    def resumen(self) -> str | None:
+        # Texto con lo omitido desde el ultimo resumen (None si no hay nada)
+        # Cada paso numerado suele ser una operacion de fila, asi que se
+        # informa una sola cuenta: los pasos si los hubo, si no las operaciones
+        omitido = None
+        if self.pasos_omitidos:
+            omitido = f"{self.pasos_omitidos} pasos más"
+        elif self.operaciones_omitidas:
+            omitido = f"{self.operaciones_omitidas} operaciones de fila más"
+        solo_detalle = omitido is None and self.fragmentos_omitidos and not self.resumido
+        self.pasos_omitidos = self.operaciones_omitidas = self.fragmentos_omitidos = 0
+        if solo_detalle:
+            # Sin pasos contables de por medio alcanza con avisarlo una vez
+            self.resumido = True
+            return "[Traza resumida: se omitió el resto del detalle]"
+        if omitido is None:
+            return None
+        self.resumido = True
+        return "[Traza resumida: se omitieron " + omitido + "]"
+
+
+@dataclass
+class Contexto:
+    salida: LatexBuffer = field(default_factory=LatexBuffer)
+    silencioso: bool = False
+    verbosidad: int = NIVEL_COMPLETO
+    presupuesto: Presupuesto = field(default_factory=Presupuesto)
+    # Contador de "Paso #n" de funciones
+    pasos: int = 0
+    # Ultima instantanea escrita de cada matriz (por id), para renderizar
+    # solo las filas que cambiaron
+    instantaneas: dict[int, traza.Instantanea] = field(default_factory=dict)
+    # Marcar con color las filas que cambiaron desde la instantanea anterior
+    resaltar_cambios: bool = False
+    id: int = 0
+
+
+_actual: contextvars.ContextVar[Contexto] = contextvars.ContextVar("contexto")
+_ids = itertools.count(1)
+
+
+def actual() -> Contexto:
+    try:
+        return _actual.get()
+    except LookupError:
+        # Primer uso en este hilo/contexto, fuera de cualquier pedido
+        ctx = Contexto()
+        _actual.set(ctx)
+        return ctx
+
+
+def salida() -> LatexBuffer:
+    return actual().salida
+
+
+@contextmanager
+def nuevo(**campos: Any) -> Iterator[Contexto]:
+    # Corre el bloque en un contexto limpio y despues vuelve al anterior
+    ctx = Contexto(id=next(_ids), **campos)
+    token = _actual.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _actual.reset(token)
+
+
+# Trazas de los ultimos pedidos, para leerlas despues de que terminaron
+# (exportar_traza) o mientras corren (leer_traza)
+RECIENTES = 8
+_recientes: OrderedDict[int, LatexBuffer] = OrderedDict()
+_recientes_lock = Lock()
+
+
+def _registrar(ctx: Contexto) -> None:
+    with _recientes_lock:
+        _recientes[ctx.id] = ctx.salida
+        while len(_recientes) > RECIENTES:
+            _recientes.popitem(last=False)
+
+
+def traza_reciente(pedido: int | None = None) -> LatexBuffer:
+    # La traza del pedido indicado, o la del ultimo que empezo
+    with _recientes_lock:
+        if pedido is None:
+            if not _recientes:
+                return LatexBuffer()
+            return next(reversed(_recientes.values()))
+        if pedido not in _recientes:
+            raise Exception(f"No hay una traza reciente para el pedido {pedido}")
+        return _recientes[pedido]
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def por_pedido(funcion: F) -> F:
+    """
+    Decorador para las funciones que llama el frontend: cada llamada corre
+    en un contexto propio y su traza queda entre las recientes. Acepta
+    ademas, solo por nombre, las opciones de traza de esa llamada:
+    `limite_traza` (tope en bytes del buffer; None = sin tope) y
+    `resaltar_cambios` (marcar con color las filas que cambiaron).
+    """
+    @functools.wraps(funcion)
+    def envoltura(*args: Any, limite_traza: int | None = None,
+                  resaltar_cambios: bool = False, **kwargs: Any) -> Any:
+        if limite_traza is not None and limite_traza <= 0:
+            raise Exception("El limite de la traza debe ser positivo")
+        with nuevo(salida=LatexBuffer(limite_traza), resaltar_cambios=resaltar_cambios) as ctx:
+            _registrar(ctx)
+            return funcion(*args, **kwargs)
+    return envoltura  # type: ignore[return-value]
@@ -3,30 +3,99 @@ from ..models.vector import Vector
 from ..models.number import Number
 from .auxiliar import sympy_expr
 from fractions import Fraction
+from collections.abc import Sequence
+from typing import Any
 import re
 import sympy
 
 
 class LatexBuffer():
-    stdout = ""
-
-    def __init__(self) -> None:
-        pass
+    """
+    Guarda la traza como una lista de entradas: LaTeX ya armado o eventos
+    de `traza` (operaciones de fila, instantaneas de matrices, numeros) que
+    recien se convierten a LaTeX cuando alguien lee `stdout`.
+
+    Agregar una entrada es O(1) y cada entrada se renderiza una sola vez,
+    aunque la traza se lea muchas veces. `leer_desde` y `drain` devuelven
+    solo lo que se agrego desde la ultima lectura, para mandar una traza
+    larga por partes. Con `limite` (en bytes de UTF-8) cada entrada se mide
+    al escribirla sin renderizarla: los strings por su largo y los eventos
+    con `tamano()`, que estima su LaTeX. Desde la primera que no entra no
+    se guarda nada mas y la traza termina con una marca de truncado.
+    """
+
+    def __init__(self, limite: int | None = None) -> None:
+        self.limite = limite
+        self.clear()
 
     def clear(self) -> None:
-        self.stdout = ""
+        self.entradas: list[Any] = []
+        # LaTeX de las entradas ya leidas, en el mismo orden
+        self._trozos: list[str] = []
+        self._bytes = 0
+        # Entradas descartadas por el limite (0 = no se trunco nada)
+        self._omitidas = 0
+        self._cursor = 0
 
     def write(self, msg: str) -> None:
-        self.stdout += text(msg)
+        self.escribir(text(msg))
 
     def writeln(self, msg: str) -> None:
-        self.stdout += text(msg) + newline()
+        self.escribir(text(msg) + newline())
 
     def writelatex(self, latex: str) -> None:
-        self.stdout += latex
-
+        self.escribir(latex)
+
+    def escribir(self, entrada: Any) -> None:
+        # Un string o un evento con metodo latex()
+        if self._omitidas:
+            # Ya se paso el limite: no tiene sentido guardar nada mas
+            self._omitidas += 1
+            return
+        if self.limite is not None:
+            tamano = len(entrada.encode("utf-8")) if isinstance(entrada, str) else entrada.tamano()
+            if self._bytes + tamano > self.limite:
+                self._omitidas = 1
+                return
+            self._bytes += tamano
+        self.entradas.append(entrada)
+
+    @property
+    def truncada(self) -> bool:
+        return self._omitidas > 0
+
+    def _renderizar(self) -> None:
+        # Renderiza las entradas que se agregaron desde la ultima lectura
+        for i in range(len(self._trozos), len(self.entradas)):
+            entrada = self.entradas[i]
+            self._trozos.append(entrada if isinstance(entrada, str) else entrada.latex())
+
+    def _marca(self) -> str:
+        return newline() + text(f"[Traza truncada: se omitieron {self._omitidas} fragmentos]") + newline()
+
+    def leer_desde(self, cursor: int = 0) -> tuple[str, int]:
+        """
+        LaTeX agregado a partir de `cursor` y el cursor para la proxima
+        lectura. La marca de truncado cuenta como un trozo mas al final.
+        """
+        self._renderizar()
+        salida = "".join(self._trozos[cursor:])
+        fin = len(self._trozos)
+        if self._omitidas:
+            if cursor <= fin:
+                salida += self._marca()
+            fin += 1
+        return salida, max(cursor, fin)
+
+    def drain(self) -> str:
+        # Como leer_desde, pero el buffer recuerda hasta donde se leyo
+        salida, self._cursor = self.leer_desde(self._cursor)
+        return salida
+
+    @property
+    def stdout(self) -> str:
+        return self.leer_desde(0)[0]
 
-LATEX_STDOUT = LatexBuffer()
 
 
 def number_parse(n: Number) -> str:
@@ -46,6 +115,14 @@ def number_decimal(expr: sympy.Expr | float, precision: int = 8) -> str:
         return sympy_expression(sympy_expr(expr))
 
 
+def decimal(val: float, precision: int = 8) -> str:
+    formatted = f"{val:.{precision}f}".rstrip("0").rstrip(".")
+    # -0.000000001 redondeado no deberia mostrarse como "-0"
+    if formatted in ("-0", ""):
+        formatted = "0"
+    return f" {formatted} "
+
+
 def fraction(frac: Fraction, force_sign: bool = False) -> str:
     latex = ""
 
@@ -63,23 +140,40 @@ def fraction(frac: Fraction, force_sign: bool = False) -> str:
 
 
 def matrix(mat: Matriz) -> str:
+    return matrix_filas([mat._fila(i) for i in range(mat.filas)], mat.columnas, mat.linea)
+
+
+def matrix_filas(filas: Sequence[Sequence[Number]], columnas: int, linea: int = -1) -> str:
+    # Igual que matrix() pero a partir de las filas ya leidas (las
+    # instantaneas de la traza guardan las filas, no la matriz)
+    return matrix_renderizada([matrix_fila(f) for f in filas], columnas, linea)
+
+
+def matrix_fila(fila: Sequence[Number]) -> str:
+    return " & ".join(number_parse(v) for v in fila)
+
+
+def matrix_fila_resaltada(fila: Sequence[Number], color: str = "orange") -> str:
+    # Cada celda por separado: un \textcolor alrededor de toda la fila
+    # romperia la alineacion de las columnas
+    return " & ".join("\\textcolor{" + color + "}{" + number_parse(v) + "}" for v in fila)
 
+
+def matrix_renderizada(filas_latex: Sequence[str], columnas: int, linea: int = -1) -> str:
+    # Arma la matriz con las filas ya convertidas a LaTeX
     latex = "\\left[\\begin{array}"
 
     # Calcular linea
-    if mat.linea != -1 and mat.linea < mat.columnas:
-        lc = "c" * mat.linea
-        rc = "c" * (mat.columnas - mat.linea)
+    if linea != -1 and linea < columnas:
+        lc = "c" * linea
+        rc = "c" * (columnas - linea)
         latex += "{" + lc + "|" + rc + "}"
     else:
-        latex += "{" + "c" * mat.columnas + "}"
+        latex += "{" + "c" * columnas + "}"
 
     # Meter todos los elementos
-    for i in range(1, mat.filas + 1):
-        for j in range(1, mat.columnas + 1):
-            if j != 1:
-                latex += " & "
-            latex += sympy_expression(mat.at(i, j))
+    for fila in filas_latex:
+        latex += fila
         latex += "\\\\"
 
     # Terminar
@@ -87,6 +181,21 @@ def matrix(mat: Matriz) -> str:
     return latex
 
 
+def matrix_decimal(filas: Sequence[Sequence[float]], precision: int = 8) -> str:
+    # Igual que matrix() pero para los arreglos float64 del modo numerico
+    latex = "\\left[\\begin{array}{" + "c" * len(filas[0]) + "}"
+    for fila in filas:
+        latex += " & ".join(decimal(float(v), precision) for v in fila)
+        latex += "\\\\"
+    latex += "\\end{array}\\right]"
+    return latex
+
+
+def vector_decimal(componentes: Sequence[float], precision: int = 8) -> str:
+    body = " \\\\ ".join(decimal(float(c), precision) for c in componentes)
+    return "\\begin{bmatrix}" + body + "\\end{bmatrix}"
+
+
 def vector(vec: Vector) -> str:
     # Construye un vector columna separando con doble backslash correcto
     body = " \\\\ ".join(sympy_expression(c) for c in vec.componentes)
@@ -168,7 +277,9 @@ def term(varname: str, coefficent: Number = sympy_expr(1), forcesign: bool = Fal
         return ""
 
     latex = ""
-    if forcesign and coefficent >= 0:
+    # Con coeficientes simbolicos (2 - x) no se puede comparar con 0, asi
+    # que se pone "+" salvo que el termino empiece con signo menos
+    if forcesign and not sympy_expr(coefficent).could_extract_minus_sign():
         latex += "+"
 
     if coefficent != 1 or not hideOne:
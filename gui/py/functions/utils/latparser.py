@@ -7,6 +7,7 @@ from ..models import matriz
 from ..models import vector
 from ..models.number import Number
 from ..operations import operaciones as op
+from ..operations.factorizacion import factorizar
 import sympy
 
 type Operand = sympy.Expr | matriz.Matriz | vector.Vector
@@ -372,7 +373,9 @@ def expfunc(args: list[Operand]) -> Operand:
 def detfunc(args: list[Operand]) -> Operand:
     arg = args[0]
     if isinstance(arg, matriz.Matriz):
-        return op.determinante_por_cofactores(arg)
+        # El resto del evaluador solo trabaja con sympy.Expr. La factorizacion
+        # queda en cache y la reutiliza una inversa de la misma matriz
+        return sympy_expr(factorizar(arg).determinante())
     if isinstance(arg, sympy.Expr):
         return sympy.det(arg)  # type: ignore
     raise Exception(f"La funcion det no es valida para objeto de tipo {type(arg)}")
@@ -769,7 +772,7 @@ def generic_subtraction(a: Operand, b: Operand) -> Operand:
 def generic_multiplication(a: Operand, b: Operand) -> Operand:
     return _dispatch(a, b, {
         (sympy.Expr, sympy.Expr): lambda x, y: x * y, # type: ignore
-        (matriz.Matriz, matriz.Matriz): lambda x, y: op.multiplicar_matrices(x, y), # type: ignore
+        (matriz.Matriz, matriz.Matriz): lambda x, y: op.multiplicar(x, y), # type: ignore
         (matriz.Matriz, vector.Vector): lambda x, y: op.matriz_por_vector(x, y), # type: ignore
         (matriz.Matriz, sympy.Expr): lambda x, y: op.matriz_por_escalar(x, y), # type: ignore
         (vector.Vector, sympy.Expr): lambda x, y: op.vector_por_escalar(x, y), # type: ignore
@@ -778,7 +781,7 @@ def generic_multiplication(a: Operand, b: Operand) -> Operand:
 def generic_division(a: Operand, b: Operand) -> Operand:
     return _dispatch(a, b, {
         (sympy.Expr, sympy.Expr): lambda x, y: x / y, # type: ignore
-        (matriz.Matriz, matriz.Matriz): lambda x, y: op.multiplicar_matrices(x, op.matriz_inversa(y)), # type: ignore
+        (matriz.Matriz, matriz.Matriz): lambda x, y: op.multiplicar(x, op.matriz_inversa(y)), # type: ignore
         # (matriz.Matriz, vector.Vector): lambda x, y: op.matriz_por_vector(x, y), # type: ignore
         (matriz.Matriz, sympy.Expr): lambda x, y: op.matriz_por_escalar(x, sympy_expr(1) / y), # type: ignore
         (vector.Vector, sympy.Expr): lambda x, y: op.vector_por_escalar(x, sympy_expr(1) / y), # type: ignore
@@ -0,0 +1,360 @@
+"""
+Eventos de la traza paso a paso.
+
+En vez de armar el LaTeX en el momento, las operaciones mandan a `funnel`
+eventos que guardan los datos del paso: una operacion de fila, un
+intercambio, una instantanea de la matriz, un numero. El buffer los guarda
+tal cual y el LaTeX (o texto plano, o JSON) se arma recien cuando alguien
+lee la traza. Si nadie la lee, `sympy.latex` no se llama nunca.
+
+Las instantaneas copian las filas (solo las referencias a los valores, que
+son inmutables), porque la matriz sigue cambiando despues del paso.
+
+Para los topes en bytes cada evento estima el tamaño de su LaTeX sin
+armarlo (`tamano`), asi que un buffer con limite tampoco renderiza nada
+al escribir.
+"""
+import re
+from abc import ABC, abstractmethod
+from fractions import Fraction
+from typing import Any
+
+import sympy
+
+from ..models.matriz import Matriz
+from ..models.number import Escalar
+from ..models.vector import Vector
+from . import latex
+
+
+class Evento(ABC):
+    tipo = "evento"
+
+    def __init__(self) -> None:
+        self._latex: str | None = None
+
+    def latex(self) -> str:
+        # Se renderiza una sola vez, aunque la traza se lea varias veces
+        if self._latex is None:
+            self._latex = self._renderizar()
+        return self._latex
+
+    @abstractmethod
+    def _renderizar(self) -> str:
+        # El LaTeX del evento; cada tipo sabe armar el suyo
+        ...
+
+    def tamano(self) -> int:
+        # Bytes del LaTeX: exactos si ya se renderizo, si no una estimacion
+        if self._latex is not None:
+            return len(self._latex.encode("utf-8"))
+        return self._estimar()
+
+    @abstractmethod
+    def _estimar(self) -> int:
+        ...
+
+    def texto(self) -> str:
+        return latex_a_texto(self.latex())
+
+    def json(self) -> dict[str, Any]:
+        return {"tipo": self.tipo, "latex": self.latex()}
+
+
+class Numero(Evento):
+    tipo = "numero"
+
+    def __init__(self, valor: Escalar):
+        super().__init__()
+        self.valor = valor
+
+    def _renderizar(self) -> str:
+        return latex.number_parse(self.valor)
+
+    def _estimar(self) -> int:
+        return tamano_valor(self.valor)
+
+    def texto(self) -> str:
+        return str(self.valor)
+
+    def json(self) -> dict[str, Any]:
+        return {"tipo": self.tipo, "valor": str(self.valor)}
+
+
+class Terminos(Evento):
+    # Varios numeros separados (los sumandos de un producto escalar, etc.)
+    tipo = "terminos"
+
+    def __init__(self, valores: list[Escalar], separador: str):
+        super().__init__()
+        self.valores = valores
+        self.separador = separador
+
+    def _renderizar(self) -> str:
+        return self.separador.join(latex.number_parse(v) for v in self.valores)
+
+    def _estimar(self) -> int:
+        return (sum(tamano_valor(v) for v in self.valores)
+                + len(self.separador) * max(len(self.valores) - 1, 0))
+
+    def texto(self) -> str:
+        return self.separador.join(str(v) for v in self.valores)
+
+    def json(self) -> dict[str, Any]:
+        return {"tipo": self.tipo, "valores": [str(v) for v in self.valores],
+                "separador": self.separador}
+
+
+class Instantanea(Evento):
+    """
+    Copia de las filas de una matriz en un paso. Entre un paso y el
+    siguiente una operacion de fila cambia una sola fila: al enlazarla con
+    la instantanea anterior de la misma matriz, las filas iguales reutilizan
+    el LaTeX ya armado y solo se renderizan las que cambiaron.
+    """
+    tipo = "matriz"
+
+    def __init__(self, mat: Matriz):
+        super().__init__()
+        self.clave = id(mat)
+        self.filas = [mat._fila(i) for i in range(mat.filas)]
+        self.columnas = mat.columnas
+        self.linea = mat.linea
+        # Que instantanea renderiza cada fila: esta o una anterior que tenia
+        # la misma fila en la misma posicion
+        self._origen: list[Instantanea] = [self] * len(self.filas)
+        self._latex_filas: list[str | None] = [None] * len(self.filas)
+        self._tamano_filas: list[int | None] = [None] * len(self.filas)
+        self.resaltadas: set[int] = set()
+
+    def enlazar(self, ultimas: dict[int, "Instantanea"], resaltar: bool = False) -> None:
+        """
+        Compara con la ultima instantanea escrita de la misma matriz (por
+        valor, asi que no importa si el id se reutilizo) y se registra como
+        la nueva ultima. Con `resaltar` las filas que cambiaron se marcan
+        con color.
+        """
+        anterior = ultimas.get(self.clave)
+        ultimas[self.clave] = self
+        if anterior is None or anterior.columnas != self.columnas or len(anterior.filas) != len(self.filas):
+            return
+        for i, (fila, previa) in enumerate(zip(self.filas, anterior.filas)):
+            if fila == previa:
+                self.filas[i] = previa
+                self._origen[i] = anterior._origen[i]
+            elif resaltar:
+                self.resaltadas.add(i)
+
+    def _fila_latex(self, i: int) -> str:
+        # El origen siempre es dueño de su fila, asi que no hay cadenas
+        origen = self._origen[i]
+        renderizada = origen._latex_filas[i]
+        if renderizada is None:
+            renderizada = origen._latex_filas[i] = latex.matrix_fila(origen.filas[i])
+        return renderizada
+
+    def _tamano_fila(self, i: int) -> int:
+        origen = self._origen[i]
+        tamano = origen._tamano_filas[i]
+        if tamano is None:
+            # Las celdas van separadas por " & "
+            fila = origen.filas[i]
+            tamano = origen._tamano_filas[i] = (sum(tamano_valor(v) for v in fila)
+                                                + 3 * max(len(fila) - 1, 0))
+        return tamano
+
+    def _estimar(self) -> int:
+        # \left[\begin{array}{...} ... \end{array}\right] mas "\\" por fila
+        tamano = 40 + self.columnas
+        for i in range(len(self.filas)):
+            tamano += self._tamano_fila(i) + 2
+            if i in self.resaltadas:
+                tamano += 19 * self.columnas
+        return tamano
+
+    def _renderizar(self) -> str:
+        filas = [latex.matrix_fila_resaltada(self.filas[i]) if i in self.resaltadas
+                 else self._fila_latex(i) for i in range(len(self.filas))]
+        return latex.matrix_renderizada(filas, self.columnas, self.linea)
+
+    def texto(self) -> str:
+        lineas = []
+        for fila in self.filas:
+            celdas = [str(v) for v in fila]
+            if self.linea != -1 and self.linea < self.columnas:
+                celdas.insert(self.linea, "|")
+            lineas.append("[ " + "  ".join(celdas) + " ]")
+        return "\n" + "\n".join(lineas) + "\n"
+
+    def json(self) -> dict[str, Any]:
+        return {"tipo": self.tipo, "filas": [[str(v) for v in f] for f in self.filas],
+                "linea": self.linea}
+
+
+class InstantaneaVector(Evento):
+    tipo = "vector"
+
+    def __init__(self, vec: Vector):
+        super().__init__()
+        self.componentes = list(vec.componentes)
+
+    def _renderizar(self) -> str:
+        body = " \\\\ ".join(latex.sympy_expression(c) for c in self.componentes)
+        return "\\begin{bmatrix}" + body + "\\end{bmatrix}"
+
+    def _estimar(self) -> int:
+        return 28 + sum(tamano_valor(c) + 4 for c in self.componentes)
+
+    def texto(self) -> str:
+        return "(" + ", ".join(str(c) for c in self.componentes) + ")"
+
+    def json(self) -> dict[str, Any]:
+        return {"tipo": self.tipo, "componentes": [str(c) for c in self.componentes]}
+
+
+class OperacionFila(Evento):
+    """
+    f_destino -> (c * f_destino + d * f_fuente) / divisor. Sin fuente es un
+    escalado; con `literal` se escribe f_a + f_b (o f_a - f_b) sin
+    coeficientes, como en sumar_fila y restar_fila.
+    """
+    tipo = "operacion_fila"
+
+    def __init__(self, destino: int, coeficiente: Escalar, fuente: int | None = None,
+                 coeficiente_fuente: Escalar | None = None, divisor: Escalar | None = None,
+                 literal: bool = False):
+        super().__init__()
+        self.destino = destino
+        self.coeficiente = coeficiente
+        self.fuente = fuente
+        self.coeficiente_fuente = coeficiente_fuente
+        self.divisor = divisor
+        self.literal = literal
+
+    def _renderizar(self) -> str:
+        destino = latex.indexedvar("f", self.destino)
+        if self.fuente is None:
+            derecha = latex.term(destino, self.coeficiente)
+        elif self.literal:
+            signo = " + " if self.coeficiente_fuente == 1 else " - "
+            derecha = destino + signo + latex.indexedvar("f", self.fuente)
+        else:
+            derecha = latex.term(destino, self.coeficiente)
+            if self.coeficiente_fuente != 0:
+                derecha += latex.term(latex.indexedvar("f", self.fuente),
+                                      self.coeficiente_fuente, forcesign=True)
+        if self.divisor is not None and self.divisor != 1:
+            derecha = latex.frac(derecha, latex.number_parse(self.divisor))
+        return destino + latex.rarrow() + derecha
+
+    def _estimar(self) -> int:
+        # f_{i} \to ... : los indices y las flechas ocupan poco y siempre lo mismo
+        tamano = 24 + tamano_valor(self.coeficiente)
+        if self.coeficiente_fuente is not None:
+            tamano += 8 + tamano_valor(self.coeficiente_fuente)
+        if self.divisor is not None:
+            tamano += 9 + tamano_valor(self.divisor)
+        return tamano
+
+    def texto(self) -> str:
+        derecha = f"{self.coeficiente}*f{self.destino}"
+        if self.fuente is not None:
+            derecha += f" + ({self.coeficiente_fuente})*f{self.fuente}"
+        if self.divisor is not None and self.divisor != 1:
+            derecha = f"({derecha}) / {self.divisor}"
+        return f"f{self.destino} -> {derecha}"
+
+    def json(self) -> dict[str, Any]:
+        return {"tipo": self.tipo, "destino": self.destino,
+                "coeficiente": str(self.coeficiente), "fuente": self.fuente,
+                "coeficiente_fuente": None if self.coeficiente_fuente is None else str(self.coeficiente_fuente),
+                "divisor": None if self.divisor is None else str(self.divisor)}
+
+
+class Intercambio(Evento):
+    tipo = "intercambio"
+
+    def __init__(self, fila_a: int, fila_b: int):
+        super().__init__()
+        self.fila_a = fila_a
+        self.fila_b = fila_b
+
+    def _renderizar(self) -> str:
+        return latex.indexedvar("f", self.fila_a) + latex.barrow() + latex.indexedvar("f", self.fila_b)
+
+    def _estimar(self) -> int:
+        return 32
+
+    def texto(self) -> str:
+        return f"f{self.fila_a} <-> f{self.fila_b}"
+
+    def json(self) -> dict[str, Any]:
+        return {"tipo": self.tipo, "filas": [self.fila_a, self.fila_b]}
+
+
+# Atajos con los mismos nombres que los de `latex`, para usarlos en funnel
+
+def matriz(mat: Matriz) -> Instantanea:
+    return Instantanea(mat)
+
+
+def vector(vec: Vector) -> InstantaneaVector:
+    return InstantaneaVector(vec)
+
+
+def numero(valor: Escalar) -> Numero:
+    return Numero(valor)
+
+
+def terminos(valores: list[Escalar], separador: str) -> Terminos:
+    return Terminos(list(valores), separador)
+
+
+def tamano_valor(valor: Escalar) -> int:
+    """
+    Estimacion barata de los bytes de `latex.number_parse(valor)`. Para los
+    racionales sale de los digitos; para las expresiones simbolicas, de la
+    cantidad de nodos del arbol (imprimirlas costaria lo mismo que el LaTeX).
+    """
+    if isinstance(valor, int):
+        valor = Fraction(valor)
+    if isinstance(valor, sympy.Rational):
+        valor = Fraction(int(valor.p), int(valor.q))
+    if isinstance(valor, Fraction):
+        if valor.denominator == 1:
+            return len(str(valor.numerator)) + 2
+        # " - \frac{n}{d} "
+        return (len(str(abs(valor.numerator))) + len(str(valor.denominator)) + 10
+                + 2 * (valor < 0))
+    if isinstance(valor, sympy.Basic):
+        return 2 + 3 * sum(1 for _ in sympy.preorder_traversal(valor))
+    return len(str(valor)) + 2
+
+
+def tamano(parte: str | Evento) -> int:
+    # Bytes que ocupa una parte de la traza; los strings ya estan armados
+    if isinstance(parte, str):
+        return len(parte.encode("utf-8"))
+    return parte.tamano()
+
+
+# Exportar la traza en otros formatos
+
+_TEXTO = re.compile(r"\\text\{((?:[^{}\\]|\\.)*)\}")
+_ESCAPE = re.compile(r"\\([#$%&_{}])")
+
+
+def latex_a_texto(fragmento: str) -> str:
+    # Conversion aproximada: saca \text{...} y cambia los saltos de linea
+    fragmento = _TEXTO.sub(lambda m: _ESCAPE.sub(r"\1", m.group(1)), fragmento)
+    return fragmento.replace("\\\\ ", "\n")
+
+
+def texto(buffer: latex.LatexBuffer) -> str:
+    return "".join(latex_a_texto(e) if isinstance(e, str) else e.texto()
+                   for e in buffer.entradas)
+
+
+def json(buffer: latex.LatexBuffer) -> list[dict[str, Any]]:
+    return [{"tipo": "latex", "latex": e} if isinstance(e, str) else e.json()
+            for e in buffer.entradas]
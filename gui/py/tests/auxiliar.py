@@ -0,0 +1,65 @@
+"""
+Matrices de prueba y utilidades compartidas por los tests.
+
+Los tests se corren desde la carpeta gui, de a un modulo o varios:
+    python -m unittest py.tests.test_modular py.tests.test_ceros
+"""
+import contextlib
+import io
+import random
+import unittest
+from fractions import Fraction
+
+import sympy
+
+from py.functions.models.matriz import Matriz
+from py.functions.operations import funciones as fn
+from py.functions.utils import contexto
+
+x, y = sympy.symbols("x y")
+# (x + 1)^2 - x^2 - 2x - 1 es cero, pero no se ve sin expandir
+CERO_ESCONDIDO = (x + 1) ** 2 - x ** 2 - 2 * x - 1
+
+
+def racional(n: int, m: int | None = None, semilla: int = 0) -> Matriz:
+    azar = random.Random(semilla)
+    m = n if m is None else m
+    return Matriz._desde_filas(
+        [[Fraction(azar.randint(-9, 9), azar.randint(1, 4)) for _ in range(m)]
+         for _ in range(n)], True)
+
+
+def simbolica(filas: list[list[object]]) -> Matriz:
+    return Matriz._desde_filas([[sympy.sympify(v) for v in f] for f in filas], False)
+
+
+def singular() -> Matriz:
+    return Matriz._desde_filas([[Fraction(1), Fraction(2)], [Fraction(2), Fraction(4)]], True)
+
+
+def iguales(a: object, b: object) -> bool:
+    return sympy.simplify(sympy.sympify(a) - sympy.sympify(b)) == 0
+
+
+def filas(mat: Matriz) -> list[list[object]]:
+    return [mat._fila(i) for i in range(mat.filas)]
+
+
+def gauss_jordan(a: Matriz, b: Matriz) -> list[list[object]]:
+    # Reduce [A | B] con la eliminacion de siempre y devuelve el bloque de la derecha
+    mat = Matriz._desde_filas([a._fila(i) + b._fila(i) for i in range(a.filas)], a.racional)
+    fn.matriz_escalonada_reducida(mat, a.filas, a.columnas)
+    return [mat._fila(i)[a.columnas:] for i in range(a.filas)]
+
+
+class EnSilencio(unittest.TestCase):
+    def setUp(self) -> None:
+        # El parser imprime su arbol por stdout; cada prueba corre en su contexto
+        self._salida = contextlib.redirect_stdout(io.StringIO())
+        self._salida.__enter__()
+        self._contexto = contexto.nuevo(silencioso=True)
+        self._contexto.__enter__()
+
+    def tearDown(self) -> None:
+        self._contexto.__exit__(None, None, None)
+        self._salida.__exit__(None, None, None)
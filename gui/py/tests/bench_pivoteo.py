@@ -0,0 +1,83 @@
+"""
+Compara las estrategias de pivoteo de Gauss-Jordan sobre casos tipicos.
+
+Correr desde la carpeta gui:
+    python -m py.tests.bench_pivoteo
+
+Para cada caso y estrategia muestra el tiempo de resolver el sistema con
+traza y el largo de esa traza, que crece con el tamano de las fracciones y
+expresiones intermedias.
+"""
+import contextlib
+import io
+import random
+import time
+
+from py.functions.models.matriz import Matriz
+from py.functions.operations import funciones as fn
+from py.functions.utils import contexto
+from py.functions.utils.input import matrix_make
+
+
+def decimales(n: int) -> list[list[str]]:
+    return [[f"{random.uniform(-10, 10):.3f}" for _ in range(n + 1)] for _ in range(n)]
+
+
+def racionales(n: int) -> list[list[str]]:
+    # Pocas entradas grandes entre muchas chicas: el primer pivote suele ser malo
+    def entrada() -> str:
+        if random.random() < 0.3:
+            return f"\\frac{{{random.randint(100, 999)}}}{{{random.randint(100, 999)}}}"
+        return str(random.randint(-3, 3))
+    return [[entrada() for _ in range(n + 1)] for _ in range(n)]
+
+
+def simbolicos(n: int) -> list[list[str]]:
+    opciones = ["\\pi", "\\sqrt{2}", "\\pi^{2} + 1", "\\frac{\\pi}{3}", "1 + \\sqrt{3}"]
+    def entrada() -> str:
+        if random.random() < 0.4:
+            return random.choice(opciones)
+        return str(random.randint(-3, 3))
+    return [[entrada() for _ in range(n + 1)] for _ in range(n)]
+
+
+CASOS = [
+    ("decimales 8x8", decimales, 8),
+    ("racionales 8x8", racionales, 8),
+    ("simbolicos 4x4", simbolicos, 4),
+]
+
+
+REPETICIONES = 3
+
+
+def medir(entradas: list[list[str]], pivoteo: str) -> tuple[float, int]:
+    # Mejor tiempo de varias corridas; el parser de entradas imprime su AST,
+    # asi que se arma la matriz con la salida estandar silenciada
+    mejor = float("inf")
+    largo = 0
+    for _ in range(REPETICIONES):
+        with contextlib.redirect_stdout(io.StringIO()):
+            mat: Matriz = matrix_make(entradas)
+        n = mat.filas
+        with contexto.nuevo() as ctx:
+            # La traza se renderiza al leerla, asi que la lectura entra en el tiempo
+            inicio = time.perf_counter()
+            fn.resolver_sistema(mat, n, n, pivoteo=pivoteo)
+            largo = len(ctx.salida.stdout)
+            mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, largo
+
+
+def main() -> None:
+    random.seed(2024)
+    print(f"{'caso':<16} {'pivoteo':<12} {'tiempo (s)':>10} {'traza (car.)':>13}")
+    for nombre, generar, n in CASOS:
+        entradas = generar(n)
+        for pivoteo in fn.estrategias_pivoteo:
+            tiempo, largo = medir(entradas, pivoteo)
+            print(f"{nombre:<16} {pivoteo:<12} {tiempo:>10.3f} {largo:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Determinante por Bareiss contra la expansion por cofactores.
+"""
+import unittest
+
+from py.functions.operations import operaciones as op
+from py.tests.auxiliar import EnSilencio, iguales, racional, simbolica, singular, x, y
+
+
+class TestBareiss(EnSilencio):
+    def test_igual_que_cofactores(self) -> None:
+        for n in range(1, 6):
+            mat = racional(n, semilla=n)
+            with self.subTest(n=n):
+                self.assertEqual(op.determinante_por_bareiss(mat),
+                                 op.determinante_por_cofactores(mat))
+
+    def test_simbolico(self) -> None:
+        mat = simbolica([[x, 1, y], [2, x + y, 0], [y, 1, x]])
+        self.assertTrue(iguales(op.determinante_por_bareiss(mat),
+                                op.determinante_por_cofactores(mat)))
+
+    def test_pivote_nulo_y_singular(self) -> None:
+        mat = simbolica([[0, 1, 2], [3, 4, 5], [6, 7, 9]])
+        self.assertTrue(iguales(op.determinante_por_bareiss(mat),
+                                op.determinante_por_cofactores(mat)))
+        self.assertEqual(op.determinante_por_bareiss(singular()), 0)
+
+    def test_sarrus(self) -> None:
+        mat = racional(3, semilla=7)
+        self.assertEqual(op.determinante_por_bareiss(mat), op.determinante_por_sarrus(mat))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Oraculo de ceros y los pivotes que decide en Bareiss, PLU y escalonar.
+"""
+import unittest
+from fractions import Fraction
+
+import sympy
+
+from py.functions.operations import espacios
+from py.functions.operations import operaciones as op
+from py.functions.utils.ceros import es_cero
+from py.tests.auxiliar import CERO_ESCONDIDO, EnSilencio, iguales, simbolica, x, y
+
+
+class TestCeros(unittest.TestCase):
+    def test_racionales(self) -> None:
+        self.assertTrue(es_cero(Fraction(0)))
+        self.assertTrue(es_cero(0))
+        self.assertFalse(es_cero(Fraction(1, 10 ** 40)))
+
+    def test_expresiones(self) -> None:
+        self.assertTrue(es_cero(CERO_ESCONDIDO))
+        self.assertTrue(es_cero(sympy.sin(x) ** 2 + sympy.cos(x) ** 2 - 1))
+        self.assertTrue(es_cero(sympy.sqrt(2) ** 2 - 2))
+        self.assertFalse(es_cero(x - y))
+        self.assertFalse(es_cero(sympy.pi - sympy.Rational(355, 113)))
+
+    def test_valores_chicos_no_son_cero(self) -> None:
+        self.assertFalse(es_cero(x / 10 ** 20))
+        self.assertFalse(es_cero(sympy.sqrt(2) / 10 ** 18))
+        self.assertFalse(es_cero(sympy.pi * x / 10 ** 30))
+        self.assertFalse(es_cero(sympy.sqrt(2) + sympy.pi / 10 ** 25 - sympy.sqrt(2)))
+
+    def test_cero_fuera_de_dominio(self) -> None:
+        # Se anula en todos lados salvo donde no esta definida
+        self.assertTrue(es_cero((x ** 2 - 1) / (x - 1) - (x + 1)))
+
+
+class TestPivotes(EnSilencio):
+    def test_cero_escondido_no_es_pivote(self) -> None:
+        mat = simbolica([[CERO_ESCONDIDO, 1], [1, 2]])
+        for metodo in ("cofactores", "bareiss", "plu"):
+            with self.subTest(metodo=metodo):
+                self.assertTrue(iguales(op.determinante(mat, metodo), -1))
+
+    def test_pivote_chico_no_nulo(self) -> None:
+        chico = x / 10 ** 20
+        mat = simbolica([[chico, 1], [0, chico]])
+        for metodo in ("cofactores", "bareiss", "plu"):
+            with self.subTest(metodo=metodo):
+                self.assertTrue(iguales(op.determinante(mat, metodo), chico ** 2))
+        self.assertEqual(op.rango(mat, "plu"), 2)
+        self.assertEqual(len(espacios.escalonar([mat._fila(0), mat._fila(1)], 2)[1]), 2)
+
+    def test_escalonar(self) -> None:
+        filas = [[CERO_ESCONDIDO, sympy.Integer(1)], [sympy.Integer(1), sympy.Integer(2)]]
+        self.assertEqual(len(espacios.escalonar(filas, 2)[1]), 2)
+        filas = [[CERO_ESCONDIDO, x], [2 * CERO_ESCONDIDO, 2 * x]]
+        self.assertEqual(len(espacios.escalonar(filas, 2)[1]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Eliminacion sobre MatrizDispersa contra la misma eliminacion densa.
+"""
+import unittest
+from fractions import Fraction
+
+from py.functions.models.matriz import Matriz
+from py.functions.models.matriz_dispersa import MatrizDispersa, elegir_representacion
+from py.functions.operations import funciones as fn
+from py.tests.auxiliar import EnSilencio, filas, x
+
+
+def casi_diagonal() -> Matriz:
+    # [A | b] con A de diagonal dominante y dos elementos fuera de la diagonal
+    n = 7
+    datos = [[Fraction(0)] * (n + 1) for _ in range(n)]
+    for i in range(n):
+        datos[i][i] = Fraction(i + 2)
+        datos[i][n] = Fraction(i - 3)
+    datos[0][4] = Fraction(1)
+    datos[5][1] = Fraction(-2, 3)
+    return Matriz._desde_filas(datos, True)
+
+
+class TestDispersa(EnSilencio):
+    def test_se_elige_dispersa(self) -> None:
+        self.assertIsInstance(elegir_representacion(casi_diagonal()), MatrizDispersa)
+
+    def test_eliminacion_igual_que_densa(self) -> None:
+        densa = casi_diagonal()
+        dispersa = MatrizDispersa.desde(densa)
+        fn.matriz_escalonada_reducida(densa, 7, 7)
+        fn.matriz_escalonada_reducida(dispersa, 7, 7)
+        self.assertEqual(filas(dispersa), filas(densa))
+
+    def test_copia(self) -> None:
+        dispersa = MatrizDispersa.desde(casi_diagonal())
+        dispersa.linea = 7
+        dispersa.relleno = 4
+        copia = dispersa.copy()
+        self.assertEqual((copia.linea, copia.relleno), (7, 4))
+        self.assertEqual(filas(copia), filas(dispersa))
+
+    def test_constructores(self) -> None:
+        nueva = MatrizDispersa._desde_filas([[Fraction(0), Fraction(3)]], True)
+        self.assertEqual(nueva.no_nulos(), 1)
+        self.assertEqual(nueva._fila(0), [0, 3])
+        nueva = MatrizDispersa._desde_valores(1, 2, [0, x])
+        self.assertFalse(nueva.racional)
+        self.assertEqual(nueva._fila(0), [0, x])
+
+
+if __name__ == "__main__":
+    unittest.main()
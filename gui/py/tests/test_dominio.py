@@ -0,0 +1,46 @@
+"""
+Eliminacion en DomainMatrix contra cofactores y Gauss-Jordan.
+"""
+import unittest
+
+from py.functions.models.matriz import Matriz
+from py.functions.operations import dominio
+from py.functions.operations import funciones as fn
+from py.functions.operations import operaciones as op
+from py.tests.auxiliar import (EnSilencio, filas, gauss_jordan, iguales, racional,
+                               simbolica, singular, x, y)
+
+
+class TestDominio(EnSilencio):
+    def test_determinante_igual_que_cofactores(self) -> None:
+        for n in range(1, 5):
+            mat = racional(n, semilla=n)
+            with self.subTest(n=n):
+                self.assertEqual(op.determinante_por_dominio(mat),
+                                 op.determinante_por_cofactores(mat))
+        mat = simbolica([[x, 1, y], [2, x + y, 0], [y, 1, x]])
+        self.assertTrue(iguales(op.determinante_por_dominio(mat),
+                                op.determinante_por_cofactores(mat)))
+
+    def test_inversa_igual_que_gauss_jordan(self) -> None:
+        a = racional(3, semilla=4)
+        self.assertEqual(filas(op.inversa_por_dominio(a)),
+                         gauss_jordan(a, op.hacer_matriz_identidad(3)))
+
+    def test_escalonada_igual_que_gauss_jordan(self) -> None:
+        mat = simbolica([[x, 1, 2], [1, y, 3]])
+        esperada = Matriz._desde_filas(filas(mat), False)
+        fn.matriz_escalonada_reducida(esperada, 2, 2)
+        reducida, pivotes, _ = dominio.escalonada_reducida(mat)
+        self.assertEqual(pivotes, (0, 1))
+        for fila, fila_esperada in zip(filas(reducida), filas(esperada)):
+            for a, b in zip(fila, fila_esperada):
+                self.assertTrue(iguales(a, b))
+
+    def test_rango(self) -> None:
+        self.assertEqual(dominio.rango(singular()), 1)
+        self.assertEqual(dominio.rango(racional(4, semilla=2)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Factorizacion PLU y su cache contra Gauss-Jordan y cofactores.
+"""
+import unittest
+
+from py.functions.operations import operaciones as op
+from py.functions.operations.factorizacion import FactorizacionPLU, factorizar
+from py.tests.auxiliar import (EnSilencio, filas, gauss_jordan, iguales, racional,
+                               simbolica, singular, x, y)
+
+
+class TestPLU(EnSilencio):
+    def test_determinante_igual_que_cofactores(self) -> None:
+        for n in range(1, 6):
+            mat = racional(n, semilla=n)
+            with self.subTest(n=n):
+                self.assertEqual(factorizar(mat).determinante(),
+                                 op.determinante_por_cofactores(mat))
+        mat = simbolica([[x, 1, y], [2, x + y, 0], [y, 1, x]])
+        self.assertTrue(iguales(factorizar(mat).determinante(),
+                                op.determinante_por_cofactores(mat)))
+
+    def test_resolver_igual_que_gauss_jordan(self) -> None:
+        a = racional(4, semilla=5)
+        b = racional(4, 1, semilla=6)
+        esperado = [f[0] for f in gauss_jordan(a, b)]
+        self.assertEqual(factorizar(a).resolver(b._columna(0)), esperado)
+
+    def test_inversa_igual_que_gauss_jordan(self) -> None:
+        a = racional(4, semilla=8)
+        esperado = gauss_jordan(a, op.hacer_matriz_identidad(4))
+        self.assertEqual(filas(factorizar(a).inversa()), esperado)
+
+    def test_pa_igual_lu(self) -> None:
+        a = racional(4, 3, semilla=9)
+        plu = FactorizacionPLU(a)
+        self.assertEqual(filas(op.producto_sin_traza(plu.P(), a)),
+                         filas(op.producto_sin_traza(plu.L(), plu.U())))
+
+    def test_singular(self) -> None:
+        plu = factorizar(singular())
+        self.assertEqual((plu.rango, plu.determinante()), (1, 0))
+        with self.assertRaises(Exception):
+            plu.inversa()
+
+    def test_cache_por_contenido(self) -> None:
+        a = racional(3, semilla=12)
+        self.assertIs(factorizar(a), factorizar(a.copy()))
+        self.assertIsNot(factorizar(a), factorizar(racional(3, semilla=13)))
+
+    def test_cache_separa_racional_de_simbolica(self) -> None:
+        a = racional(3, semilla=14)
+        promovida = simbolica(filas(a))
+        self.assertTrue(factorizar(a).racional)
+        self.assertFalse(factorizar(promovida).racional)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+Determinante y rango multimodulares (residuos + teorema chino del resto)
+contra cofactores y la factorizacion PLU.
+"""
+import unittest
+
+from py.functions.models.matriz import Matriz
+from py.functions.operations import operaciones as op
+from py.tests.auxiliar import EnSilencio, racional, singular
+
+
+class TestModular(EnSilencio):
+    def test_determinante_igual_que_cofactores(self) -> None:
+        for n in range(1, 6):
+            mat = racional(n, semilla=n)
+            with self.subTest(n=n):
+                self.assertEqual(op.determinante(mat, "modular"),
+                                 op.determinante_por_cofactores(mat))
+
+    def test_singular(self) -> None:
+        self.assertEqual(op.determinante(singular(), "modular"), 0)
+        self.assertEqual(op.rango(singular(), "modular"), 1)
+
+    def test_rango_igual_que_plu(self) -> None:
+        base = racional(3, 5, semilla=11)
+        # Dos filas mas que son combinaciones de las primeras: rango 3
+        filas = [base._fila(i) for i in range(3)]
+        filas.append([a + 2 * b for a, b in zip(filas[0], filas[1])])
+        filas.append([a - b for a, b in zip(filas[2], filas[0])])
+        mat = Matriz._desde_filas(filas, True)
+        self.assertEqual(op.rango(mat, "modular"), 3)
+        self.assertEqual(op.rango(mat, "plu"), 3)
+
+    def test_procesos(self) -> None:
+        mat = racional(5, semilla=3)
+        esperado = op.determinante_por_cofactores(mat)
+        self.assertEqual(op.determinante(mat, "modular", 2), esperado)
+        self.assertEqual(op.determinante(mat, "cofactores", 2), esperado)
+        self.assertEqual(op.rango(mat, "modular", 2), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Producto de matrices grandes (Strassen-Winograd, i-k-j con enteros) contra
+el producto elemento a elemento.
+"""
+import unittest
+
+from py.functions.operations import multiplicacion
+from py.functions.operations import operaciones as op
+from py.functions.utils import contexto
+from py.tests.auxiliar import EnSilencio, filas, iguales, racional, simbolica, x, y
+
+
+class TestProducto(EnSilencio):
+    def test_strassen_igual_que_clasico(self) -> None:
+        a = racional(9, 7, semilla=1)
+        b = racional(7, 10, semilla=2)
+        esperado = filas(op.producto_sin_traza(a, b))
+        for umbral in (1, 2, 64):
+            with self.subTest(umbral=umbral):
+                resultado, _ = multiplicacion.producto(a, b, umbral)
+                self.assertEqual(filas(resultado), esperado)
+
+    def test_con_traza_igual_que_sin_traza(self) -> None:
+        a = racional(4, 3, semilla=3)
+        b = racional(3, 5, semilla=4)
+        self.assertEqual(filas(op.multiplicar_matrices(a, b)),
+                         filas(op.producto_sin_traza(a, b)))
+
+    def test_grandes_con_resumen(self) -> None:
+        a = racional(21, semilla=5)
+        b = racional(21, semilla=6)
+        esperado = filas(op.producto_sin_traza(a, b))
+        with contexto.nuevo() as ctx:
+            self.assertEqual(filas(op.multiplicar(a, b)), esperado)
+        self.assertLess(len(ctx.salida.entradas), 5)
+        with contexto.nuevo() as ctx:
+            self.assertEqual(filas(op.multiplicar(a, b, detallado=True)), esperado)
+        self.assertGreater(len(ctx.salida.entradas), 21 * 21)
+
+    def test_simbolico(self) -> None:
+        a = simbolica([[x, 1], [y, 2], [1, x]])
+        b = simbolica([[1, y, 0], [x, 1, 2]])
+        resultado, _ = multiplicacion.producto(a, b, 1)
+        esperado = op.producto_sin_traza(a, b)
+        for i in range(3):
+            for j in range(3):
+                self.assertTrue(iguales(resultado._get(i, j), esperado._get(i, j)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+Traza por eventos: se renderiza recien cuando alguien la lee.
+"""
+import contextlib
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from unittest import mock
+
+from py.functions import controller
+from py.functions.operations import funciones as fn
+from py.functions.operations import operaciones as op
+from py.functions.utils import contexto, traza
+from py.functions.utils.latex import LatexBuffer
+
+from py.tests.auxiliar import EnSilencio, racional
+
+# 5x5 invertible con entradas enteras
+ENTRADA = [[str((i * 7 + j * 3) % 11 - 5) for j in range(5)] for i in range(5)]
+
+
+def pedido(funcion, *args, **kwargs) -> str:
+    # El parser imprime su arbol por stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcion(*args, **kwargs)
+
+
+class TestEventos(unittest.TestCase):
+    def test_evento_es_abstracto(self):
+        with self.assertRaises(TypeError):
+            traza.Evento()
+
+    def test_se_renderiza_una_sola_vez(self):
+        evento = traza.numero(Fraction(1, 2))
+        llamadas = []
+        original = evento._renderizar
+        evento._renderizar = lambda: llamadas.append(1) or original()
+        self.assertEqual(evento.latex(), evento.latex())
+        self.assertEqual(len(llamadas), 1)
+
+    def test_sin_lectura_no_renderiza(self):
+        buffer = LatexBuffer()
+        evento = traza.matriz(racional(3))
+        buffer.escribir(evento)
+        self.assertIsNone(evento._latex)
+        self.assertIn("array", buffer.stdout)
+
+    def test_instantanea_copia_las_filas(self):
+        mat = racional(2)
+        evento = traza.matriz(mat)
+        antes = evento.texto()
+        op._escalar_fila_densa(mat, 0, Fraction(7))
+        self.assertEqual(evento.texto(), antes)
+
+    def test_formatos(self):
+        buffer = LatexBuffer()
+        buffer.writeln("Inicio")
+        buffer.escribir(traza.Intercambio(1, 2))
+        self.assertEqual(traza.texto(buffer), "Inicio\nf1 <-> f2")
+        self.assertEqual(traza.json(buffer)[1], {"tipo": "intercambio", "filas": [1, 2]})
+
+
+class TestLimite(unittest.TestCase):
+    def test_escribir_no_renderiza(self):
+        buffer = LatexBuffer(limite=10_000)
+        evento = traza.matriz(racional(4))
+        buffer.escribir(evento)
+        self.assertIsNone(evento._latex)
+
+    def test_estimacion_cercana(self):
+        for evento in (traza.matriz(racional(5, 3, 1)), traza.numero(Fraction(-7, 3)),
+                       traza.OperacionFila(1, Fraction(2, 3), 2, Fraction(-5))):
+            real = len(evento._renderizar().encode("utf-8"))
+            self.assertLess(abs(evento.tamano() - real), real // 2 + 8)
+
+    def test_trunca_con_marca(self):
+        buffer = LatexBuffer(limite=1_000)
+        for semilla in range(20):
+            buffer.escribir(traza.matriz(racional(3, semilla=semilla)))
+        self.assertTrue(buffer.truncada)
+        self.assertIn("Traza truncada", buffer.stdout)
+        self.assertLess(len(buffer.entradas), 20)
+
+    def test_drain_por_partes(self):
+        buffer = LatexBuffer(limite=600)
+        partes = []
+        for semilla in range(8):
+            buffer.escribir(traza.matriz(racional(2, semilla=semilla)))
+            partes.append(buffer.drain())
+        # La marca sale una sola vez, con la cuenta del momento en que se leyo
+        leido = "".join(partes)
+        self.assertEqual(leido.count("Traza truncada"), 1)
+        self.assertEqual(leido.split("\\text{[Traza")[0], buffer.stdout.split("\\text{[Traza")[0])
+        self.assertEqual(buffer.drain(), "")
+
+
+class TestVerbosidad(unittest.TestCase):
+    def test_resultado_sin_pasos(self):
+        completa = pedido(controller.inversa_por_gauss_jordan, ENTRADA)
+        resultado = pedido(controller.inversa_por_gauss_jordan, ENTRADA, verbosidad="resultado")
+        self.assertIn("Paso \\#", completa)
+        self.assertNotIn("Paso \\#", resultado)
+        self.assertLess(len(resultado), len(completa) // 4)
+        # La respuesta esta en las dos
+        self.assertIn("su inversa es", resultado)
+
+    def test_presupuesto_resume_una_vez(self):
+        salida = pedido(controller.inversa_por_gauss_jordan, ENTRADA, presupuesto_pasos=3)
+        self.assertEqual(salida.count("Traza resumida"), 1)
+        resumen = salida[salida.index("Traza resumida"):].split("]")[0]
+        self.assertNotIn(" y ", resumen)
+        self.assertNotIn("Paso \\#4", salida)
+
+    def test_presupuesto_cuenta_operaciones(self):
+        # Sin pasos numerados de por medio se informan las operaciones de fila
+        with contexto.nuevo() as ctx:
+            op.configurar_traza(presupuesto_pasos=0)
+            op.nuevo_paso()
+            mat = racional(3)
+            op.escalar_fila(mat, 1, Fraction(2))
+            op.intercambiar_fila(mat, 1, 2)
+        self.assertEqual(ctx.presupuesto.operaciones_omitidas, 2)
+        self.assertEqual(ctx.salida.entradas, [])
+
+
+class TestSinTraza(EnSilencio):
+    def test_silencio_no_arma_eventos(self):
+        with mock.patch.object(traza, "matriz", wraps=traza.matriz) as instantaneas, \
+                mock.patch.object(traza, "OperacionFila", wraps=traza.OperacionFila) as operaciones:
+            mat = racional(4)
+            fn.matriz_escalonada_reducida(mat, 4, 4)
+            fn.matriz_escalonada_reducida_sin_fracciones(racional(4, semilla=1), 4, 4)
+        self.assertEqual(instantaneas.call_count, 0)
+        self.assertEqual(operaciones.call_count, 0)
+        self.assertEqual(mat._fila(0)[0], 1)
+
+
+class TestPedidos(unittest.TestCase):
+    def test_concurrentes_igual_que_en_serie(self):
+        llamadas = [(controller.inversa_por_gauss_jordan, [[str(i + j * k) for j in range(3)]
+                                                           for i in range(3)])
+                     for k in range(2, 8)]
+        serie = [pedido(f, m) for f, m in llamadas]
+        with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(4) as hilos:
+            concurrentes = list(hilos.map(lambda llamada: llamada[0](llamada[1]), llamadas))
+        self.assertEqual(serie, concurrentes)
+
+    def test_en_silencio_no_escribe(self):
+        with contexto.nuevo() as ctx:
+            with op.en_silencio():
+                fn.matriz_escalonada_reducida(racional(3), 3, 3)
+            self.assertEqual(ctx.salida.entradas, [])
+
+    def test_comparar_solo_resultado(self):
+        salida = pedido(controller.comparar_expresiones, "1+1", "2", None, "resultado")
+        self.assertTrue(salida.startswith("\\text{Expr 1:}"))
+
+    def test_opciones_por_pedido(self):
+        cortada = pedido(controller.inversa_por_gauss_jordan, ENTRADA, limite_traza=2_000)
+        self.assertIn("Traza truncada", cortada)
+        self.assertTrue(controller.leer_traza()["truncada"])
+        # La opcion no queda puesta para el pedido siguiente
+        completa = pedido(controller.inversa_por_gauss_jordan, ENTRADA)
+        self.assertNotIn("Traza truncada", completa)
+        self.assertNotIn("textcolor", completa)
+        resaltada = pedido(controller.inversa_por_gauss_jordan, ENTRADA, resaltar_cambios=True)
+        self.assertIn("textcolor", resaltada)
+
+    def test_limite_invalido(self):
+        with self.assertRaises(Exception):
+            pedido(controller.inversa_por_gauss_jordan, ENTRADA, limite_traza=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
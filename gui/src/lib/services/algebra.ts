@@ -49,6 +49,22 @@ export const determinanteSarrus = async (m: MatrixSpec): Promise<string> => {
 	return callPyFunc('determinante_sarrus', normalizeMatrix(m));
 };
 
+export const determinantePorMetodo = async (
+	m: MatrixSpec,
+	metodo: string = 'bareiss',
+	procesos: number = 1
+): Promise<string> => {
+	return callPyFunc('determinante_por_metodo', normalizeMatrix(m), metodo, procesos);
+};
+
+export const rangoPorMetodo = async (
+	m: MatrixSpec,
+	metodo: string = 'plu',
+	procesos: number = 1
+): Promise<string> => {
+	return callPyFunc('rango_por_metodo', normalizeMatrix(m), metodo, procesos);
+};
+
 export const inversaAdjunta = async (m: MatrixSpec): Promise<string> => {
 	return callPyFunc('inversa_por_adjunta', normalizeMatrix(m));
 };